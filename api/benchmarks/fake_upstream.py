@@ -0,0 +1,274 @@
+"""In-process fake of every upstream the integration fetchers call.
+
+One ASGI app answers for GitHub GraphQL, the npm registry and downloads
+API, PyPI, pypistats, Dev.to and Hashnode, dispatching on the request's
+host.  Responses are generated from the requested user or package name,
+so the same name always gets the same data, and every response can be
+delayed (``latency`` plus up to ``jitter`` seconds) and failed with a
+``503`` at ``error_rate``.
+
+Install it under the fetchers with::
+
+    outbound.set_base_transport(lambda: httpx.ASGITransport(upstream))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+REPOS_PER_USER = 30
+PACKAGES_PER_USER = 5
+ARTICLES_PER_USER = 12
+LANGUAGES = (
+    ("Python", "#3572A5"),
+    ("TypeScript", "#3178c6"),
+    ("Rust", "#dea584"),
+    ("Go", "#00ADD8"),
+    ("Shell", "#89e051"),
+)
+
+
+def _rng(*parts: object) -> random.Random:
+    """Seed a generator from *parts*, so responses are reproducible."""
+    return random.Random("/".join(map(str, parts)))
+
+
+def _calendar(name: str, start: date, end: date) -> dict[str, Any]:
+    """Build a ``contributionCalendar`` of weekly day lists."""
+    rng = _rng("calendar", name, start)
+    weeks: list[dict[str, Any]] = []
+    day = start
+    while day <= end:
+        week = []
+        for _ in range(7):
+            if day > end:
+                break
+            week.append({"date": day.isoformat(), "contributionCount": rng.choice((0, 0, 1, 3, 7))})
+            day += timedelta(days=1)
+        weeks.append({"contributionDays": week})
+    total = sum(d["contributionCount"] for w in weeks for d in w["contributionDays"])
+    return {"totalContributions": total, "weeks": weeks}
+
+
+def _languages(name: str) -> dict[str, Any]:
+    rng = _rng("languages", name)
+    return {
+        "edges": [
+            {"size": rng.randint(1_000, 500_000), "node": {"name": lang, "color": color}}
+            for lang, color in rng.sample(LANGUAGES, 2)
+        ]
+    }
+
+
+def _github_user(username: str) -> dict[str, Any]:
+    rng = _rng("github", username)
+    today = datetime.now(timezone.utc).date()
+    year = today.year
+    return {
+        "followers": {"totalCount": rng.randint(0, 5_000)},
+        "repositories": {"totalCount": REPOS_PER_USER},
+        "pinnedItems": {
+            "nodes": [
+                {
+                    "name": f"{username}-repo-{i}",
+                    "description": "A benchmark repository",
+                    "stargazerCount": rng.randint(0, 2_000),
+                    "forkCount": rng.randint(0, 200),
+                    "primaryLanguage": {"name": "Python", "color": "#3572A5"},
+                    "url": f"https://github.com/{username}/{username}-repo-{i}",
+                }
+                for i in range(3)
+            ]
+        },
+        "contributionsCollection": {
+            "contributionYears": [year, year - 1, year - 2],
+            "contributionCalendar": _calendar(username, today - timedelta(days=364), today),
+        },
+    }
+
+
+def _github_repos(username: str, with_languages: bool) -> dict[str, Any]:
+    rng = _rng("repos", username)
+    nodes = []
+    for i in range(REPOS_PER_USER):
+        node: dict[str, Any] = {
+            "name": f"{username}-repo-{i}",
+            "stargazerCount": rng.randint(0, 2_000),
+            "pushedAt": "2026-01-01T00:00:00Z",
+        }
+        if with_languages:
+            node["languages"] = _languages(f"{username}/{i}")
+        nodes.append(node)
+    return {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": nodes}
+
+
+def _github(body: dict[str, Any]) -> dict[str, Any]:
+    """Answer the fetcher's GraphQL queries by the fields they ask for."""
+    query = body.get("query", "")
+    variables = body.get("variables") or {}
+    if "contributionsCollection(from" in query:
+        start = date.fromisoformat(variables["from"][:10])
+        end = date.fromisoformat(variables["to"][:10])
+        calendar = _calendar(variables["username"], start, end)
+        return {"user": {"contributionsCollection": {"contributionCalendar": calendar}}}
+    if "repository(owner" in query:
+        return {
+            key: {"languages": _languages(f"{variables['owner']}/{name}")}
+            for key, name in variables.items()
+            if key != "owner"
+        }
+    if "$pageSize" in query:
+        repos = _github_repos(variables["username"], variables.get("withLanguages", True))
+        return {"user": {"repositories": repos}}
+    return {"user": _github_user(variables["username"])}
+
+
+def _npm_search(username: str, size: int) -> dict[str, Any]:
+    count = min(size, PACKAGES_PER_USER)
+    return {
+        "objects": [
+            {
+                "package": {
+                    "name": f"{username}-pkg-{i}",
+                    "version": f"1.{i}.0",
+                    "description": "A benchmark package",
+                    "links": {"npm": f"https://www.npmjs.com/package/{username}-pkg-{i}"},
+                }
+            }
+            for i in range(count)
+        ],
+        "total": count,
+    }
+
+
+def _npm_downloads(packages: str) -> dict[str, Any]:
+    names = packages.split(",")
+    counts = {name: {"downloads": _rng("npm", name).randint(0, 100_000), "package": name} for name in names}
+    return counts if len(names) > 1 else counts[names[0]]
+
+
+def _devto(username: str, page: int) -> list[dict[str, Any]]:
+    if page > 1:
+        return []
+    rng = _rng("devto", username)
+    return [
+        {
+            "title": f"Article {i} by {username}",
+            "url": f"https://dev.to/{username}/article-{i}",
+            "published_at": "2026-01-01T00:00:00Z",
+            "positive_reactions_count": rng.randint(0, 500),
+            "comments_count": rng.randint(0, 50),
+            "reading_time_minutes": rng.randint(1, 15),
+            "tag_list": ["python", "benchmarks"],
+        }
+        for i in range(ARTICLES_PER_USER)
+    ]
+
+
+def _hashnode(host: str) -> dict[str, Any]:
+    rng = _rng("hashnode", host)
+    edges = [
+        {
+            "node": {
+                "title": f"Post {i}",
+                "brief": "A benchmark post",
+                "url": f"https://{host}/post-{i}",
+                "publishedAt": "2026-01-01T00:00:00Z",
+                "reactionCount": rng.randint(0, 300),
+            }
+        }
+        for i in range(ARTICLES_PER_USER)
+    ]
+    posts = {
+        "edges": edges,
+        "pageInfo": {"hasNextPage": False, "endCursor": None},
+        "totalDocuments": len(edges),
+    }
+    return {"data": {"publication": {"posts": posts}}}
+
+
+class FakeUpstream:
+    """ASGI app emulating the upstream APIs.
+
+    :param latency: Seconds every response is delayed by.
+    :param jitter: Up to this many extra seconds, drawn uniformly.
+    :param error_rate: Fraction of requests answered with ``503``.
+    :param seed: Seed for latency and error draws.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self._random = random.Random(seed)
+
+    def reset(self) -> None:
+        """Zero the per-host counters."""
+        self.requests.clear()
+        self.errors.clear()
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            return
+        request = Request(scope, receive)
+        response = await self.handle(request)
+        await response(scope, receive, send)
+
+    async def handle(self, request: Request) -> Response:
+        """Delay, maybe fail, then answer *request* for its host."""
+        host = request.url.hostname or ""
+        self.requests[host] += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors[host] += 1
+            return Response(status_code=503)
+
+        path = request.url.path
+        params = request.query_params
+        if host == "api.github.com":
+            return JSONResponse({"data": _github(json.loads(await request.body()))})
+        if host == "registry.npmjs.org":
+            username = params.get("text", "").removeprefix("maintainer:")
+            return JSONResponse(_npm_search(username, int(params.get("size", 20))))
+        if host == "api.npmjs.org":
+            return JSONResponse(_npm_downloads(path.rsplit("/", 1)[-1]))
+        if host == "pypi.org":
+            name = path.split("/")[2]
+            info = {
+                "name": name,
+                "version": "2.0.0",
+                "summary": "A benchmark package",
+                "project_url": f"https://pypi.org/project/{name}/",
+            }
+            return JSONResponse({"info": info})
+        if host == "pypistats.org":
+            name = path.split("/")[3]
+            monthly = _rng("pypi", name).randint(0, 1_000_000)
+            return JSONResponse(
+                {"data": {"last_day": monthly // 30, "last_week": monthly // 4, "last_month": monthly}}
+            )
+        if host == "dev.to":
+            return JSONResponse(_devto(params.get("username", ""), int(params.get("page", 1))))
+        if host == "gql.hashnode.com":
+            body = json.loads(await request.body())
+            return JSONResponse(_hashnode(body["variables"]["username"]))
+        return Response(status_code=404)
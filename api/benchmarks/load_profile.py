@@ -0,0 +1,304 @@
+"""Load-test the public profile endpoint against a fake upstream.
+
+Boots the app in-process on a throwaway SQLite database (or the
+configured Postgres with ``--postgres``), routes every integration
+fetcher to :class:`~fake_upstream.FakeUpstream` and drives
+``GET /api/profile/{username}`` from ``--concurrency`` workers.
+
+Each request hits a warm profile (all integrations cached) with
+probability ``--hit-ratio`` and otherwise a profile never requested
+before, whose integrations have to be fetched.  Warm profiles are
+loaded once before timing starts.  Everything runs offline and, for a
+given ``--seed``, requests the same profiles in the same order, so runs
+before and after a change are comparable.
+
+Prints throughput, latency percentiles, response statuses and upstream
+requests per host; ``--json`` prints the same as one JSON object.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# sys.path setup -- this script lives outside the installable packages, so we
+# need to make ``mandev_api`` and ``mandev_core`` importable.
+# ---------------------------------------------------------------------------
+_repo_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_repo_root / "api"))
+sys.path.insert(0, str(_repo_root / "core"))
+
+
+import httpx  # noqa: E402
+from piccolo.engine.sqlite import SQLiteEngine  # noqa: E402
+from piccolo.table import create_db_tables  # noqa: E402
+
+from fake_upstream import FakeUpstream  # noqa: E402
+from mandev_api import outbound  # noqa: E402
+from mandev_api.app import create_app, lifespan  # noqa: E402
+from mandev_api.config import settings  # noqa: E402
+from mandev_api.integrations import INTEGRATIONS  # noqa: E402
+from mandev_api.l1_cache import l1  # noqa: E402
+from mandev_api.tables import (  # noqa: E402
+    ContributionArchive,
+    GitHubStatsCache,
+    HttpValidatorCache,
+    IntegrationCache,
+    ProfileView,
+    User,
+    UserProfile,
+    create_contribution_archive_key_index,
+    create_integration_cache_key_index,
+)
+
+ALL_TABLES = [
+    User,
+    UserProfile,
+    GitHubStatsCache,
+    ContributionArchive,
+    ProfileView,
+    IntegrationCache,
+    HttpValidatorCache,
+]
+USER_PREFIX = "bench-"
+
+
+def _config(username: str) -> str:
+    """A profile config that enables every integration."""
+    return json.dumps(
+        {
+            "profile": {"name": username},
+            "github": {"username": username},
+            "npm": {"username": username},
+            "pypi": {"packages": [f"{username}-lib", f"{username}-cli"]},
+            "devto": {"username": username},
+            "hashnode": {"username": username},
+        }
+    )
+
+
+async def _use_sqlite(path: str) -> None:
+    """Point every table at a fresh SQLite database."""
+    engine = SQLiteEngine(path=path)
+    for table in ALL_TABLES:
+        table._meta._db = engine
+    await create_db_tables(*ALL_TABLES, if_not_exists=True)
+    await create_integration_cache_key_index()
+    await create_contribution_archive_key_index()
+
+
+async def _delete_bench_data(usernames: list[str]) -> None:
+    """Remove benchmark profiles and their cached stats from an earlier run.
+
+    Only matters with ``--postgres``: otherwise cold profiles of a second
+    run would be served from the first run's cache.
+    """
+    pattern = f"{USER_PREFIX}%"
+    keys = {
+        integration.lookup_key(integration.config_model.model_validate(section))
+        for username in usernames
+        for integration in INTEGRATIONS
+        if (section := json.loads(_config(username)).get(integration.name)) is not None
+    }
+    await IntegrationCache.delete().where(
+        IntegrationCache.lookup_key.like(pattern)
+        | IntegrationCache.lookup_key.is_in([key for key in keys if key])
+    ).run()
+    await GitHubStatsCache.delete().where(GitHubStatsCache.github_username.like(pattern)).run()
+    await ContributionArchive.delete().where(
+        ContributionArchive.github_username.like(pattern)
+    ).run()
+    await ProfileView.delete().where(ProfileView.username.like(pattern)).run()
+    await UserProfile.delete().where(
+        UserProfile.user_id.is_in(User.select(User.id).where(User.username.like(pattern)))
+    ).run()
+    await User.delete().where(User.username.like(pattern)).run()
+
+
+async def _seed(usernames: list[str]) -> None:
+    """Insert one user with a full profile per name."""
+    await User.insert(
+        *(User(email=f"{name}@bench.test", username=name, password_hash="x") for name in usernames)
+    ).run()
+    rows = await User.select(User.id, User.username).where(User.username.is_in(usernames)).run()
+    await UserProfile.insert(
+        *(UserProfile(user_id=row["id"], config_json=_config(row["username"])) for row in rows)
+    ).run()
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted *values*."""
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _drive(
+    client: httpx.AsyncClient, usernames: list[str], concurrency: int
+) -> tuple[list[float], Counter[int], float]:
+    """Request every profile in *usernames* from *concurrency* workers.
+
+    :returns: Per-request latencies in seconds, status counts and the
+        wall-clock seconds taken.
+    """
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    pending = iter(usernames)
+
+    async def _worker() -> None:
+        for username in pending:
+            started = time.perf_counter()
+            try:
+                resp = await client.get(f"/api/profile/{username}")
+                status = resp.status_code
+            except Exception:
+                status = 0
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace, sqlite_path: str | None) -> dict:
+    """Seed, warm up and run the benchmark; return the report.
+
+    :param args: Parsed command-line arguments.
+    :param sqlite_path: Database file to create, or ``None`` to use the
+        configured engine (started through the app's lifespan).
+    """
+    rng = random.Random(args.seed)
+    warm = [f"{USER_PREFIX}warm-{i}" for i in range(args.warm_users)]
+    schedule: list[str] = []
+    cold = 0
+    for _ in range(args.requests):
+        if warm and rng.random() < args.hit_ratio:
+            schedule.append(rng.choice(warm))
+        else:
+            schedule.append(f"{USER_PREFIX}cold-{cold}")
+            cold += 1
+
+    upstream = FakeUpstream(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    outbound.set_base_transport(lambda: httpx.ASGITransport(app=upstream))
+    settings.github_token = settings.github_token or "bench-token"
+    if args.no_l1:
+        l1.maxsize = 0
+
+    app = create_app()
+    if sqlite_path is not None:
+        await _use_sqlite(sqlite_path)
+    usernames = warm + [f"{USER_PREFIX}cold-{i}" for i in range(cold)]
+    async with lifespan(app) if sqlite_path is None else contextlib.nullcontext():
+        await _delete_bench_data(usernames)
+        await _seed(usernames)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _drive(client, warm, args.concurrency)
+            upstream.reset()
+            latencies, statuses, elapsed = await _drive(client, schedule, args.concurrency)
+        if sqlite_path is None:
+            await _delete_bench_data(usernames)
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "hit_ratio": args.hit_ratio,
+        "cold_profiles": cold,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 2),
+            "p50": round(_percentile(latencies, 0.50) * 1000, 2),
+            "p90": round(_percentile(latencies, 0.90) * 1000, 2),
+            "p99": round(_percentile(latencies, 0.99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2),
+        },
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "upstream_requests": dict(sorted(upstream.requests.items())),
+        "upstream_errors": dict(sorted(upstream.errors.items())),
+    }
+
+
+def _print_report(report: dict) -> None:
+    latency = report["latency_ms"]
+    print(
+        f"{report['requests']} requests ({report['cold_profiles']} cold) "
+        f"at concurrency {report['concurrency']} in {report['seconds']:.2f}s: "
+        f"{report['requests_per_second']:.1f} req/s"
+    )
+    print(
+        f"  latency ms  mean={latency['mean']:.1f} p50={latency['p50']:.1f} "
+        f"p90={latency['p90']:.1f} p99={latency['p99']:.1f} max={latency['max']:.1f}"
+    )
+    print("  statuses    " + " ".join(f"{k}={v}" for k, v in report["statuses"].items()))
+    for host, count in report["upstream_requests"].items():
+        errors = report["upstream_errors"].get(host, 0)
+        print(f"  {host:<20} requests={count} errors={errors}")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="Timed requests.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight.")
+    parser.add_argument(
+        "--hit-ratio",
+        type=float,
+        default=0.9,
+        help="Fraction of requests for already-cached profiles.",
+    )
+    parser.add_argument("--warm-users", type=int, default=50, help="Cached profiles.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Upstream latency.")
+    parser.add_argument(
+        "--jitter-ms", type=float, default=25.0, help="Extra random upstream latency, up to."
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of upstream 503s."
+    )
+    parser.add_argument("--no-l1", action="store_true", help="Disable the in-process cache.")
+    parser.add_argument(
+        "--postgres",
+        action="store_true",
+        help="Use the database from piccolo_conf.py instead of a temporary SQLite file.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request mix.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show the app's log (e.g. failed fetches)."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.CRITICAL)
+    if args.postgres:
+        report = asyncio.run(run(args, None))
+    else:
+        db_fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(db_fd)
+        try:
+            report = asyncio.run(run(args, db_path))
+        finally:
+            os.unlink(db_path)
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,31 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from piccolo.engine import engine_finder
 
+from mandev_api import metrics
+from mandev_api.l1_cache import start_invalidation_listener
+from mandev_api.timing import ServerTimingMiddleware
+from mandev_api.tracing import start_tracing
+
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
-    """Start and stop the Piccolo connection pool."""
+    """Start and stop the Piccolo connection pool, cache listener and tracer."""
     engine = engine_finder()
     if hasattr(engine, "start_connection_pool"):
         await engine.start_connection_pool()
+        metrics.watch_pool(engine)
+    stop_listener = await start_invalidation_listener(engine)
+    tracer = start_tracing()
     yield
+    if tracer is not None:
+        await tracer.stop()
+    if stop_listener is not None:
+        await stop_listener()
     if hasattr(engine, "close_connection_pool"):
+        metrics.watch_pool(None)
         await engine.close_connection_pool()
 
 
@@ -25,6 +39,7 @@ def create_app() -> FastAPI:
     :returns: Configured FastAPI instance.
     """
     app = FastAPI(title="man.dev API", version="0.1.0", lifespan=lifespan)
+    metrics.instrument_queries()
 
     app.add_middleware(
         CORSMiddleware,
@@ -33,18 +48,27 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(metrics.MetricsMiddleware)
 
     @app.get("/api/health")
     async def health() -> dict[str, str]:
         """Return a simple health-check response."""
         return {"status": "ok"}
 
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics() -> Response:
+        """Expose process metrics in the Prometheus text format."""
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
     # Import and register routers
     from mandev_api.routers.auth import router as auth_router
+    from mandev_api.routers.avatar import router as avatar_router
     from mandev_api.routers.profile import router as profile_router
     from mandev_api.routers.github_oauth import router as github_oauth_router
 
     app.include_router(auth_router)
+    app.include_router(avatar_router)
     app.include_router(profile_router)
     app.include_router(github_oauth_router)
 
@@ -0,0 +1,221 @@
+"""Garbage collection for the stats caches.
+
+Cache rows are keyed by values taken from profile configs, so they
+outlive those configs: changing a PyPI package list leaves the old
+hash-keyed row behind, and unlinking a GitHub account leaves its stats
+and contribution archive.  :func:`collect_garbage` removes them, in
+batches, so the cache tables stay proportional to active profiles.
+
+* Rows of per-profile services (``npm``, ``pypi``, ``devto``,
+  ``hashnode``, GitHub stats and archive) are deleted once no
+  :class:`~mandev_api.tables.UserProfile` config maps to their key.
+* Rows of shared per-package services (``npm_downloads``,
+  ``pypi_meta``, ...) and stored HTTP validators are refreshed whenever
+  a profile using them refreshes, so they are deleted once they have
+  not been written for :data:`SHARED_MAX_AGE_DAYS`.
+
+Only rows written before the collection started are considered, so a
+profile saved mid-run never loses its fresh entries.  Deleted stats are
+dropped from the L1 cache of this and (by broadcast) every other worker,
+one batch at a time.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from piccolo.query.functions import Count, Length, Sum
+from piccolo.table import Table
+
+from mandev_api.github_service import L1_SERVICE as GITHUB_L1_SERVICE
+from mandev_api.integrations import INTEGRATIONS
+from mandev_api.l1_cache import broadcast_invalidations, l1
+from mandev_api.tables import (
+    ContributionArchive,
+    GitHubStatsCache,
+    HttpValidatorCache,
+    IntegrationCache,
+    UserProfile,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+SHARED_MAX_AGE_DAYS = 14
+
+
+@dataclass
+class GcResult:
+    """Outcome of one collection.
+
+    :param deleted: Rows deleted (or that would be, on a dry run) per
+        cache, keyed like :func:`cache_sizes`.
+    """
+
+    deleted: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+async def _pages(table: type[Table], *columns: object) -> AsyncIterator[list[dict]]:
+    """Yield all rows of *table* in id order, :data:`BATCH_SIZE` at a time."""
+    last_id = 0
+    while True:
+        rows = (
+            await table.select(table.id, *columns)
+            .where(table.id > last_id)
+            .order_by(table.id)
+            .limit(BATCH_SIZE)
+            .run()
+        )
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]["id"]
+
+
+async def referenced_keys() -> dict[str, set[str]]:
+    """Collect the cache keys every stored profile config maps to.
+
+    :returns: Lookup keys per integration name.
+    """
+    keys: dict[str, set[str]] = {integration.name: set() for integration in INTEGRATIONS}
+    async for rows in _pages(UserProfile, UserProfile.config_json):
+        for row in rows:
+            config = json.loads(row["config_json"]) if row["config_json"] else {}
+            for integration in INTEGRATIONS:
+                parsed = integration.parse(config.get(integration.name))
+                key = integration.lookup_key(parsed) if parsed is not None else None
+                if key:
+                    keys[integration.name].add(key)
+    return keys
+
+
+async def _delete_ids(
+    table: type[Table],
+    ids: list[int],
+    *,
+    dry_run: bool,
+    l1_keys: dict[int, tuple[str, str]] | None = None,
+) -> None:
+    """Delete rows by id, :data:`BATCH_SIZE` at a time.
+
+    :param l1_keys: The ``(service, lookup_key)`` each row is cached under
+        in L1, for tables mirrored there; invalidated after each batch.
+    """
+    if dry_run:
+        return
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = ids[start:start + BATCH_SIZE]
+        await table.delete().where(table.id.is_in(batch)).run()
+        if l1_keys is None:
+            continue
+        keys = [l1_keys[row_id] for row_id in batch]
+        for service, lookup_key in keys:
+            l1.invalidate(service, lookup_key)
+        await broadcast_invalidations(table, keys)
+
+
+def _written_before(row: dict, cutoff: datetime) -> bool:
+    """Whether a row's ``fetched_at`` is older than *cutoff*."""
+    return row["fetched_at"].replace(tzinfo=timezone.utc) < cutoff
+
+
+async def collect_garbage(*, dry_run: bool = False) -> GcResult:
+    """Delete cache rows no stored profile can use any more.
+
+    :param dry_run: Count the rows without deleting them.
+    :returns: Deleted row counts per cache.
+    """
+    started = datetime.now(timezone.utc)
+    shared_cutoff = started - timedelta(days=SHARED_MAX_AGE_DAYS)
+    keys = await referenced_keys()
+    owned = {integration.name for integration in INTEGRATIONS if integration.loader is None}
+    result = GcResult()
+
+    orphan_keys: dict[int, tuple[str, str]] = {}
+    async for rows in _pages(
+        IntegrationCache,
+        IntegrationCache.service,
+        IntegrationCache.lookup_key,
+        IntegrationCache.fetched_at,
+    ):
+        for row in rows:
+            service = row["service"]
+            if service in owned:
+                orphan = _written_before(row, started) and row["lookup_key"] not in keys[service]
+            else:
+                orphan = _written_before(row, shared_cutoff)
+            if orphan:
+                orphan_keys[row["id"]] = (service, row["lookup_key"])
+                result.deleted[service] += 1
+    await _delete_ids(
+        IntegrationCache, list(orphan_keys), dry_run=dry_run, l1_keys=orphan_keys
+    )
+
+    github_users = keys["github"]
+    for table, name, cached in (
+        (GitHubStatsCache, "github", True),
+        (ContributionArchive, "contribution_archive", False),
+    ):
+        orphan_keys = {}
+        async for rows in _pages(table, table.github_username, table.fetched_at):
+            orphan_keys.update(
+                (row["id"], (GITHUB_L1_SERVICE, row["github_username"]))
+                for row in rows
+                if _written_before(row, started) and row["github_username"] not in github_users
+            )
+        result.deleted[name] += len(orphan_keys)
+        await _delete_ids(
+            table, list(orphan_keys), dry_run=dry_run, l1_keys=orphan_keys if cached else None
+        )
+
+    orphans = []
+    async for rows in _pages(HttpValidatorCache, HttpValidatorCache.fetched_at):
+        orphans.extend(row["id"] for row in rows if _written_before(row, shared_cutoff))
+    result.deleted["http_validator"] += len(orphans)
+    await _delete_ids(HttpValidatorCache, orphans, dry_run=dry_run)
+
+    logger.info(
+        "Cache GC %s %d rows",
+        "would delete" if dry_run else "deleted",
+        sum(result.deleted.values()),
+    )
+    return result
+
+
+async def cache_sizes() -> dict[str, dict[str, int]]:
+    """Report row counts and payload bytes per cache.
+
+    :returns: ``{"rows": n, "bytes": b}`` per ``IntegrationCache``
+        service, plus ``github``, ``contribution_archive`` and
+        ``http_validator``.
+    """
+    sizes: dict[str, dict[str, int]] = {}
+
+    rows = (
+        await IntegrationCache.select(
+            IntegrationCache.service,
+            Count(alias="rows"),
+            Sum(Length(IntegrationCache.stats_json), alias="bytes"),
+        )
+        .group_by(IntegrationCache.service)
+        .run()
+    )
+    for row in rows:
+        sizes[row["service"]] = {"rows": row["rows"], "bytes": row["bytes"] or 0}
+
+    for name, table, payload in (
+        ("github", GitHubStatsCache, GitHubStatsCache.stats_json),
+        ("contribution_archive", ContributionArchive, ContributionArchive.counts),
+        ("http_validator", HttpValidatorCache, HttpValidatorCache.body),
+    ):
+        total = await table.select(
+            Count(alias="rows"), Sum(Length(payload), alias="bytes")
+        ).first().run()
+        sizes[name] = {"rows": total["rows"], "bytes": total["bytes"] or 0}
+
+    return sizes
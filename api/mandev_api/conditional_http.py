@@ -0,0 +1,174 @@
+"""Conditional HTTP GETs backed by stored upstream validators.
+
+Integration fetchers route their GETs through :class:`ConditionalClient`,
+which remembers the ``ETag`` / ``Last-Modified`` of each URL in
+:class:`~mandev_api.tables.HttpValidatorCache` and sends
+``If-None-Match`` / ``If-Modified-Since`` on the next refresh.  A ``304``
+is answered from the stored body, so callers see an ordinary response.
+
+When every response of a fetch was a ``304`` the fetcher calls
+:meth:`ConditionalClient.raise_if_not_modified`, and the cache service
+simply extends the TTL of the stats it already has instead of
+reparsing anything.
+
+Validators are an optimisation only: a URL too long for the table is
+fetched unconditionally, and a failure to store one is logged without
+failing the fetch.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+
+from mandev_api.tables import HttpValidatorCache
+
+logger = logging.getLogger(__name__)
+
+# Longest URL whose validators fit in HttpValidatorCache
+MAX_URL_LENGTH: int = HttpValidatorCache.url.length
+
+_conditional_enabled: ContextVar[bool] = ContextVar(
+    "conditional_requests_enabled", default=False
+)
+
+
+class NotModified(Exception):
+    """Raised by a fetcher when every upstream response was ``304``."""
+
+
+@contextmanager
+def conditional_requests(enabled: bool = True) -> Iterator[None]:
+    """Enable or disable conditional requests for the enclosed fetch.
+
+    Only worth enabling when the caller still holds the previous stats,
+    since a :class:`NotModified` is useless without them.
+
+    :param enabled: Whether to send conditional headers.
+    """
+    token = _conditional_enabled.set(enabled)
+    try:
+        yield
+    finally:
+        _conditional_enabled.reset(token)
+
+
+class ConditionalClient:
+    """Wraps an :class:`httpx.AsyncClient` with per-URL validator storage.
+
+    :param client: The underlying HTTP client.
+    """
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self._client = client
+        self.modified = False
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        timeout: float = 10.0,
+        slim: Callable[[Any], Any] | None = None,
+    ) -> httpx.Response:
+        """Send a GET, conditionally if validators are stored for *url*.
+
+        :param url: Request URL.
+        :param params: Query parameters.
+        :param timeout: Request timeout in seconds.
+        :param slim: Optional transform applied to the JSON body before it
+            is stored, to keep only what the fetcher needs.
+        :returns: The upstream response, or a replayed ``200`` on ``304``.
+        """
+        full_url = str(httpx.URL(url, params=params))
+        enabled = _conditional_enabled.get() and len(full_url) <= MAX_URL_LENGTH
+
+        stored = None
+        headers: dict[str, str] = {}
+        if enabled:
+            stored = (
+                await HttpValidatorCache.objects()
+                .where(HttpValidatorCache.url == full_url)
+                .first()
+                .run()
+            )
+            if stored is not None:
+                if stored.etag:
+                    headers["If-None-Match"] = stored.etag
+                if stored.last_modified:
+                    headers["If-Modified-Since"] = stored.last_modified
+
+        response = await self._client.get(full_url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and stored is not None:
+            return httpx.Response(
+                200,
+                content=stored.body.encode(),
+                headers={"Content-Type": "application/json"},
+                request=response.request,
+            )
+
+        self.modified = True
+        if response.status_code == 200 and len(full_url) <= MAX_URL_LENGTH:
+            try:
+                await self._store(full_url, response, slim)
+            except Exception:
+                logger.warning("Failed to store validators for %s", full_url, exc_info=True)
+        return response
+
+    async def _store(
+        self,
+        full_url: str,
+        response: httpx.Response,
+        slim: Callable[[Any], Any] | None,
+    ) -> None:
+        """Persist the validators and body of a ``200`` response."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        try:
+            body = json.dumps(slim(response.json())) if slim else response.text
+        except ValueError:
+            return
+
+        # One statement, so concurrent refreshes of a shared URL can't race
+        await (
+            HttpValidatorCache.insert(
+                HttpValidatorCache(
+                    url=full_url,
+                    etag=etag,
+                    last_modified=last_modified,
+                    body=body,
+                    fetched_at=datetime.now(timezone.utc),
+                )
+            )
+            .on_conflict(
+                target=HttpValidatorCache.url,
+                action="DO UPDATE",
+                values=[
+                    HttpValidatorCache.etag,
+                    HttpValidatorCache.last_modified,
+                    HttpValidatorCache.body,
+                    HttpValidatorCache.fetched_at,
+                ],
+            )
+            .run()
+        )
+
+    def raise_if_not_modified(self) -> None:
+        """Signal that nothing changed upstream since the last fetch.
+
+        :raises NotModified: If conditional requests are enabled and
+            every response so far was a ``304``.
+        """
+        if _conditional_enabled.get() and not self.modified:
+            raise NotModified
@@ -14,6 +14,24 @@ class Settings(BaseSettings):
     github_token: str | None = None
     github_oauth_client_id: str | None = None
     github_oauth_client_secret: str | None = None
+    github_max_repos: int = 1000
+    github_incremental_repos: bool = False
+    outbound_initial_limit: int = 4
+    outbound_max_limit: int = 32
+    outbound_latency_target: float = 5.0
+    outbound_retries: int = 2
+    outbound_breaker_failures: int = 5
+    outbound_breaker_reset: float = 30.0
+    l1_cache_size: int = 10_000
+    l1_cache_ttl: float = 300.0
+    cache_ttl_hours: dict[str, float] = {}
+    ttl_popularity: bool = True
+    server_timing: bool = True
+    slow_request_ms: float = 0.0
+    trace_exporter: str = ""
+    trace_file: str = "traces.jsonl"
+    trace_endpoint: str = "http://localhost:4318/v1/traces"
+    trace_sample_rate: float = 1.0
 
     model_config = {
         "env_prefix": "MANDEV_",
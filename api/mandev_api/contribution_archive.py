@@ -0,0 +1,263 @@
+"""Archival store for multi-year GitHub contribution history.
+
+GitHub's contribution calendar only covers the trailing year.  Past
+years never change, so each one is fetched once, stored as a compact
+row in :class:`~mandev_api.tables.ContributionArchive` and never
+refetched.  Lifetime totals and streaks are computed from local data.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from mandev_core.github_models import ContributionDay, GitHubStats
+
+from mandev_api.github_fetcher import fetch_contribution_year
+from mandev_api.tables import ContributionArchive
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_year(year: int, days: list[ContributionDay]) -> str:
+    """Pack a year's contribution days into one count per day.
+
+    :param year: Calendar year the days belong to.
+    :param days: Contribution days; days outside *year* are ignored.
+    :returns: Comma-separated counts starting on January 1st.
+    """
+    start = date(year, 1, 1)
+    counts = [0] * (date(year + 1, 1, 1) - start).days
+    for day in days:
+        offset = (date.fromisoformat(day.date) - start).days
+        if 0 <= offset < len(counts):
+            counts[offset] = day.count
+    return ",".join(map(str, counts))
+
+
+def _decode_year(year: int, counts: str) -> dict[str, int]:
+    """Unpack an archived row into a ``{date: count}`` mapping.
+
+    :param year: Calendar year of the row.
+    :param counts: Comma-separated counts as written by :func:`_encode_year`.
+    :returns: Mapping of ISO date to contribution count.
+    """
+    if not counts:
+        return {}
+    start = date(year, 1, 1)
+    return {
+        (start + timedelta(days=offset)).isoformat(): int(count)
+        for offset, count in enumerate(counts.split(","))
+    }
+
+
+def _day_items(days: list[ContributionDay | dict]) -> dict[str, int]:
+    """Normalise contribution days (models or cached dicts) into a mapping.
+
+    :param days: Days as stored on :class:`GitHubStats` or in the cache.
+    :returns: Mapping of ISO date to contribution count.
+    """
+    items: dict[str, int] = {}
+    for day in days:
+        if isinstance(day, dict):
+            items[day["date"]] = day["count"]
+        else:
+            items[day.date] = day.count
+    return items
+
+
+def lifetime_summary(days: dict[str, int]) -> tuple[int, int]:
+    """Compute the total and longest streak over a ``{date: count}`` map.
+
+    Dates missing between the first and last known day count as zero.
+
+    :param days: Mapping of ISO date to contribution count.
+    :returns: A ``(total_contributions, longest_streak)`` tuple.
+    """
+    if not days:
+        return 0, 0
+
+    day = date.fromisoformat(min(days))
+    last = date.fromisoformat(max(days))
+    longest = 0
+    current = 0
+
+    while day <= last:
+        if days.get(day.isoformat(), 0) > 0:
+            current += 1
+            longest = max(longest, current)
+        else:
+            current = 0
+        day += timedelta(days=1)
+
+    return sum(days.values()), longest
+
+
+async def load_archive(
+    github_username: str,
+    *,
+    start_year: int | None = None,
+    end_year: int | None = None,
+) -> dict[str, int]:
+    """Load archived contribution days for a user.
+
+    :param github_username: GitHub username.
+    :param start_year: First year to include (inclusive), or all.
+    :param end_year: Last year to include (inclusive), or all.
+    :returns: Mapping of ISO date to contribution count.
+    """
+    query = ContributionArchive.select(
+        ContributionArchive.year, ContributionArchive.counts
+    ).where(ContributionArchive.github_username == github_username)
+    if start_year is not None:
+        query = query.where(ContributionArchive.year >= start_year)
+    if end_year is not None:
+        query = query.where(ContributionArchive.year <= end_year)
+
+    days: dict[str, int] = {}
+    for row in await query.run():
+        days.update(_decode_year(row["year"], row["counts"]))
+    return days
+
+
+async def archive_contribution_years(
+    github_username: str,
+    years: list[int],
+    *,
+    token: str | None,
+) -> list[int]:
+    """Fetch and store every past year that is not archived yet.
+
+    The current year is skipped: it is still changing and is covered by
+    the trailing calendar on :class:`GitHubStats`.
+
+    :param github_username: GitHub username.
+    :param years: Years in which the user has contributions.
+    :param token: GitHub API token.
+    :returns: The years that were newly archived.
+    """
+    current_year = datetime.now(timezone.utc).year
+    past_years = sorted({year for year in years if year < current_year})
+    if not past_years or not token:
+        return []
+
+    existing = (
+        await ContributionArchive.select(ContributionArchive.year)
+        .where(
+            ContributionArchive.github_username == github_username,
+            ContributionArchive.year.is_in(past_years),
+        )
+        .run()
+    )
+    archived_years = {row["year"] for row in existing}
+    missing = [year for year in past_years if year not in archived_years]
+    if not missing:
+        return []
+
+    results = await asyncio.gather(
+        *(fetch_contribution_year(github_username, year, token=token) for year in missing),
+        return_exceptions=True,
+    )
+
+    now = datetime.now(timezone.utc)
+    rows: list[ContributionArchive] = []
+    for year, result in zip(missing, results):
+        if isinstance(result, BaseException):
+            logger.warning(
+                "Failed to archive %s contributions for %s", year, github_username
+            )
+            continue
+        rows.append(
+            ContributionArchive(
+                github_username=github_username,
+                year=year,
+                counts=_encode_year(year, result),
+                total=sum(day.count for day in result),
+                fetched_at=now,
+            )
+        )
+
+    if rows:
+        # A concurrent refresh may have archived the same years meanwhile
+        await (
+            ContributionArchive.insert(*rows)
+            .on_conflict(
+                target=(ContributionArchive.github_username, ContributionArchive.year),
+                action="DO UPDATE",
+                values=[
+                    ContributionArchive.counts,
+                    ContributionArchive.total,
+                    ContributionArchive.fetched_at,
+                ],
+            )
+            .run()
+        )
+    return [row.year for row in rows]
+
+
+async def update_lifetime_stats(
+    github_username: str,
+    stats: GitHubStats,
+    *,
+    token: str | None,
+) -> None:
+    """Archive missing past years and fill in lifetime totals on *stats*.
+
+    Lifetime fields are only set once every past contribution year is
+    archived, so a partially filled archive never under-reports.
+
+    :param github_username: GitHub username.
+    :param stats: Freshly fetched stats, updated in place.
+    :param token: GitHub API token.
+    """
+    years = list(stats.contribution_years)
+    if not years:
+        return
+
+    await archive_contribution_years(github_username, years, token=token)
+
+    current_year = datetime.now(timezone.utc).year
+    past_years = {year for year in years if year < current_year}
+    archived = await load_archive(github_username)
+    archived_years = {int(day[:4]) for day in archived}
+    if not past_years <= archived_years:
+        return
+
+    days = {**archived, **_day_items(stats.contributions)}
+    total, longest = lifetime_summary(days)
+    stats.lifetime_contributions = total
+    stats.lifetime_longest_streak = longest
+
+
+async def get_contribution_range(
+    github_username: str,
+    start: date,
+    end: date,
+    *,
+    recent: list[ContributionDay | dict] | None = None,
+) -> list[ContributionDay]:
+    """Return daily contributions between *start* and *end* (inclusive).
+
+    Past years come from the archive; days that are not archived yet
+    (the current year) come from *recent*, typically the cached
+    trailing calendar.  Days with no known data are omitted.
+
+    :param github_username: GitHub username.
+    :param start: First day of the range.
+    :param end: Last day of the range.
+    :param recent: Trailing calendar days to merge over the archive.
+    :returns: Chronologically ordered contribution days.
+    """
+    days = await load_archive(
+        github_username, start_year=start.year, end_year=end.year
+    )
+    if recent:
+        days.update(_day_items(recent))
+
+    start_key, end_key = start.isoformat(), end.isoformat()
+    return [
+        ContributionDay(date=day, count=count)
+        for day, count in sorted(days.items())
+        if start_key <= day <= end_key
+    ]
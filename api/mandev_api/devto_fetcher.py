@@ -1,11 +1,15 @@
 """Dev.to articles fetcher.
 
 Queries the public Dev.to API for a user's published articles and
-computes aggregate stats.
+computes aggregate stats.  Pages are streamed into running totals and a
+bounded top-N heap as they arrive, so memory stays proportional to
+``max_articles`` rather than to the author's whole back catalogue.
 """
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
 from datetime import datetime, timezone
 
@@ -13,69 +17,145 @@ import httpx
 
 from mandev_core.integration_models import DevToArticle, DevToStats
 
+from mandev_api.conditional_http import ConditionalClient
+from mandev_api.integration_service import NotFound
+from mandev_api.outbound import outbound_transport
+
 logger = logging.getLogger(__name__)
 
 DEVTO_API_URL = "https://dev.to/api/articles"
+PER_PAGE = 100
+PAGE_CONCURRENCY = 4
+
+
+class _ArticleAggregator:
+    """Running totals and a bounded top-N heap over streamed article pages.
+
+    Ties on reactions keep API order, like a stable sort would: each
+    article's position is derived from its page and index, so pages can
+    be added in any order.
+
+    :param max_articles: Number of top articles to keep.
+    """
+
+    def __init__(self, max_articles: int) -> None:
+        self.max_articles = max_articles
+        self.total_articles = 0
+        self.total_reactions = 0
+        self.total_comments = 0
+        self._heap: list[tuple[int, int, dict]] = []
+
+    def add(self, batch: list[dict], page: int) -> None:
+        """Fold one page of raw articles into the aggregate.
+
+        :param batch: Article dicts from the API.
+        :param page: 1-based page number the batch came from.
+        """
+        for index, article in enumerate(batch):
+            reactions = article.get("positive_reactions_count", 0)
+            self.total_articles += 1
+            self.total_reactions += reactions
+            self.total_comments += article.get("comments_count", 0)
+
+            if self.max_articles <= 0:
+                continue
+            key = (reactions, -(page * PER_PAGE + index))
+            if len(self._heap) < self.max_articles:
+                heapq.heappush(self._heap, (*key, _slim_article(article)))
+            elif key > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, (*key, _slim_article(article)))
+
+    def top(self) -> list[DevToArticle]:
+        """Return the kept articles, most reactions first."""
+        ranked = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        return [DevToArticle(**article) for _, _, article in ranked]
+
 
+def _slim_article(article: dict) -> dict:
+    """Keep only the fields shown on the profile."""
+    return {
+        "title": article.get("title", ""),
+        "url": article.get("url", ""),
+        "published_at": article.get("published_at", ""),
+        "reactions": article.get("positive_reactions_count", 0),
+        "comments": article.get("comments_count", 0),
+        "reading_time": article.get("reading_time_minutes", 0),
+        "tags": article.get("tag_list", []),
+    }
 
-async def fetch_devto_stats(username: str, max_articles: int = 5) -> dict:
+
+async def _fetch_page(client: ConditionalClient, username: str, page: int) -> list[dict]:
+    """Fetch one page of a user's published articles.
+
+    :raises NotFound: If Dev.to does not know *username*.
+    """
+    resp = await client.get(
+        DEVTO_API_URL,
+        params={
+            "username": username,
+            "per_page": PER_PAGE,
+            "page": page,
+        },
+        timeout=15.0,
+    )
+    if resp.status_code == 404:
+        raise NotFound(username)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def fetch_devto_stats(
+    username: str,
+    max_articles: int = 5,
+    previous: dict | None = None,
+) -> dict:
     """Fetch Dev.to stats for a given username.
 
+    The first page is fetched alone; if it is full, further pages are
+    requested :data:`PAGE_CONCURRENCY` at a time until one comes back
+    short.
+
     :param username: Dev.to username.
     :param max_articles: Maximum articles to return in the list.
+    :param previous: Previously cached stats (DevToStats shape), if any.
     :returns: Dict suitable for JSON serialisation (DevToStats shape).
+    :raises NotModified: If conditional requests are enabled, no page
+        changed since the last fetch and *previous* lists as many
+        articles as *max_articles* now asks for.
+    :raises NotFound: If Dev.to does not know *username*.
     """
-    all_articles: list[dict] = []
-    page = 1
-
-    async with httpx.AsyncClient() as client:
-        # Paginate to get totals (up to 1000 articles)
-        while True:
-            resp = await client.get(
-                DEVTO_API_URL,
-                params={
-                    "username": username,
-                    "per_page": 100,
-                    "page": page,
-                },
-                timeout=15.0,
-            )
-            resp.raise_for_status()
-            batch = resp.json()
-            if not batch:
-                break
-            all_articles.extend(batch)
-            if len(batch) < 100:
-                break
-            page += 1
-
-    total_reactions = sum(a.get("positive_reactions_count", 0) for a in all_articles)
-    total_comments = sum(a.get("comments_count", 0) for a in all_articles)
-
-    # Sort by reactions descending, take top N
-    all_articles.sort(
-        key=lambda a: a.get("positive_reactions_count", 0), reverse=True
-    )
-    top = all_articles[:max_articles]
-
-    articles = [
-        DevToArticle(
-            title=a.get("title", ""),
-            url=a.get("url", ""),
-            published_at=a.get("published_at", ""),
-            reactions=a.get("positive_reactions_count", 0),
-            comments=a.get("comments_count", 0),
-            reading_time=a.get("reading_time_minutes", 0),
-            tags=a.get("tag_list", []),
-        )
-        for a in top
-    ]
+    aggregator = _ArticleAggregator(max_articles)
+
+    async with httpx.AsyncClient(transport=outbound_transport()) as http:
+        client = ConditionalClient(http)
+
+        async def _consume(page: int) -> bool:
+            batch = await _fetch_page(client, username, page)
+            aggregator.add(batch, page)
+            return len(batch) == PER_PAGE
+
+        more = await _consume(1)
+        page = 2
+        while more:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(_consume(p))
+                    for p in range(page, page + PAGE_CONCURRENCY)
+                ]
+            more = all(task.result() for task in tasks)
+            page += PAGE_CONCURRENCY
+
+    # The pages don't depend on max_articles, so a changed limit must
+    # rebuild the list even when every page was a 304
+    expected = min(max(max_articles, 0), aggregator.total_articles)
+    if previous is not None and len(previous.get("articles", [])) == expected:
+        client.raise_if_not_modified()
 
     stats = DevToStats(
-        total_articles=len(all_articles),
-        total_reactions=total_reactions,
-        total_comments=total_comments,
-        articles=articles,
+        total_articles=aggregator.total_articles,
+        total_reactions=aggregator.total_reactions,
+        total_comments=aggregator.total_comments,
+        articles=aggregator.top(),
         fetched_at=datetime.now(timezone.utc).isoformat(),
     )
     return stats.model_dump()
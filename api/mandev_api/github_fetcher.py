@@ -1,11 +1,16 @@
 """GitHub GraphQL stats fetcher.
 
-Sends a single GraphQL query to the GitHub API and parses the response
-into a :class:`~mandev_core.github_models.GitHubStats` instance.
+Sends a profile query (followers, pinned repos, contribution calendar)
+and a cursor-paginated repository query to the GitHub API concurrently,
+and parses the responses into a
+:class:`~mandev_core.github_models.GitHubStats` instance.  Repository
+pages are streamed into the star and language aggregates as they
+arrive, so users with more than 100 repositories are counted fully.
 """
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 
 import httpx
@@ -17,6 +22,10 @@ from mandev_core.github_models import (
     GitHubStats,
 )
 
+from mandev_api.config import settings
+from mandev_api.integration_service import NotFound
+from mandev_api.outbound import outbound_transport
+
 GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
 
 QUERY = """
@@ -25,23 +34,60 @@ query ($username: String!) {
     followers {
       totalCount
     }
+    repositories(ownerAffiliations: OWNER) {
+      totalCount
+    }
+    pinnedItems(first: 6, types: REPOSITORY) {
+      nodes {
+        ... on Repository {
+          name
+          description
+          stargazerCount
+          forkCount
+          primaryLanguage {
+            name
+            color
+          }
+          url
+        }
+      }
+    }
+    contributionsCollection {
+      contributionYears
+      contributionCalendar {
+        totalContributions
+        weeks {
+          contributionDays {
+            date
+            contributionCount
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+REPOS_PAGE_SIZE = 100
+
+REPOS_QUERY = """
+query ($username: String!, $cursor: String, $pageSize: Int!, $withLanguages: Boolean!) {
+  user(login: $username) {
     repositories(
-      first: 100
+      first: $pageSize
+      after: $cursor
       ownerAffiliations: OWNER
       orderBy: {field: STARGAZERS, direction: DESC}
     ) {
-      totalCount
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
       nodes {
         name
-        description
         stargazerCount
-        forkCount
-        primaryLanguage {
-          name
-          color
-        }
-        url
-        languages(first: 10, orderBy: {field: SIZE, direction: DESC}) {
+        pushedAt
+        languages(first: 10, orderBy: {field: SIZE, direction: DESC}) @include(if: $withLanguages) {
           edges {
             size
             node {
@@ -52,24 +98,27 @@ query ($username: String!) {
         }
       }
     }
-    pinnedItems(first: 6, types: REPOSITORY) {
-      nodes {
-        ... on Repository {
+  }
+}
+"""
+
+LANGUAGES_FRAGMENT = """
+    languages(first: 10, orderBy: {field: SIZE, direction: DESC}) {
+      edges {
+        size
+        node {
           name
-          description
-          stargazerCount
-          forkCount
-          primaryLanguage {
-            name
-            color
-          }
-          url
+          color
         }
       }
     }
-    contributionsCollection {
+"""
+
+YEAR_QUERY = """
+query ($username: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $username) {
+    contributionsCollection(from: $from, to: $to) {
       contributionCalendar {
-        totalContributions
         weeks {
           contributionDays {
             date
@@ -83,6 +132,19 @@ query ($username: String!) {
 """
 
 
+def _parse_calendar_days(calendar: dict) -> list[ContributionDay]:
+    """Flatten a GraphQL contribution calendar into a list of days.
+
+    :param calendar: The ``contributionCalendar`` object.
+    :return: Chronologically ordered contribution days.
+    """
+    return [
+        ContributionDay(date=day["date"], count=day["contributionCount"])
+        for week in calendar["weeks"]
+        for day in week["contributionDays"]
+    ]
+
+
 def _compute_streaks(days: list[ContributionDay]) -> tuple[int, int]:
     """Compute current and longest contribution streaks.
 
@@ -109,6 +171,56 @@ def _compute_streaks(days: list[ContributionDay]) -> tuple[int, int]:
     return current, longest
 
 
+class _RepoAggregator:
+    """Running star and language totals over streamed repository pages.
+
+    Pages are fed in with :meth:`add` as they arrive and the raw nodes
+    can be dropped immediately afterwards.
+    """
+
+    def __init__(self) -> None:
+        self.total_stars = 0
+        self.repo_count = 0
+        self._languages: dict[str, dict[str, int | str]] = {}
+
+    def add(self, repos: list[dict]) -> None:
+        """Fold a page of repository nodes into the running totals.
+
+        :param repos: Repository node dicts from the GraphQL response.
+        """
+        for repo in repos:
+            self.repo_count += 1
+            self.total_stars += repo.get("stargazerCount", 0)
+            edges = (repo.get("languages") or {}).get("edges", [])
+            for edge in edges:
+                name = edge["node"]["name"]
+                size = edge["size"]
+                if name in self._languages:
+                    self._languages[name]["size"] += size  # type: ignore[operator]
+                else:
+                    self._languages[name] = {"size": size, "color": edge["node"]["color"]}
+
+    def languages(self) -> list[GitHubLanguage]:
+        """Convert the accumulated byte counts into percentages.
+
+        :return: Languages with computed percentages, sorted by usage.
+        """
+        total_bytes = sum(entry["size"] for entry in self._languages.values())  # type: ignore[arg-type]
+        if total_bytes == 0:
+            return []
+
+        languages = [
+            GitHubLanguage(
+                name=name,
+                percentage=round(entry["size"] / total_bytes * 100, 1),  # type: ignore[operator]
+                color=str(entry["color"]),
+            )
+            for name, entry in self._languages.items()
+        ]
+        languages.sort(key=lambda lang: lang.percentage, reverse=True)
+        return languages
+
+
 def _aggregate_languages(repos: list[dict]) -> list[GitHubLanguage]:
     """Aggregate language byte counts across repositories into percentages.
 
@@ -118,50 +230,169 @@ def _aggregate_languages(repos: list[dict]) -> list[GitHubLanguage]:
     :param repos: Repository node dicts from the GraphQL response.
     :return: Languages with computed percentages, sorted by usage.
     """
-    totals: dict[str, dict[str, int | str]] = {}
-
-    for repo in repos:
-        edges = repo.get("languages", {}).get("edges", [])
-        for edge in edges:
-            name = edge["node"]["name"]
-            color = edge["node"]["color"]
-            size = edge["size"]
-            if name in totals:
-                totals[name]["size"] += size  # type: ignore[operator]
-            else:
-                totals[name] = {"size": size, "color": color}
-
-    total_bytes = sum(entry["size"] for entry in totals.values())  # type: ignore[arg-type]
-    if total_bytes == 0:
-        return []
-
-    languages = [
-        GitHubLanguage(
-            name=name,
-            percentage=round(entry["size"] / total_bytes * 100, 1),  # type: ignore[operator]
-            color=str(entry["color"]),
+    aggregator = _RepoAggregator()
+    aggregator.add(repos)
+    return aggregator.languages()
+
+
+async def _post_graphql(
+    client: httpx.AsyncClient,
+    query: str,
+    variables: dict,
+    headers: dict[str, str],
+) -> dict:
+    """Send one GraphQL request and return its ``data`` object.
+
+    ``NOT_FOUND`` errors for anything but the ``user`` field (such as an
+    aliased repository that was renamed or deleted) leave ``data`` partial
+    and are left to the caller.
+
+    :raises httpx.HTTPStatusError: If the GitHub API returns an error.
+    :raises NotFound: If the queried user does not exist.
+    """
+    response = await client.post(
+        GITHUB_GRAPHQL_URL,
+        json={"query": query, "variables": variables},
+        headers=headers,
+        timeout=30.0,
+    )
+    response.raise_for_status()
+    payload = response.json()
+    data = payload.get("data")
+    if isinstance(data, dict) and "user" in data and data["user"] is None:
+        raise NotFound(variables.get("username"))
+    return data
+
+
+async def _fetch_languages(
+    client: httpx.AsyncClient,
+    username: str,
+    names: list[str],
+    headers: dict[str, str],
+) -> dict[str, dict]:
+    """Fetch the language breakdown for specific repositories in one query.
+
+    Each repository is requested under its own alias so a whole page of
+    changed repositories costs a single round trip.
+
+    :return: Mapping of repository name to its ``languages`` object;
+        repositories GitHub no longer resolves (renamed or deleted since
+        the page was listed) are left out.
+    """
+    if not names:
+        return {}
+
+    params = "".join(f", $n{i}: String!" for i in range(len(names)))
+    fields = "".join(
+        f"  r{i}: repository(owner: $owner, name: $n{i}) {{{LANGUAGES_FRAGMENT}  }}\n"
+        for i in range(len(names))
+    )
+    query = f"query ($owner: String!{params}) {{\n{fields}}}"
+    variables = {"owner": username, **{f"n{i}": name for i, name in enumerate(names)}}
+
+    data = await _post_graphql(client, query, variables, headers) or {}
+    return {
+        name: data[f"r{i}"].get("languages") or {}
+        for i, name in enumerate(names)
+        if data.get(f"r{i}") is not None
+    }
+
+
+async def _fetch_repositories(
+    client: httpx.AsyncClient,
+    username: str,
+    headers: dict[str, str],
+    aggregator: _RepoAggregator,
+    *,
+    max_repos: int,
+    repo_index: dict[str, dict] | None,
+) -> None:
+    """Page through a user's repositories, streaming each page into *aggregator*.
+
+    Repositories are ordered by stars, so hitting *max_repos* only drops
+    the least-starred ones.  When *repo_index* is given, pages are
+    fetched without languages and only repositories whose ``pushedAt``
+    changed since the index was built have their languages refetched;
+    the index is then updated in place.
+    """
+    incremental = repo_index is not None
+    new_index: dict[str, dict] = {}
+    cursor: str | None = None
+
+    while aggregator.repo_count < max_repos:
+        data = await _post_graphql(
+            client,
+            REPOS_QUERY,
+            {
+                "username": username,
+                "cursor": cursor,
+                "pageSize": min(REPOS_PAGE_SIZE, max_repos - aggregator.repo_count),
+                "withLanguages": not incremental,
+            },
+            headers,
         )
-        for name, entry in totals.items()
-    ]
-    languages.sort(key=lambda lang: lang.percentage, reverse=True)
-    return languages
+        repositories = data["user"]["repositories"]
+        nodes = repositories.get("nodes") or []
+
+        if incremental:
+            changed = [
+                node["name"]
+                for node in nodes
+                if node["name"] not in repo_index
+                or repo_index[node["name"]].get("pushed_at") != node.get("pushedAt")
+            ]
+            fetched = await _fetch_languages(client, username, changed, headers)
+            for node in nodes:
+                known = repo_index.get(node["name"], {})
+                if node["name"] in fetched:
+                    node["languages"] = fetched[node["name"]]
+                    pushed_at = node.get("pushedAt")
+                else:
+                    # Unchanged, or missing from the language query: keep
+                    # the old entry so a missing repository is retried
+                    node["languages"] = known.get("languages") or {}
+                    pushed_at = known.get("pushed_at")
+                new_index[node["name"]] = {
+                    "pushed_at": pushed_at,
+                    "languages": node["languages"],
+                }
+
+        aggregator.add(nodes)
+
+        page_info = repositories.get("pageInfo") or {}
+        if not nodes or not page_info.get("hasNextPage"):
+            break
+        cursor = page_info.get("endCursor")
+
+    if incremental:
+        repo_index.clear()
+        repo_index.update(new_index)
 
 
 async def fetch_github_stats(
     username: str,
     *,
     token: str | None,
+    max_repos: int | None = None,
+    repo_index: dict[str, dict] | None = None,
 ) -> GitHubStats:
     """Fetch GitHub statistics for a user via the GraphQL API.
 
-    Sends a single GraphQL query and parses the full response into a
+    Runs the profile query and the paginated repository query
+    concurrently and parses them into a
     :class:`~mandev_core.github_models.GitHubStats`.
 
     :param username: GitHub username to fetch stats for.
     :param token: GitHub personal access token.  Required.
+    :param max_repos: Cap on repositories aggregated for stars and
+        languages.  Defaults to ``settings.github_max_repos``.
+    :param repo_index: Per-repository ``pushedAt`` and languages from the
+        previous fetch.  When given, only changed repositories have their
+        languages refetched and the index is updated in place.
     :return: Parsed GitHub statistics.
     :raises ValueError: If *token* is ``None`` or empty.
     :raises httpx.HTTPStatusError: If the GitHub API returns an error.
+    :raises NotFound: If *username* does not exist.
     """
     if not token:
         raise ValueError("A GitHub token is required to fetch stats.")
@@ -170,22 +401,29 @@ async def fetch_github_stats(
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
     }
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            GITHUB_GRAPHQL_URL,
-            json={"query": QUERY, "variables": {"username": username}},
-            headers=headers,
-            timeout=30.0,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-    user = data["data"]["user"]
-
-    # Stars: sum across all returned repository nodes
-    repo_nodes = user["repositories"]["nodes"]
-    total_stars = sum(repo["stargazerCount"] for repo in repo_nodes)
+    aggregator = _RepoAggregator()
+
+    async with httpx.AsyncClient(transport=outbound_transport()) as client:
+        try:
+            async with asyncio.TaskGroup() as group:
+                query = group.create_task(
+                    _post_graphql(client, QUERY, {"username": username}, headers)
+                )
+                group.create_task(
+                    _fetch_repositories(
+                        client,
+                        username,
+                        headers,
+                        aggregator,
+                        max_repos=max_repos or settings.github_max_repos,
+                        repo_index=repo_index,
+                    )
+                )
+        except ExceptionGroup as group_error:
+            # The first failure cancelled the other request; surface it as documented
+            raise group_error.exceptions[0] from None
+
+    user = query.result()["user"]
 
     # Pinned repos
     pinned_repos = [
@@ -202,28 +440,59 @@ async def fetch_github_stats(
     ]
 
     # Contributions
-    calendar = user["contributionsCollection"]["contributionCalendar"]
-    contribution_days: list[ContributionDay] = []
-    for week in calendar["weeks"]:
-        for day in week["contributionDays"]:
-            contribution_days.append(
-                ContributionDay(date=day["date"], count=day["contributionCount"])
-            )
+    collection = user["contributionsCollection"]
+    calendar = collection["contributionCalendar"]
+    contribution_days = _parse_calendar_days(calendar)
 
     current_streak, longest_streak = _compute_streaks(contribution_days)
 
-    # Languages
-    languages = _aggregate_languages(repo_nodes)
-
     return GitHubStats(
-        total_stars=total_stars,
+        total_stars=aggregator.total_stars,
         total_repos=user["repositories"]["totalCount"],
         followers=user["followers"]["totalCount"],
         total_contributions=calendar["totalContributions"],
         current_streak=current_streak,
         longest_streak=longest_streak,
-        languages=languages,
+        languages=aggregator.languages(),
         pinned_repos=pinned_repos,
         contributions=contribution_days,
         fetched_at=datetime.now(timezone.utc).isoformat(),
+        contribution_years=collection.get("contributionYears", []),
     )
+
+
+async def fetch_contribution_year(
+    username: str,
+    year: int,
+    *,
+    token: str | None,
+) -> list[ContributionDay]:
+    """Fetch the full contribution calendar for one calendar year.
+
+    :param username: GitHub username to fetch contributions for.
+    :param year: Calendar year, e.g. ``2021``.
+    :param token: GitHub personal access token.  Required.
+    :return: Contribution days from January 1st to December 31st.
+    :raises ValueError: If *token* is ``None`` or empty.
+    :raises httpx.HTTPStatusError: If the GitHub API returns an error.
+    """
+    if not token:
+        raise ValueError("A GitHub token is required to fetch stats.")
+
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+    }
+    variables = {
+        "username": username,
+        "from": f"{year}-01-01T00:00:00Z",
+        "to": f"{year}-12-31T23:59:59Z",
+    }
+
+    async with httpx.AsyncClient(transport=outbound_transport()) as client:
+        data = await _post_graphql(client, YEAR_QUERY, variables, headers)
+
+    calendar = data["user"]["contributionsCollection"]["contributionCalendar"]
+    return [
+        day for day in _parse_calendar_days(calendar) if day.date.startswith(f"{year}-")
+    ]
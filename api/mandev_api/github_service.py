@@ -1,73 +1,173 @@
 """Cache-aware GitHub stats service.
 
 Wraps the GitHub fetcher with a database-backed cache layer.
-Stats are cached per GitHub username with a configurable TTL.
+Stats are cached per GitHub username with a TTL set by
+:mod:`mandev_api.ttl_policy`.  Each
+refresh also tops up the contribution archive with any past years it
+is missing, so lifetime totals never need more than the trailing-year
+query once a user's history is archived.  Fresh stats are also kept
+in the in-process L1 cache (:mod:`mandev_api.l1_cache`).
 """
 
 from __future__ import annotations
 
 import json
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
+from mandev_api.config import settings
 from mandev_api.tables import GitHubStatsCache
+from mandev_api.contribution_archive import update_lifetime_stats
 from mandev_api.github_fetcher import fetch_github_stats
+from mandev_api.integration_service import (
+    STATUS_NOT_FOUND,
+    STATUS_OK,
+    NotFound,
+    expires_at,
+    is_fresh,
+    measure_fetch,
+    record_lookup,
+)
+from mandev_api.l1_cache import MISSING, broadcast_invalidation, l1
+from mandev_api.resilience import is_circuit_open
+from mandev_api.timing import span
+from mandev_api.ttl_policy import base_ttl
 
 logger = logging.getLogger(__name__)
 
-CACHE_TTL_HOURS = 24
+L1_SERVICE = "github"
 
 
 async def get_github_stats(
     github_username: str,
     *,
     token: str | None,
+    ttl_hours: float | None = None,
 ) -> dict | None:
     """Get GitHub stats, using cache when fresh.
 
     :param github_username: The GitHub username to look up.
     :param token: GitHub API token (``None`` disables fetching).
-    :returns: Stats dict or ``None`` if unavailable.
+    :param ttl_hours: Freshness window, defaulting to the base TTL of
+        the ``github`` service.
+    :returns: Stats dict, or ``None`` if unavailable or the user does
+        not exist (remembered for the negative-cache TTL).
     """
-    # Check cache
-    cached = (
-        await GitHubStatsCache.objects()
-        .where(GitHubStatsCache.github_username == github_username)
-        .first()
-        .run()
-    )
+    hit = l1.get(L1_SERVICE, github_username)
+    if hit is not MISSING:
+        record_lookup(L1_SERVICE, "l1_hit")
+        return hit
+    if ttl_hours is None:
+        ttl_hours = base_ttl(L1_SERVICE)
 
-    if cached is not None:
-        age = datetime.now(timezone.utc) - cached.fetched_at.replace(
-            tzinfo=timezone.utc
+    # Check cache
+    with span("cache", f"github {github_username}"):
+        cached = (
+            await GitHubStatsCache.objects()
+            .where(GitHubStatsCache.github_username == github_username)
+            .first()
+            .run()
         )
-        if age < timedelta(hours=CACHE_TTL_HOURS):
-            return json.loads(cached.stats_json)
+
+    if cached is not None and is_fresh(cached.fetched_at, cached.status, ttl_hours):
+        record_lookup(L1_SERVICE, "hit")
+        stats = _cached_stats(cached)
+        _remember(cached, stats, ttl_hours)
+        return stats
 
     # No fresh cache -- fetch if we have a token
     if not token:
+        record_lookup(L1_SERVICE, "unavailable")
         return None
 
+    # Incremental mode carries the per-repo index across refreshes
+    fetch_kwargs: dict[str, object] = {}
+    repo_index: dict[str, dict] = {}
+    if settings.github_incremental_repos:
+        if cached is not None and cached.status == STATUS_OK and cached.repo_index_json:
+            repo_index = json.loads(cached.repo_index_json)
+        fetch_kwargs["repo_index"] = repo_index
+
     try:
-        stats = await fetch_github_stats(github_username, token=token)
-    except Exception:
-        logger.exception("Failed to fetch GitHub stats for %s", github_username)
+        with measure_fetch(L1_SERVICE):
+            stats = await fetch_github_stats(github_username, token=token, **fetch_kwargs)
+    except NotFound:
+        logger.info("GitHub user %s not found", github_username)
+        record_lookup(L1_SERVICE, "refreshed")
+        await _save(github_username, None, "{}", ttl_hours)
+        return None
+    except Exception as exc:
+        if is_circuit_open(exc):
+            logger.info("GitHub unavailable, serving cached stats for %s", github_username)
+        else:
+            logger.exception("Failed to fetch GitHub stats for %s", github_username)
         # Return stale cache if available
+        record_lookup(L1_SERVICE, "stale" if cached is not None else "unavailable")
         if cached is not None:
-            return json.loads(cached.stats_json)
+            return _cached_stats(cached)
         return None
 
-    stats_json = json.dumps(stats.model_dump())
+    try:
+        await update_lifetime_stats(github_username, stats, token=token)
+    except Exception:
+        logger.exception("Failed to update contribution archive for %s", github_username)
+
+    record_lookup(L1_SERVICE, "refreshed")
+    return await _save(
+        github_username, stats.model_dump(mode="json"), json.dumps(repo_index), ttl_hours
+    )
 
-    if cached is not None:
-        cached.stats_json = stats_json
-        cached.fetched_at = datetime.now(timezone.utc)
-    else:
-        cached = GitHubStatsCache(
-            github_username=github_username,
-            stats_json=stats_json,
-            fetched_at=datetime.now(timezone.utc),
-        )
 
-    await cached.save().run()
-    return json.loads(stats_json)
+def _cached_stats(cached: GitHubStatsCache) -> dict | None:
+    """Decode a cache row, or ``None`` for a negative entry."""
+    if cached.status == STATUS_NOT_FOUND:
+        return None
+    return json.loads(cached.stats_json)
+
+
+def _remember(cached: GitHubStatsCache, stats: dict | None, ttl_hours: float) -> None:
+    """Put a row's stats in the L1 cache until the row goes stale."""
+    l1.put(
+        L1_SERVICE,
+        cached.github_username,
+        stats,
+        expires_at(cached.fetched_at, cached.status, ttl_hours),
+    )
+
+
+async def _save(
+    github_username: str,
+    stats: dict | None,
+    repo_index_json: str,
+    ttl_hours: float,
+) -> dict | None:
+    """Insert or replace the cache row for *github_username*.
+
+    :param stats: Fresh stats, or ``None`` to record a negative entry.
+    :param ttl_hours: Freshness window, for the L1 entry.
+    :returns: *stats*.
+    """
+    cached = GitHubStatsCache(
+        github_username=github_username,
+        stats_json=json.dumps(stats if stats is not None else {}),
+        repo_index_json=repo_index_json,
+        status=STATUS_OK if stats is not None else STATUS_NOT_FOUND,
+        fetched_at=datetime.now(timezone.utc),
+    )
+    await (
+        GitHubStatsCache.insert(cached)
+        .on_conflict(
+            target=GitHubStatsCache.github_username,
+            action="DO UPDATE",
+            values=[
+                GitHubStatsCache.stats_json,
+                GitHubStatsCache.repo_index_json,
+                GitHubStatsCache.status,
+                GitHubStatsCache.fetched_at,
+            ],
+        )
+        .run()
+    )
+    _remember(cached, stats, ttl_hours)
+    await broadcast_invalidation(GitHubStatsCache, L1_SERVICE, github_username)
+    return stats
@@ -1,25 +1,47 @@
 """Hashnode articles fetcher.
 
 Queries the Hashnode GraphQL API for a user's published articles.
+Posts are walked with cursor pagination (``pageInfo.endCursor``) and
+each page is folded into a running reaction total and a bounded heap of
+the newest articles while the next page is already in flight.
+
+Given the previously cached stats, the fetcher runs incrementally: it
+stops once it reaches posts older than both the previous ``fetched_at``
+and the previously listed articles.  Posts are identified by URL, so
+the previously listed articles get fresh reaction counts and no post is
+counted twice.  Older posts keep the reactions they had at the last
+full crawl, which happens every :data:`FULL_CRAWL_DAYS`, and sooner
+when the previous stats can't be extended: they list fewer articles
+than ``max_articles`` allows (the limit was raised, or posts were
+deleted), or the publication now has fewer posts than they counted.
 """
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import httpx
 
 from mandev_core.integration_models import HashnodeArticle, HashnodeStats
 
+from mandev_api.integration_service import NotFound
+from mandev_api.outbound import outbound_transport
+
 logger = logging.getLogger(__name__)
 
 HASHNODE_GQL_URL = "https://gql.hashnode.com"
+PAGE_SIZE = 50
+FULL_CRAWL_DAYS = 7
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
 
 QUERY = """
-query GetUserArticles($username: String!, $pageSize: Int!) {
+query GetUserArticles($username: String!, $pageSize: Int!, $after: String) {
   publication(host: $username) {
-    posts(first: $pageSize) {
+    posts(first: $pageSize, after: $after) {
       edges {
         node {
           title
@@ -29,6 +51,10 @@ query GetUserArticles($username: String!, $pageSize: Int!) {
           reactionCount
         }
       }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
       totalDocuments
     }
   }
@@ -36,61 +62,206 @@ query GetUserArticles($username: String!, $pageSize: Int!) {
 """
 
 
-async def fetch_hashnode_stats(username: str, max_articles: int = 5) -> dict:
+class _PostAggregator:
+    """Running reaction total and the newest articles over streamed posts.
+
+    Each post is counted once, keyed by URL.  Posts already counted in
+    *previous* stats replace their old reaction count instead of adding
+    to it.
+
+    :param max_articles: Number of newest articles to keep.
+    :param previous: Previously cached stats (HashnodeStats shape) whose
+        ``total_reactions`` already includes the posts it lists, or
+        ``None`` for a full crawl.
+    """
+
+    def __init__(self, max_articles: int, previous: dict | None = None) -> None:
+        self.max_articles = max_articles
+        self.total_reactions = (previous or {}).get("total_reactions", 0)
+        self._previous = {
+            article["url"]: article for article in (previous or {}).get("articles", [])
+        }
+        self._seen: set[str] = set()
+        self._heap: list[tuple[datetime, int, dict]] = []
+
+    def add(self, article: dict) -> None:
+        """Fold one fetched article (``HashnodeArticle`` shape) into the aggregate.
+
+        :param article: The article to add; repeats of a URL are ignored.
+        """
+        url = article["url"]
+        if url in self._seen:
+            return
+        self._seen.add(url)
+        known = self._previous.get(url)
+        self.total_reactions += article["reactions"] - (known or {}).get("reactions", 0)
+        self._keep(article)
+
+    def finish(self) -> None:
+        """Keep previously listed articles that were not fetched again."""
+        for url, article in self._previous.items():
+            if url not in self._seen:
+                self._seen.add(url)
+                self._keep(article)
+
+    def _keep(self, article: dict) -> None:
+        """Offer *article* to the heap of newest articles."""
+        if self.max_articles <= 0:
+            return
+        published = _parse_time(article.get("published_at")) or _EPOCH
+        # Ties keep arrival order, newest first
+        entry = (published, -len(self._seen), article)
+        if len(self._heap) < self.max_articles:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def newest(self) -> list[HashnodeArticle]:
+        """Return the kept articles, newest first."""
+        ranked = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        return [HashnodeArticle(**article) for _, _, article in ranked]
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    """Parse an ISO-8601 timestamp, tolerating a trailing ``Z``."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    host: str,
+    after: str | None,
+) -> dict | None:
+    """Fetch one page of posts; ``None`` if the publication does not exist."""
+    resp = await client.post(
+        HASHNODE_GQL_URL,
+        json={
+            "query": QUERY,
+            "variables": {"username": host, "pageSize": PAGE_SIZE, "after": after},
+        },
+        headers={"Content-Type": "application/json"},
+        timeout=15.0,
+    )
+    resp.raise_for_status()
+    publication = (resp.json().get("data") or {}).get("publication")
+    if not publication:
+        return None
+    return publication.get("posts", {})
+
+
+def _incremental_cutoff(previous: dict | None, max_articles: int, now: datetime) -> datetime | None:
+    """Return the publish time an incremental crawl may stop at.
+
+    :returns: ``None`` when a full crawl is due.
+    """
+    if previous is None:
+        return None
+    full_crawl_at = _parse_time(previous.get("full_crawl_at"))
+    if not full_crawl_at or now - full_crawl_at >= timedelta(days=FULL_CRAWL_DAYS):
+        return None
+    articles = previous.get("articles", [])
+    if len(articles) < min(max(max_articles, 0), previous.get("total_articles", 0)):
+        return None
+    # Walk back far enough to refresh every previously listed article
+    return min(
+        filter(
+            None,
+            [
+                _parse_time(previous.get("fetched_at")),
+                *(_parse_time(article.get("published_at")) for article in articles),
+            ],
+        ),
+        default=None,
+    )
+
+
+async def fetch_hashnode_stats(
+    username: str,
+    max_articles: int = 5,
+    previous: dict | None = None,
+) -> dict:
     """Fetch Hashnode stats for a given username.
 
     :param username: Hashnode blog host (e.g. ``"username.hashnode.dev"``
         or just ``"username"``).
     :param max_articles: Maximum articles to return.
+    :param previous: Previously cached stats (HashnodeStats shape).  When
+        given and a full crawl is not due, only newer posts are fetched.
     :returns: Dict suitable for JSON serialisation (HashnodeStats shape).
+    :raises NotFound: If no publication exists at the host.
     """
     host = username if "." in username else f"{username}.hashnode.dev"
+    now = datetime.now(timezone.utc)
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            HASHNODE_GQL_URL,
-            json={
-                "query": QUERY,
-                "variables": {"username": host, "pageSize": max_articles},
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=15.0,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-    publication = (data.get("data") or {}).get("publication")
-    if not publication:
-        return HashnodeStats(
-            total_articles=0,
-            total_reactions=0,
-            articles=[],
-            fetched_at=datetime.now(timezone.utc).isoformat(),
-        ).model_dump()
-
-    posts = publication.get("posts", {})
-    edges = posts.get("edges", [])
-    total = posts.get("totalDocuments", len(edges))
-
-    articles: list[HashnodeArticle] = []
-    total_reactions = 0
-
-    for edge in edges:
-        node = edge.get("node", {})
-        reactions = node.get("reactionCount", 0)
-        total_reactions += reactions
-        articles.append(HashnodeArticle(
-            title=node.get("title", ""),
-            url=node.get("url", ""),
-            published_at=node.get("publishedAt", ""),
-            reactions=reactions,
-            brief=node.get("brief", ""),
-        ))
+    stop_before = _incremental_cutoff(previous, max_articles, now)
+    if stop_before is None:
+        previous = None
+        full_crawl_at = now
+    else:
+        full_crawl_at = _parse_time(previous["full_crawl_at"])
+
+    total = 0
+
+    async with httpx.AsyncClient(transport=outbound_transport()) as client:
+        posts = await _fetch_page(client, host, None)
+        if posts is None:
+            raise NotFound(host)
+        if previous is not None and posts.get("totalDocuments", 0) < previous.get(
+            "total_articles", 0
+        ):
+            # Posts were deleted; their reactions are still in the old total
+            stop_before = previous = None
+            full_crawl_at = now
+        aggregator = _PostAggregator(max_articles, previous)
+
+        next_page: asyncio.Task[dict | None] | None = None
+        try:
+            while posts is not None:
+                total = posts.get("totalDocuments", total)
+                page_info = posts.get("pageInfo") or {}
+
+                # Request the next page before folding this one in
+                if page_info.get("hasNextPage") and page_info.get("endCursor"):
+                    next_page = asyncio.create_task(
+                        _fetch_page(client, host, page_info["endCursor"])
+                    )
+
+                reached_known = False
+                for edge in posts.get("edges", []):
+                    node = edge.get("node", {})
+                    published = _parse_time(node.get("publishedAt"))
+                    if stop_before and published and published < stop_before:
+                        reached_known = True
+                        break
+                    aggregator.add({
+                        "title": node.get("title", ""),
+                        "url": node.get("url", ""),
+                        "published_at": node.get("publishedAt", ""),
+                        "reactions": node.get("reactionCount", 0),
+                        "brief": node.get("brief", ""),
+                    })
+
+                if reached_known or next_page is None:
+                    break
+                posts = await next_page
+                next_page = None
+        finally:
+            # Don't leave a prefetch running (or its error unretrieved)
+            if next_page is not None:
+                next_page.cancel()
+                await asyncio.wait([next_page])
+                if not next_page.cancelled():
+                    next_page.exception()
 
+    aggregator.finish()
     stats = HashnodeStats(
         total_articles=total,
-        total_reactions=total_reactions,
-        articles=articles,
-        fetched_at=datetime.now(timezone.utc).isoformat(),
+        total_reactions=aggregator.total_reactions,
+        articles=aggregator.newest(),
+        fetched_at=now.isoformat(),
+        full_crawl_at=full_crawl_at.isoformat(),
     )
     return stats.model_dump()
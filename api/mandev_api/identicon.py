@@ -0,0 +1,79 @@
+"""Default avatars: symmetric identicons rendered as PNG.
+
+The pattern and colour come from a SHAKE-256 digest of the seed (the
+username), so the same name gets the same image in every process.  An
+image is an :data:`GRID` x :data:`GRID` grid mirrored left to right;
+each grid row is built once as bytes and repeated for the pixel rows it
+covers, so rendering costs one ``zlib`` pass over the image.  Rendered
+images are kept in an LRU cache per (seed, size).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+import zlib
+from functools import lru_cache
+
+GRID = 8
+DEFAULT_SIZE = 64
+MIN_SIZE = GRID
+MAX_SIZE = 512
+# Sizes the avatar endpoint serves, so requests can't spread the cache thin
+SIZES = (32, 64, 128, 256, 512)
+BACKGROUND = bytes((40, 42, 54))
+CACHE_SIZE = 4096
+
+_HALF = (GRID + 1) // 2
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Frame one PNG chunk with its length and CRC."""
+    body = chunk_type + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+
+def normalize_size(size: int) -> int:
+    """Clamp *size* to the supported range, rounded down to a multiple of :data:`GRID`."""
+    size = min(max(size, MIN_SIZE), MAX_SIZE)
+    return size - size % GRID
+
+
+def identicon_png(seed: str, size: int = DEFAULT_SIZE) -> bytes:
+    """Render the identicon for *seed* as PNG bytes.
+
+    :param seed: String to derive the image from (e.g. a username).
+    :param size: Requested width and height in pixels; see
+        :func:`normalize_size`.
+    :returns: An RGB PNG image.
+    """
+    return _render(seed, normalize_size(size))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _render(seed: str, size: int) -> bytes:
+    digest = hashlib.shake_256(seed.encode()).digest(3 + GRID * _HALF)
+    r, g, b = digest[:3]
+    if max(r, g, b) < 100:
+        # Keep dark colours readable on the dark background
+        r, g, b = min(r + 100, 255), min(g + 80, 255), min(b + 120, 255)
+
+    scale = size // GRID
+    filled = bytes((r, g, b)) * scale
+    empty = BACKGROUND * scale
+    rows: list[bytes] = []
+    for row in range(GRID):
+        cells = digest[3 + row * _HALF : 3 + (row + 1) * _HALF]
+        left = [filled if cell % 3 else empty for cell in cells]
+        right = left[: GRID - _HALF][::-1]
+        # Filter byte 0 ("none"), then the pixels; repeated for each pixel row
+        rows.append((b"\x00" + b"".join(left + right)) * scale)
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return (
+        _PNG_SIGNATURE
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(b"".join(rows)))
+        + _chunk(b"IEND", b"")
+    )
@@ -2,26 +2,201 @@
 
 Wraps any integration fetcher with a database-backed cache layer.
 Same pattern as ``github_service.py`` but parameterized by service name.
+
+Refreshes of an existing entry run with conditional requests enabled:
+if the fetcher reports that nothing changed upstream, the cached stats
+are kept and only their ``fetched_at`` is bumped.  While an upstream's
+circuit breaker is open the fetch fails immediately and stale entries
+are served as they are.
+
+Fresh entries are also kept in the in-process L1 cache
+(:mod:`mandev_api.l1_cache`), so warm reads skip the database entirely.
+
+Fetchers raise :class:`NotFound` when the configured user or package
+does not exist upstream.  That result is cached too, with status
+``not_found`` and the shorter :data:`NEGATIVE_TTL_HOURS`, so a typo in
+a config costs one upstream request per negative TTL rather than one
+per page view.
+
+Upstream concurrency is not bounded here: every fetcher's transport
+goes through the per-host adaptive limiter in :mod:`mandev_api.outbound`.
+
+Lookups are counted per service and result with :func:`record_lookup`,
+and fetcher calls are timed with :func:`measure_fetch` (see
+:mod:`mandev_api.metrics`).  Cache reads and fetches are also ``cache``
+and ``fetch`` request spans, and every lookup result is a ``cache``
+event on the current span (see :mod:`mandev_api.timing`).
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from typing import Awaitable, Callable
 
+from mandev_api import metrics
+from mandev_api.conditional_http import NotModified, conditional_requests
+from mandev_api.l1_cache import MISSING, broadcast_invalidation, l1
+from mandev_api.resilience import is_circuit_open
 from mandev_api.tables import IntegrationCache
+from mandev_api.timing import event, span
+from mandev_api.ttl_policy import base_ttl
 
 logger = logging.getLogger(__name__)
 
-CACHE_TTL_HOURS = 24
+NEGATIVE_TTL_HOURS = 6
+
+STATUS_OK = "ok"
+STATUS_NOT_FOUND = "not_found"
+
+CACHE_LOOKUPS = metrics.Counter(
+    "mandev_cache_lookups_total",
+    "Stats cache lookups by result (l1_hit, hit, refreshed, not_modified, stale, unavailable).",
+    ("service", "result"),
+)
+FETCH_DURATION = metrics.Histogram(
+    "mandev_fetch_duration_seconds", "Fetcher call latency.", ("service",)
+)
+FETCH_ERRORS = metrics.Counter(
+    "mandev_fetch_errors_total", "Failed fetcher calls.", ("service", "kind")
+)
+
+class NotFound(Exception):
+    """Raised by a fetcher when the requested user or package does not exist."""
+
+
+def expires_at(fetched_at: datetime, status: str, ttl_hours: float) -> datetime:
+    """When a cache entry goes stale.
+
+    :param fetched_at: When the entry was stored.
+    :param status: Entry status; ``not_found`` entries use the shorter
+        of *ttl_hours* and :data:`NEGATIVE_TTL_HOURS`.
+    :param ttl_hours: TTL of positive entries.
+    """
+    if status == STATUS_NOT_FOUND:
+        ttl_hours = min(ttl_hours, NEGATIVE_TTL_HOURS)
+    return fetched_at.replace(tzinfo=timezone.utc) + timedelta(hours=ttl_hours)
+
+
+def is_fresh(
+    fetched_at: datetime,
+    status: str,
+    ttl_hours: float,
+    now: datetime | None = None,
+) -> bool:
+    """Whether a cache entry is still within its TTL (see :func:`expires_at`).
+
+    :param now: Reference time (defaults to the current time).
+    """
+    now = now or datetime.now(timezone.utc)
+    return now < expires_at(fetched_at, status, ttl_hours)
+
+
+def record_lookup(service: str, result: str, amount: int = 1) -> None:
+    """Count cache lookups and note the decision on the current span.
+
+    :param service: Cache service looked up.
+    :param result: ``l1_hit``, ``hit``, ``refreshed``, ``not_modified``,
+        ``stale`` or ``unavailable``.
+    :param amount: Number of keys with this result.
+    """
+    if amount:
+        CACHE_LOOKUPS.inc(service, result, amount=amount)
+        event("cache", service=service, result=result, count=amount)
+
+
+@contextmanager
+def measure_fetch(service: str) -> Iterator[None]:
+    """Time a fetcher call and count its failures.
+
+    :class:`NotModified` and :class:`NotFound` are answers, not failures.
+
+    :param service: Cache service the fetcher fills.
+    """
+    started = time.perf_counter()
+    try:
+        with span("fetch", service):
+            yield
+    except (NotModified, NotFound):
+        raise
+    except Exception as exc:
+        FETCH_ERRORS.inc(service, "circuit_open" if is_circuit_open(exc) else "error")
+        raise
+    finally:
+        FETCH_DURATION.observe(time.perf_counter() - started, service)
+
+
+def _cached_stats(row: IntegrationCache) -> dict | None:
+    """Decode a cache row, or ``None`` for a negative entry."""
+    if row.status == STATUS_NOT_FOUND:
+        return None
+    return json.loads(row.stats_json)
+
+
+def _new_row(
+    service: str,
+    lookup_key: str,
+    stats: dict | None,
+    fetched_at: datetime,
+) -> IntegrationCache:
+    """Build an unsaved row for fresh stats, or a negative entry if ``None``."""
+    return IntegrationCache(
+        service=service,
+        lookup_key=lookup_key,
+        stats_json=json.dumps(stats if stats is not None else {}),
+        status=STATUS_OK if stats is not None else STATUS_NOT_FOUND,
+        fetched_at=fetched_at,
+    )
+
+
+async def _upsert(rows: list[IntegrationCache]) -> None:
+    """Insert *rows*, replacing existing rows with the same key.
+
+    Relies on the unique ``(service, lookup_key)`` index, so concurrent
+    refreshes of one key can never leave duplicate rows.
+    """
+    if not rows:
+        return
+    await (
+        IntegrationCache.insert(*rows)
+        .on_conflict(
+            target=(IntegrationCache.service, IntegrationCache.lookup_key),
+            action="DO UPDATE",
+            values=[
+                IntegrationCache.stats_json,
+                IntegrationCache.status,
+                IntegrationCache.fetched_at,
+            ],
+        )
+        .run()
+    )
+
+
+async def _remember(
+    row: IntegrationCache,
+    stats: dict | None,
+    ttl_hours: float,
+    *,
+    written: bool,
+) -> dict | None:
+    """Put a row's stats in the L1 cache, telling other workers if it changed."""
+    l1.put(row.service, row.lookup_key, stats, expires_at(row.fetched_at, row.status, ttl_hours))
+    if written:
+        await broadcast_invalidation(IntegrationCache, row.service, row.lookup_key)
+    return stats
 
 
 async def get_cached_stats(
     service: str,
     lookup_key: str,
     fetcher: Callable[..., Awaitable[dict]],
+    *,
+    ttl_hours: float | None = None,
+    incremental: bool = False,
     **fetcher_kwargs: object,
 ) -> dict | None:
     """Get integration stats, using cache when fresh.
@@ -29,46 +204,144 @@ async def get_cached_stats(
     :param service: Integration name (e.g. ``"npm"``, ``"pypi"``).
     :param lookup_key: Cache key (username or deterministic hash).
     :param fetcher: Async callable that returns a stats dict.
+    :param ttl_hours: Freshness window, defaulting to the service's
+        base TTL (see :mod:`mandev_api.ttl_policy`).
+    :param incremental: Pass the cached stats to *fetcher* as
+        ``previous`` so it can fetch only what changed.
     :param fetcher_kwargs: Extra kwargs forwarded to *fetcher*.
-    :returns: Stats dict or ``None`` if unavailable.
+    :returns: Stats dict, or ``None`` if unavailable or not found.
     """
-    cached = (
-        await IntegrationCache.objects()
-        .where(
-            IntegrationCache.service == service,
-            IntegrationCache.lookup_key == lookup_key,
-        )
-        .first()
-        .run()
-    )
+    hit = l1.get(service, lookup_key)
+    if hit is not MISSING:
+        record_lookup(service, "l1_hit")
+        return hit
+    if ttl_hours is None:
+        ttl_hours = base_ttl(service)
 
-    if cached is not None:
-        age = datetime.now(timezone.utc) - cached.fetched_at.replace(
-            tzinfo=timezone.utc
+    with span("cache", f"{service} {lookup_key}"):
+        cached = (
+            await IntegrationCache.objects()
+            .where(
+                IntegrationCache.service == service,
+                IntegrationCache.lookup_key == lookup_key,
+            )
+            .first()
+            .run()
         )
-        if age < timedelta(hours=CACHE_TTL_HOURS):
-            return json.loads(cached.stats_json)
+
+    if cached is not None and is_fresh(cached.fetched_at, cached.status, ttl_hours):
+        record_lookup(service, "hit")
+        return await _remember(cached, _cached_stats(cached), ttl_hours, written=False)
+
+    has_stats = cached is not None and cached.status == STATUS_OK
+    if incremental and has_stats:
+        fetcher_kwargs["previous"] = json.loads(cached.stats_json)
 
     try:
-        stats = await fetcher(**fetcher_kwargs)
-    except Exception:
-        logger.exception("Failed to fetch %s stats for %s", service, lookup_key)
+        with conditional_requests(enabled=has_stats), measure_fetch(service):
+            stats = await fetcher(**fetcher_kwargs)
+    except NotModified:
+        # Upstream unchanged: extend the TTL without reparsing
+        record_lookup(service, "not_modified")
+        cached.fetched_at = datetime.now(timezone.utc)
+        await cached.save([IntegrationCache.fetched_at]).run()
+        return await _remember(cached, json.loads(cached.stats_json), ttl_hours, written=True)
+    except NotFound:
+        logger.info("%s entry %s not found upstream", service, lookup_key)
+        stats = None
+    except Exception as exc:
+        if is_circuit_open(exc):
+            logger.info("%s upstream unavailable, serving cached %s", service, lookup_key)
+        else:
+            logger.exception("Failed to fetch %s stats for %s", service, lookup_key)
+        record_lookup(service, "stale" if cached is not None else "unavailable")
         if cached is not None:
-            return json.loads(cached.stats_json)
+            return _cached_stats(cached)
         return None
 
-    stats_json = json.dumps(stats)
+    record_lookup(service, "refreshed")
+    row = _new_row(service, lookup_key, stats, datetime.now(timezone.utc))
+    await _upsert([row])
+    return await _remember(row, stats, ttl_hours, written=True)
 
-    if cached is not None:
-        cached.stats_json = stats_json
-        cached.fetched_at = datetime.now(timezone.utc)
-    else:
-        cached = IntegrationCache(
-            service=service,
-            lookup_key=lookup_key,
-            stats_json=stats_json,
-            fetched_at=datetime.now(timezone.utc),
+
+async def get_cached_many(
+    service: str,
+    lookup_keys: list[str],
+    fetcher: Callable[[list[str]], Awaitable[dict[str, dict | None]]],
+    *,
+    ttl_hours: float | None = None,
+) -> dict[str, dict]:
+    """Get stats for many keys of one service with a single cache query.
+
+    Fresh entries are served from the cache; all other keys are passed
+    to one call of *fetcher*, which returns stats for the keys it could
+    resolve and ``None`` for keys that do not exist upstream (cached as
+    ``not_found``).  Entries are not tied to a user, so a key shared by many
+    profiles (e.g. a popular package) is fetched once per TTL.
+
+    :param service: Cache namespace (e.g. ``"npm_downloads"``).
+    :param lookup_keys: Keys to look up; duplicates are ignored.
+    :param fetcher: Async callable taking the missing keys.
+    :param ttl_hours: Freshness window, defaulting to the service's
+        base TTL (see :mod:`mandev_api.ttl_policy`).
+    :returns: Stats per key; unresolved and not-found keys are omitted.
+    """
+    keys = list(dict.fromkeys(lookup_keys))
+    if not keys:
+        return {}
+    if ttl_hours is None:
+        ttl_hours = base_ttl(service)
+
+    with span("cache", f"{service} x{len(keys)}"):
+        rows = (
+            await IntegrationCache.objects()
+            .where(
+                IntegrationCache.service == service,
+                IntegrationCache.lookup_key.is_in(keys),
+            )
+            .run()
         )
+    by_key = {row.lookup_key: row for row in rows}
+
+    now = datetime.now(timezone.utc)
+    result: dict[str, dict] = {}
+    missing: list[str] = []
+    for key in keys:
+        row = by_key.get(key)
+        if row is None or not is_fresh(row.fetched_at, row.status, ttl_hours, now):
+            missing.append(key)
+        elif row.status == STATUS_OK:
+            result[key] = json.loads(row.stats_json)
+    record_lookup(service, "hit", amount=len(keys) - len(missing))
+
+    if not missing:
+        return result
+
+    try:
+        with measure_fetch(service):
+            fetched = await fetcher(missing)
+    except Exception as exc:
+        if is_circuit_open(exc):
+            logger.info("%s upstream unavailable, serving cached entries", service)
+        else:
+            logger.exception("Failed to fetch %s stats for %d keys", service, len(missing))
+        fetched = {}
+
+    written: list[IntegrationCache] = []
+    for key in missing:
+        row = by_key.get(key)
+        if key not in fetched:
+            # Serve stale data rather than nothing
+            record_lookup(service, "stale" if row is not None else "unavailable")
+            if row is not None and row.status == STATUS_OK:
+                result[key] = json.loads(row.stats_json)
+            continue
+
+        record_lookup(service, "refreshed")
+        if fetched[key] is not None:
+            result[key] = fetched[key]
+        written.append(_new_row(service, key, fetched[key], now))
 
-    await cached.save().run()
-    return json.loads(stats_json)
+    await _upsert(written)
+    return result
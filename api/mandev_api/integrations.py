@@ -0,0 +1,294 @@
+"""Registry of profile integrations.
+
+Each :class:`Integration` declares everything needed to turn one section
+of a :class:`~mandev_core.MandevConfig` into cached stats: the config
+model it validates against, how its cache lookup key is derived, the
+fetcher and its arguments, its TTL and a concurrency budget.  TTLs come
+from :mod:`mandev_api.ttl_policy`, scaled by the profile's popularity.
+The profile endpoint and the batch refresh script drive every
+integration through :func:`load_all` instead of hand-written
+per-service code.
+
+Upstream concurrency is bounded by the per-host adaptive limiters of
+:mod:`mandev_api.outbound`; an integration's ``concurrency`` is an
+optional cap on top of them, installed with
+:func:`~mandev_api.outbound.request_budget` while it fetches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from mandev_core.models import DevTo, GitHub, Hashnode, Npm, PyPI
+
+from mandev_api import metrics
+from mandev_api.config import settings
+from mandev_api.devto_fetcher import fetch_devto_stats
+from mandev_api.github_service import get_github_stats
+from mandev_api.hashnode_fetcher import fetch_hashnode_stats
+from mandev_api.integration_service import get_cached_stats
+from mandev_api.npm_fetcher import fetch_npm_stats
+from mandev_api.outbound import request_budget
+from mandev_api.pypi_fetcher import fetch_pypi_stats, normalize_name
+from mandev_api.timing import span
+from mandev_api.ttl_policy import ttl_hours
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IntegrationMetrics:
+    """Per-integration counters, accumulated for the process lifetime."""
+
+    loads: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class LoadContext:
+    """Per-profile values an integration may need besides its config.
+
+    :param github_token: Token for GitHub API calls (user's or global).
+    :param ttl_factor: The profile's popularity factor, scaling every
+        integration's TTL (see :func:`~mandev_api.ttl_policy.popularity_factor`).
+    """
+
+    github_token: str | None = None
+    ttl_factor: float = 1.0
+
+
+@dataclass(eq=False)
+class Integration:
+    """One profile integration.
+
+    :param name: Config section and service name (``"npm"``); stats are
+        returned under ``f"{name}_stats"``.
+    :param config_model: Model the config section is validated against.
+    :param lookup_key: Derives the cache key from a validated config, or
+        ``None`` if the section does not identify anything to fetch.
+    :param fetcher: Async callable returning a stats dict.
+    :param fetcher_kwargs: Derives the fetcher's arguments from the config.
+    :param ttl_service: :mod:`~mandev_api.ttl_policy` service whose TTL
+        applies, defaulting to *name*.
+    :param concurrency: Cap on this integration's upstream requests in
+        flight, across all profiles, on top of the per-host limits;
+        ``None`` leaves it to the host limits alone.
+    :param incremental: Whether the fetcher accepts ``previous`` stats.
+    :param loader: Replaces the default :class:`IntegrationCache` path,
+        for integrations with their own cache (GitHub).
+    """
+
+    name: str
+    config_model: type[BaseModel]
+    lookup_key: Callable[[Any], str | None]
+    fetcher: Callable[..., Awaitable[dict]] | None = None
+    fetcher_kwargs: Callable[[Any], dict[str, object]] = lambda config: {}
+    ttl_service: str | None = None
+    concurrency: int | None = None
+    incremental: bool = False
+    loader: Callable[[Any, str, LoadContext], Awaitable[dict | None]] | None = None
+    metrics: IntegrationMetrics = field(default_factory=IntegrationMetrics)
+
+    def __post_init__(self) -> None:
+        self.semaphore = (
+            asyncio.Semaphore(self.concurrency) if self.concurrency is not None else None
+        )
+
+    def ttl_hours(self, factor: float = 1.0) -> float:
+        """Return this integration's TTL, in hours, for a popularity *factor*."""
+        return ttl_hours(self.ttl_service or self.name, factor)
+
+    def parse(self, raw: object) -> BaseModel | None:
+        """Validate a raw config section.
+
+        An invalid section is logged with its validation errors, so a
+        section missing from a profile can be traced to its config.
+
+        :param raw: The section as stored in the profile JSON.
+        :returns: The validated model, or ``None`` if absent or invalid.
+        """
+        if not raw:
+            return None
+        try:
+            return self.config_model.model_validate(raw)
+        except ValidationError as exc:
+            errors = "; ".join(
+                f"{'.'.join(map(str, error['loc'])) or '<section>'}: {error['msg']}"
+                for error in exc.errors()
+            )
+            logger.warning("Ignoring invalid %s config: %s", self.name, errors)
+            return None
+
+    async def load(self, raw: object, context: LoadContext) -> dict | None:
+        """Return stats for a raw config section, using the cache.
+
+        :param raw: The section as stored in the profile JSON.
+        :param context: Per-profile values such as tokens.
+        :returns: Stats dict, or ``None`` if unconfigured or unavailable.
+        """
+        config = self.parse(raw)
+        if config is None:
+            return None
+        key = self.lookup_key(config)
+        if not key:
+            return None
+
+        self.metrics.loads += 1
+        self.metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            with request_budget(self.semaphore), span(f"integration.{self.name}", key):
+                return await self._load(config, key, context)
+        except Exception:
+            self.metrics.errors += 1
+            raise
+        finally:
+            self.metrics.in_flight -= 1
+            self.metrics.seconds += time.perf_counter() - started
+
+    async def _load(self, config: BaseModel, key: str, context: LoadContext) -> dict | None:
+        """Run the loader, or the default cached fetch."""
+        if self.loader is not None:
+            return await self.loader(config, key, context)
+        return await get_cached_stats(
+            self.name,
+            key,
+            self.fetcher,
+            ttl_hours=self.ttl_hours(context.ttl_factor),
+            incremental=self.incremental,
+            **self.fetcher_kwargs(config),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Built-in integrations
+# ---------------------------------------------------------------------------
+
+
+async def _load_github(config: GitHub, key: str, context: LoadContext) -> dict | None:
+    """Load GitHub stats through their dedicated cache."""
+    return await get_github_stats(
+        key,
+        token=context.github_token,
+        ttl_hours=REGISTRY["github"].ttl_hours(context.ttl_factor),
+    )
+
+
+def _pypi_lookup_key(config: PyPI) -> str | None:
+    """Hash the normalised package set, so order and spelling don't matter."""
+    if not config.packages:
+        return None
+    names = sorted({normalize_name(pkg) for pkg in config.packages})
+    return hashlib.sha256(",".join(names).encode()).hexdigest()[:16]
+
+
+INTEGRATIONS: tuple[Integration, ...] = (
+    Integration(
+        name="github",
+        config_model=GitHub,
+        lookup_key=lambda config: config.username,
+        loader=_load_github,
+    ),
+    Integration(
+        name="npm",
+        config_model=Npm,
+        lookup_key=lambda config: config.username,
+        fetcher=fetch_npm_stats,
+        fetcher_kwargs=lambda config: {
+            "username": config.username,
+            "max_packages": config.max_packages,
+        },
+        incremental=True,
+    ),
+    Integration(
+        name="pypi",
+        config_model=PyPI,
+        lookup_key=_pypi_lookup_key,
+        fetcher=fetch_pypi_stats,
+        fetcher_kwargs=lambda config: {
+            "packages": config.packages,
+            "max_packages": config.max_packages,
+        },
+    ),
+    Integration(
+        name="devto",
+        config_model=DevTo,
+        lookup_key=lambda config: config.username,
+        fetcher=fetch_devto_stats,
+        fetcher_kwargs=lambda config: {
+            "username": config.username,
+            "max_articles": config.max_articles,
+        },
+        # Dev.to rate-limits per client, however fast it answers
+        concurrency=4,
+        incremental=True,
+    ),
+    Integration(
+        name="hashnode",
+        config_model=Hashnode,
+        lookup_key=lambda config: config.username,
+        fetcher=fetch_hashnode_stats,
+        fetcher_kwargs=lambda config: {
+            "username": config.username,
+            "max_articles": config.max_articles,
+        },
+        incremental=True,
+    ),
+)
+
+REGISTRY: dict[str, Integration] = {integration.name: integration for integration in INTEGRATIONS}
+
+
+def _collect_integrations() -> Iterator[metrics.MetricFamily]:
+    """Export every integration's :class:`IntegrationMetrics`."""
+    descriptions = {
+        "loads": ("mandev_integration_loads_total", "Integration loads.", "counter"),
+        "errors": ("mandev_integration_errors_total", "Integration loads that raised.", "counter"),
+        "in_flight": ("mandev_integration_in_flight", "Integration loads running.", "gauge"),
+        "seconds": (
+            "mandev_integration_seconds_total", "Time spent in integration loads.", "counter"
+        ),
+    }
+    for attribute, (name, description, kind) in descriptions.items():
+        family = metrics.MetricFamily(name, description, kind)
+        for integration in INTEGRATIONS:
+            family.add(getattr(integration.metrics, attribute), integration=integration.name)
+        yield family
+
+
+metrics.register_collector(_collect_integrations)
+
+
+async def load_all(config: dict, context: LoadContext) -> dict[str, dict | None]:
+    """Load stats for every registered integration concurrently.
+
+    :param config: The profile config JSON.
+    :param context: Per-profile values such as tokens.
+    :returns: ``{"<name>_stats": stats}`` for every integration.
+    """
+    results = await asyncio.gather(
+        *(integration.load(config.get(integration.name), context) for integration in INTEGRATIONS)
+    )
+    return {
+        f"{integration.name}_stats": stats
+        for integration, stats in zip(INTEGRATIONS, results)
+    }
+
+
+def default_context(github_token: str | None, ttl_factor: float = 1.0) -> LoadContext:
+    """Build a load context, falling back to the global GitHub token.
+
+    :param github_token: The profile owner's own token, if any.
+    :param ttl_factor: The profile's popularity factor.
+    """
+    return LoadContext(github_token=github_token or settings.github_token, ttl_factor=ttl_factor)
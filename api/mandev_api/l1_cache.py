@@ -0,0 +1,280 @@
+"""In-process L1 cache in front of the database stats caches.
+
+Warm profile reads are answered from :data:`l1`, a bounded LRU of
+parsed stats keyed by ``(service, lookup_key)``, without touching
+:class:`~mandev_api.tables.IntegrationCache` or
+:class:`~mandev_api.tables.GitHubStatsCache`.  An entry lives until the
+database row it mirrors would go stale, capped at the L1 TTL.
+
+Entries are shared between requests, so :meth:`L1Cache.put` stores a
+read-only copy: dicts become :class:`FrozenDict` and lists become
+tuples, and a caller that tries to modify a cached value gets a
+``TypeError`` instead of changing it for every other reader.
+
+When a worker writes a cache row it updates its own L1 and publishes the
+key on the :data:`CHANNEL` Postgres channel; every other worker listens
+(see :func:`start_invalidation_listener`) and drops the key, so uvicorn
+workers stay coherent.  If the listening connection is lost, the whole
+L1 is cleared and stops accepting entries, since invalidations may be
+missed, until the listener reconnects (retrying with backoff).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import datetime, timezone
+from typing import Any, NoReturn
+
+from piccolo.engine.postgres import PostgresEngine
+
+from mandev_api import metrics
+from mandev_api.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "mandev_cache_invalidate"
+MISSING = object()
+
+# Identifies this process's own notifications, which it has already applied
+_ORIGIN = uuid.uuid4().hex
+
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 30.0
+
+
+class FrozenDict(dict):
+    """A dict that refuses modification, for values shared through :data:`l1`."""
+
+    def _readonly(self, *args: object, **kwargs: object) -> NoReturn:
+        raise TypeError("L1 cache entries are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> tuple[type, tuple[dict]]:
+        # The default reduce would rebuild the copy through __setitem__
+        return type(self), (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only deep copy of parsed JSON *value*."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class L1Cache:
+    """Bounded LRU cache with per-entry expiry.
+
+    :param maxsize: Maximum number of entries.
+    :param ttl: Upper bound, in seconds, on any entry's lifetime.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # False while cross-worker invalidations can't be received
+        self.enabled = True
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, service: str, lookup_key: str) -> Any:
+        """Return the cached value, or :data:`MISSING`.
+
+        ``None`` is a valid cached value (a negative entry).
+        """
+        key = (service, lookup_key)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, service: str, lookup_key: str, value: Any, expires_at: datetime) -> None:
+        """Store *value* until *expires_at* (or the L1 TTL, if sooner).
+
+        :param service: Cache namespace.
+        :param lookup_key: Key within the namespace.
+        :param value: Parsed stats, or ``None`` for a negative entry;
+            a read-only copy is stored.
+        :param expires_at: When the mirrored database row goes stale.
+        """
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        lifetime = min(self.ttl, remaining)
+        if lifetime <= 0 or self.maxsize <= 0 or not self.enabled:
+            return
+        key = (service, lookup_key)
+        self._entries[key] = (time.monotonic() + lifetime, freeze(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, service: str, lookup_key: str) -> None:
+        """Drop one entry, if present."""
+        self._entries.pop((service, lookup_key), None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+
+l1 = L1Cache(settings.l1_cache_size, settings.l1_cache_ttl)
+
+
+def _collect_l1() -> Iterator[metrics.MetricFamily]:
+    """Export :data:`l1` size and hit counts."""
+    entries = metrics.MetricFamily("mandev_l1_cache_entries", "Entries in the L1 cache.", "gauge")
+    entries.add(len(l1))
+    yield entries
+    for name, value in (("hits", l1.hits), ("misses", l1.misses)):
+        family = metrics.MetricFamily(
+            f"mandev_l1_cache_{name}_total", f"L1 cache {name}.", "counter"
+        )
+        family.add(value)
+        yield family
+
+
+metrics.register_collector(_collect_l1)
+
+
+async def broadcast_invalidation(table: type, service: str, lookup_key: str) -> None:
+    """Tell other workers that the row for ``(service, lookup_key)`` changed.
+
+    A no-op unless *table* lives in Postgres.
+
+    :param table: The cache table that was written.
+    :param service: Cache namespace.
+    :param lookup_key: Key within the namespace.
+    """
+    await broadcast_invalidations(table, [(service, lookup_key)])
+
+
+async def broadcast_invalidations(table: type, keys: list[tuple[str, str]]) -> None:
+    """Tell other workers that the rows for many ``(service, lookup_key)`` changed.
+
+    Sends one notification per key in a single query.  A no-op unless
+    *table* lives in Postgres.
+
+    :param table: The cache table that was written.
+    :param keys: ``(service, lookup_key)`` pairs.
+    """
+    if not keys or not isinstance(table._meta.db, PostgresEngine):
+        return
+    payloads = [f"{_ORIGIN}|{service}|{lookup_key}" for service, lookup_key in keys]
+    try:
+        await table.raw(
+            "SELECT pg_notify({}, payload) FROM unnest({}::text[]) AS payload",
+            CHANNEL,
+            payloads,
+        ).run()
+    except Exception:
+        logger.exception("Failed to broadcast %d cache invalidations", len(keys))
+
+
+def _on_notify(connection: object, pid: int, channel: str, payload: str) -> None:
+    """Apply an invalidation published by another worker."""
+    origin, _, rest = payload.partition("|")
+    if origin == _ORIGIN:
+        return
+    service, _, lookup_key = rest.partition("|")
+    l1.invalidate(service, lookup_key)
+
+
+class _InvalidationListener:
+    """Keeps a connection listening on :data:`CHANNEL`, reconnecting when lost.
+
+    :param engine: The Postgres engine to open the connection from.
+    """
+
+    def __init__(self, engine: PostgresEngine) -> None:
+        self._engine = engine
+        self._connection: Any = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._stopped = False
+
+    async def connect(self) -> None:
+        """Open a connection, start listening and re-enable :data:`l1`."""
+        connection = await self._engine.get_new_connection()
+        connection.add_termination_listener(self._on_terminate)
+        await connection.add_listener(CHANNEL, _on_notify)
+        self._connection = connection
+        l1.enabled = True
+
+    def _on_terminate(self, connection: object) -> None:
+        """Forget everything once invalidations can no longer be received."""
+        logger.warning("Cache invalidation listener disconnected; disabling L1 cache")
+        l1.enabled = False
+        l1.clear()
+        self._connection = None
+        if not self._stopped and self._reconnect_task is None:
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Retry :meth:`connect` with exponential backoff until it succeeds."""
+        delay = RECONNECT_MIN_DELAY
+        try:
+            while not self._stopped:
+                await asyncio.sleep(delay)
+                try:
+                    await self.connect()
+                except Exception:
+                    logger.warning(
+                        "Cache invalidation listener reconnect failed; retrying in %.0fs",
+                        min(delay * 2, RECONNECT_MAX_DELAY),
+                    )
+                    delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                else:
+                    logger.info("Cache invalidation listener reconnected; L1 cache enabled")
+                    return
+        finally:
+            self._reconnect_task = None
+
+    async def stop(self) -> None:
+        """Stop listening and cancel any pending reconnect."""
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reconnect_task
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.remove_termination_listener(self._on_terminate)
+            await connection.remove_listener(CHANNEL, _on_notify)
+            await connection.close()
+
+
+async def start_invalidation_listener(
+    engine: object,
+) -> Callable[[], Awaitable[None]] | None:
+    """Listen for invalidations from other workers.
+
+    The first connection is opened before returning, so a database that
+    can't be reached fails startup; later disconnects are retried in the
+    background while :data:`l1` stays disabled.
+
+    :param engine: The Piccolo engine in use.
+    :returns: A coroutine function that stops listening, or ``None`` if
+        the engine is not Postgres (single-process setups need none).
+    """
+    if not isinstance(engine, PostgresEngine):
+        return None
+
+    listener = _InvalidationListener(engine)
+    await listener.connect()
+    return listener.stop
@@ -0,0 +1,310 @@
+"""Prometheus metrics for the API.
+
+A small, dependency-free implementation of the Prometheus text
+exposition format, served at ``/metrics``:
+
+* :class:`Counter` and :class:`Histogram` are updated in place by the
+  code they measure (HTTP requests, database queries, cache lookups,
+  upstream requests).
+* Collectors registered with :func:`register_collector` report values
+  that already live elsewhere (limiter and breaker state, L1 size,
+  connection pool usage) when scraped, so nothing is tracked twice.
+
+HTTP timing comes from :class:`MetricsMiddleware`, labelled by route
+template rather than raw path so label sets stay bounded.  Database
+timing comes from :func:`instrument_queries`, which wraps Piccolo's
+``Query._run`` (the one method every query, ``objects()`` included, runs
+through) and labels by table and query type; each query is also a
+``db`` span of the request (see :mod:`mandev_api.timing`).
+
+Metrics are process-local: with several uvicorn workers, each worker is
+scraped (or aggregated) separately.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from piccolo.query.base import Query
+
+from mandev_api.timing import span
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class MetricFamily:
+    """One metric's samples, as rendered in a scrape.
+
+    :param name: Metric name.
+    :param help: One-line description.
+    :param type: ``counter``, ``gauge`` or ``histogram``.
+    :param samples: ``(suffix, labels, value)`` triples; *suffix* is
+        appended to *name* (``"_bucket"``, ``"_sum"``, ...).
+    """
+
+    name: str
+    help: str
+    type: str
+    samples: list[tuple[str, dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, suffix: str = "", **labels: object) -> None:
+        """Append a sample."""
+        self.samples.append((suffix, {k: str(v) for k, v in labels.items()}, value))
+
+
+_metrics: dict[str, Counter | Histogram] = {}
+_collectors: list[Callable[[], Iterable[MetricFamily]]] = []
+
+
+def _register(metric: Counter | Histogram) -> None:
+    if metric.name in _metrics:
+        raise ValueError(f"Metric {metric.name} already registered")
+    _metrics[metric.name] = metric
+
+
+class Counter:
+    """Monotonic counter with optional labels.
+
+    :param name: Metric name, ending in ``_total``.
+    :param help: One-line description.
+    :param labelnames: Names of the labels, in the order values are given.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        _register(self)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add *amount* to the series with the given label values."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Return the current value of one series."""
+        return self._values.get(labels, 0.0)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.help, "counter")
+        for labels, value in sorted(self._values.items()):
+            family.add(value, **dict(zip(self.labelnames, labels)))
+        return family
+
+
+class Histogram:
+    """Cumulative histogram with optional labels.
+
+    :param name: Metric name (without ``_bucket`` etc.).
+    :param help: One-line description.
+    :param labelnames: Names of the labels, in the order values are given.
+    :param buckets: Upper bounds, ascending; ``+Inf`` is implied.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per series: per-bucket counts (non-cumulative, last is +Inf) and sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        _register(self)
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation in the series with the given label values."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        """Return the number of observations in one series."""
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.help, "histogram")
+        for labels, (counts, total) in sorted(self._series.items()):
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                family.add(cumulative, "_bucket", **base, le=_format_value(bound))
+            family.add(total[0], "_sum", **base)
+            family.add(cumulative, "_count", **base)
+        return family
+
+
+def register_collector(collector: Callable[[], Iterable[MetricFamily]]) -> None:
+    """Report extra metric families on every scrape.
+
+    :param collector: Callable returning the families' current values.
+    """
+    _collectors.append(collector)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_family(family: MetricFamily) -> Iterator[str]:
+    yield f"# HELP {family.name} {family.help}"
+    yield f"# TYPE {family.name} {family.type}"
+    for suffix, labels, value in family.samples:
+        if labels:
+            pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            yield f"{family.name}{suffix}{{{pairs}}} {_format_value(value)}"
+        else:
+            yield f"{family.name}{suffix} {_format_value(value)}"
+
+
+def render() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    families = [metric.collect() for metric in _metrics.values()]
+    for collector in _collectors:
+        families.extend(collector())
+    lines = [line for family in families for line in _render_family(family)]
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# HTTP requests
+# ---------------------------------------------------------------------------
+
+HTTP_REQUESTS = Counter(
+    "mandev_http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+HTTP_DURATION = Histogram(
+    "mandev_http_request_duration_seconds", "HTTP request latency.", ("method", "route")
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request by route template.
+
+    :param app: The wrapped ASGI application.
+    """
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def _send(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            # Unmatched paths share one label, so scans can't add series
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            HTTP_DURATION.observe(time.perf_counter() - started, method, route)
+            HTTP_REQUESTS.inc(method, route, str(status))
+
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+
+DB_QUERIES = Counter(
+    "mandev_db_queries_total", "Database queries run.", ("table", "query", "outcome")
+)
+DB_DURATION = Histogram(
+    "mandev_db_query_duration_seconds", "Database query latency.", ("table", "query")
+)
+
+
+def instrument_queries() -> None:
+    """Time every Piccolo query, labelled by table and query type.
+
+    Also records each query as a ``db`` timing span.
+
+    Idempotent; called once when the app is created.
+    """
+    original = Query._run
+    if getattr(original, "_mandev_instrumented", False):
+        return
+
+    @functools.wraps(original)
+    async def _run(self: Query, *args: object, **kwargs: object) -> Any:
+        table = self.table._meta.tablename
+        kind = type(self).__name__.lower()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with span("db", f"{table} {kind}", **{"db.table": table, "db.operation": kind}):
+                result = await original(self, *args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            DB_DURATION.observe(time.perf_counter() - started, table, kind)
+            DB_QUERIES.inc(table, kind, outcome)
+
+    _run._mandev_instrumented = True  # type: ignore[attr-defined]
+    Query._run = _run  # type: ignore[method-assign]
+
+
+_engine: object | None = None
+
+
+def watch_pool(engine: object | None) -> None:
+    """Report *engine*'s connection pool usage on each scrape.
+
+    :param engine: The Piccolo engine whose pool was started, or ``None``
+        to stop reporting.
+    """
+    global _engine
+    _engine = engine
+
+
+def _collect_pool() -> Iterator[MetricFamily]:
+    """Report connection pool usage, if the engine has a pool."""
+    pool = getattr(_engine, "pool", None)
+    if pool is None:
+        return
+    connections = MetricFamily(
+        "mandev_db_pool_connections", "Pooled database connections.", "gauge"
+    )
+    idle = pool.get_idle_size()
+    connections.add(pool.get_size() - idle, state="busy")
+    connections.add(idle, state="idle")
+    yield connections
+    maximum = MetricFamily("mandev_db_pool_max", "Connection pool capacity.", "gauge")
+    maximum.add(pool.get_max_size())
+    yield maximum
+
+
+register_collector(_collect_pool)
@@ -1,7 +1,12 @@
 """npm registry stats fetcher.
 
 Queries the npm search API for packages by a maintainer, then fetches
-weekly download counts for each package.
+weekly download counts for those packages.  Unscoped packages are looked
+up through the bulk downloads endpoint (up to 128 per request, and no
+more than fit in a URL whose validators can be stored); scoped
+packages, which the bulk endpoint does not support, fall back to one
+request each.  Download counts are cached per package, so maintainers
+who share packages share the lookups too.
 """
 
 from __future__ import annotations
@@ -14,34 +19,138 @@ import httpx
 
 from mandev_core.integration_models import NpmPackage, NpmStats
 
+from mandev_api.conditional_http import MAX_URL_LENGTH, ConditionalClient
+from mandev_api.integration_service import get_cached_many
+from mandev_api.outbound import outbound_transport
+
 logger = logging.getLogger(__name__)
 
 NPM_SEARCH_URL = "https://registry.npmjs.org/-/v1/search"
 NPM_DOWNLOADS_URL = "https://api.npmjs.org/downloads/point/last-week"
+NPM_BULK_LIMIT = 128
+
+
+async def _fetch_downloads(client: ConditionalClient, package: str) -> int | None:
+    """Fetch weekly download count for a single package.
+
+    :returns: The count, or ``None`` if the lookup failed.
+    """
+    try:
+        resp = await client.get(f"{NPM_DOWNLOADS_URL}/{package}", timeout=10.0)
+        if resp.status_code == 200:
+            return resp.json().get("downloads", 0)
+    except Exception:
+        logger.warning("Failed to fetch downloads for npm package %s", package)
+    return None
+
+
+async def _fetch_bulk_downloads(
+    client: ConditionalClient,
+    packages: list[str],
+) -> dict[str, int]:
+    """Fetch weekly download counts for up to 128 unscoped packages at once.
+
+    :returns: Counts for the packages the endpoint knows about.
+    """
+    try:
+        resp = await client.get(
+            f"{NPM_DOWNLOADS_URL}/{','.join(packages)}", timeout=10.0
+        )
+        if resp.status_code == 200:
+            data = resp.json()
+            return {
+                name: (entry or {}).get("downloads", 0)
+                for name, entry in data.items()
+                if name in packages
+            }
+    except Exception:
+        logger.warning("Failed to fetch bulk downloads for %d npm packages", len(packages))
+    return {}
+
+
+def _bulk_chunks(names: list[str]) -> list[list[str]]:
+    """Split *names* into bulk queries within the count and URL length limits."""
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    length = len(NPM_DOWNLOADS_URL) + 1
+    for name in names:
+        if chunk and (
+            len(chunk) == NPM_BULK_LIMIT or length + 1 + len(name) > MAX_URL_LENGTH
+        ):
+            chunks.append(chunk)
+            chunk, length = [], len(NPM_DOWNLOADS_URL) + 1
+        length += len(name) + (1 if chunk else 0)
+        chunk.append(name)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+async def _fetch_download_counts(
+    client: ConditionalClient,
+    packages: list[str],
+) -> dict[str, dict]:
+    """Fetch weekly downloads for *packages* with as few requests as possible.
+
+    :returns: ``{package: {"weekly_downloads": n}}`` for resolved packages.
+    """
+    unscoped = [name for name in packages if not name.startswith("@")]
+    single = [name for name in packages if name.startswith("@")]
+
+    chunks = []
+    for chunk in _bulk_chunks(unscoped):
+        # A one-package bulk query returns the single-package shape instead
+        if len(chunk) == 1:
+            single.extend(chunk)
+        else:
+            chunks.append(chunk)
+
+    bulk_results, single_results = await asyncio.gather(
+        asyncio.gather(*(_fetch_bulk_downloads(client, chunk) for chunk in chunks)),
+        asyncio.gather(*(_fetch_downloads(client, name) for name in single)),
+    )
 
-_SEMAPHORE = asyncio.Semaphore(5)
+    counts: dict[str, int] = {}
+    for result in bulk_results:
+        counts.update(result)
+    for name, count in zip(single, single_results):
+        if count is not None:
+            counts[name] = count
 
+    return {name: {"weekly_downloads": count} for name, count in counts.items()}
 
-async def _fetch_downloads(client: httpx.AsyncClient, package: str) -> int:
-    """Fetch weekly download count for a single package."""
-    async with _SEMAPHORE:
-        try:
-            resp = await client.get(f"{NPM_DOWNLOADS_URL}/{package}", timeout=10.0)
-            if resp.status_code == 200:
-                return resp.json().get("downloads", 0)
-        except Exception:
-            logger.warning("Failed to fetch downloads for npm package %s", package)
-    return 0
 
+def _previous_downloads(previous: dict | None) -> dict[str, int] | None:
+    """Weekly downloads per package in previously cached stats."""
+    if previous is None:
+        return None
+    return {
+        package.get("name", ""): package.get("weekly_downloads", 0)
+        for package in previous.get("packages", [])
+    }
 
-async def fetch_npm_stats(username: str, max_packages: int = 10) -> dict:
+
+async def fetch_npm_stats(
+    username: str,
+    max_packages: int = 10,
+    previous: dict | None = None,
+) -> dict:
     """Fetch npm stats for a given username.
 
+    Download counts come from the shared per-package cache, which another
+    maintainer's refresh may have updated even when this user's search
+    result is unchanged, so the counts are compared with *previous*
+    before reporting the stats as unchanged.
+
     :param username: npm registry username.
     :param max_packages: Maximum packages to return.
+    :param previous: Previously cached stats (NpmStats shape), if any.
     :returns: Dict suitable for JSON serialisation (NpmStats shape).
+    :raises NotModified: If conditional requests are enabled, the search
+        was not modified and every download count equals *previous*.
     """
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(transport=outbound_transport()) as http:
+        client = ConditionalClient(http)
         resp = await client.get(
             NPM_SEARCH_URL,
             params={"text": f"maintainer:{username}", "size": max_packages},
@@ -51,23 +160,28 @@ async def fetch_npm_stats(username: str, max_packages: int = 10) -> dict:
         data = resp.json()
 
         objects = data.get("objects", [])
-        packages: list[NpmPackage] = []
+        names = [obj.get("package", {}).get("name", "") for obj in objects]
 
-        # Fetch downloads in parallel
-        download_tasks = []
-        for obj in objects:
-            pkg = obj.get("package", {})
-            download_tasks.append(_fetch_downloads(client, pkg.get("name", "")))
+        async def _fetch_missing(missing: list[str]) -> dict[str, dict]:
+            return await _fetch_download_counts(client, missing)
 
-        downloads = await asyncio.gather(*download_tasks)
+        downloads = await get_cached_many(
+            "npm_downloads", [name for name in names if name], _fetch_missing
+        )
+        counts = {
+            name: downloads.get(name, {}).get("weekly_downloads", 0) for name in names
+        }
+        if counts == _previous_downloads(previous):
+            client.raise_if_not_modified()
 
-        for obj, dl_count in zip(objects, downloads):
+        packages: list[NpmPackage] = []
+        for obj, name in zip(objects, names):
             pkg = obj.get("package", {})
             packages.append(NpmPackage(
-                name=pkg.get("name", ""),
+                name=name,
                 version=pkg.get("version", ""),
                 description=pkg.get("description", ""),
-                weekly_downloads=dl_count,
+                weekly_downloads=counts[name],
                 url=pkg.get("links", {}).get("npm", ""),
             ))
 
@@ -0,0 +1,298 @@
+"""Shared outbound HTTP controls for integration fetchers.
+
+Every fetcher builds its client with :func:`outbound_transport`, which
+adds retries and circuit breaking (:mod:`mandev_api.resilience`) and
+routes requests through one :class:`AdaptiveLimiter` per upstream host.
+Limits follow AIMD: each healthy, fast response raises a host's limit by
+roughly one request per window, while a ``429``, a ``5xx``, a transport
+error or a response slower than the latency target halves it.  Healthy
+upstreams therefore get more parallelism over time, and an upstream
+that pushes back is throttled immediately.
+
+Limiters hold no event-loop state between calls: waiters are futures of
+whichever loop is running, so one process-wide registry serves the app,
+scripts and tests alike.  :func:`limiter_snapshot` reports current
+limits, in-flight requests and queue depth per host; the same values,
+plus per-host request latency and outcomes, are exported as metrics.
+
+An integration may also cap its own requests below the host limits
+(e.g. Dev.to's per-user rate limit): :func:`request_budget` installs a
+semaphore for the enclosed fetch, which :class:`LimitedTransport` holds
+in addition to the host's slot.
+
+Requests finally leave through :class:`httpx.AsyncHTTPTransport`;
+:func:`set_base_transport` swaps that out process-wide, which is how
+the load-test harness (``api/benchmarks``) points every fetcher at its
+in-process fake upstream.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import httpx
+
+from mandev_api import metrics
+from mandev_api.config import settings
+from mandev_api.resilience import RetryTransport
+from mandev_api.timing import span
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for one upstream host.
+
+    :param host: Upstream host name (for logs and metrics).
+    :param initial: Starting concurrency limit.
+    :param minimum: Lowest the limit may fall.
+    :param maximum: Highest the limit may rise.
+    :param latency_target: Responses slower than this (seconds) count
+        as pushback.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        initial: float,
+        minimum: float = 1,
+        maximum: float,
+        latency_target: float,
+    ) -> None:
+        self.host = host
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.throttled = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._last_decrease = float("-inf")
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> None:
+        """Wait for a slot under the current limit."""
+        while self._waiters and self._waiters[0].done():
+            self._waiters.popleft()
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Woken and cancelled in the same step: pass the slot on
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    def release(self, *, ok: bool, latency: float) -> None:
+        """Return a slot and adjust the limit from the outcome.
+
+        :param ok: ``False`` for a ``429``, ``5xx`` or transport error.
+        :param latency: Seconds until the response headers arrived.
+        """
+        self.in_flight -= 1
+        if ok and latency <= self.latency_target:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        else:
+            self._decrease()
+        self._wake()
+
+    def cancel(self) -> None:
+        """Return a slot whose request was cancelled, leaving the limit alone."""
+        self.in_flight -= 1
+        self._wake()
+
+    def _decrease(self) -> None:
+        """Halve the limit, at most once per latency-target window."""
+        self.throttled += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.latency_target:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit / 2)
+        logger.info("Backing off %s to %d concurrent requests", self.host, int(self.limit))
+
+    def _wake(self) -> None:
+        """Hand free slots to queued waiters in arrival order."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+
+
+def limiter_for(host: str) -> AdaptiveLimiter:
+    """Return the shared limiter for *host*, creating it on first use."""
+    limiter = _limiters.get(host)
+    if limiter is None:
+        limiter = AdaptiveLimiter(
+            host,
+            initial=settings.outbound_initial_limit,
+            maximum=settings.outbound_max_limit,
+            latency_target=settings.outbound_latency_target,
+        )
+        _limiters[host] = limiter
+    return limiter
+
+
+def limiter_snapshot() -> dict[str, dict[str, float]]:
+    """Report limit, in-flight requests, queue depth and pushback per host."""
+    return {
+        host: {
+            "limit": limiter.limit,
+            "in_flight": limiter.in_flight,
+            "queue_depth": limiter.queue_depth,
+            "throttled": limiter.throttled,
+        }
+        for host, limiter in _limiters.items()
+    }
+
+
+UPSTREAM_REQUESTS = metrics.Counter(
+    "mandev_upstream_requests_total",
+    "Upstream HTTP attempts by outcome (ok, error status, transport error).",
+    ("host", "outcome"),
+)
+UPSTREAM_DURATION = metrics.Histogram(
+    "mandev_upstream_request_duration_seconds", "Upstream HTTP attempt latency.", ("host",)
+)
+
+
+def _collect_limiters() -> Iterator[metrics.MetricFamily]:
+    """Export :func:`limiter_snapshot` as gauges."""
+    descriptions = {
+        "limit": "Adaptive concurrency limit.",
+        "in_flight": "Upstream requests in flight.",
+        "queue_depth": "Upstream requests waiting for a slot.",
+        "throttled": "Times the limit was cut after pushback.",
+    }
+    snapshot = limiter_snapshot()
+    for key, description in descriptions.items():
+        family = metrics.MetricFamily(
+            f"mandev_outbound_{key}",
+            description,
+            "counter" if key == "throttled" else "gauge",
+        )
+        for host, values in snapshot.items():
+            family.add(values[key], host=host)
+        yield family
+
+
+metrics.register_collector(_collect_limiters)
+
+
+_base_transport: Callable[[], httpx.AsyncBaseTransport] = httpx.AsyncHTTPTransport
+
+
+def set_base_transport(factory: Callable[[], httpx.AsyncBaseTransport] | None) -> None:
+    """Build the transport under every :class:`LimitedTransport` with *factory*.
+
+    :param factory: Returns the transport that actually sends requests
+        (e.g. an :class:`httpx.ASGITransport` around a fake upstream), or
+        ``None`` to go back to the network.
+    """
+    global _base_transport
+    _base_transport = factory or httpx.AsyncHTTPTransport
+
+
+_budget: ContextVar[asyncio.Semaphore | None] = ContextVar("request_budget", default=None)
+
+
+@contextmanager
+def request_budget(semaphore: asyncio.Semaphore | None) -> Iterator[None]:
+    """Cap the upstream requests of the enclosed fetch by *semaphore*.
+
+    :param semaphore: Slots shared by every fetch under the same budget,
+        or ``None`` to leave them bounded by the host limiters alone.
+    """
+    token = _budget.set(semaphore)
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+class LimitedTransport(httpx.AsyncBaseTransport):
+    """Transport that holds a host's limiter slot for each request.
+
+    Inside :func:`request_budget`, a slot of the budget is taken first.
+
+    :param transport: The transport that actually sends requests;
+        defaults to one from :func:`set_base_transport`.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self._transport = transport or _base_transport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        budget = _budget.get()
+        if budget is None:
+            return await self._send(request)
+        async with budget:
+            return await self._send(request)
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        limiter = limiter_for(host)
+        await limiter.acquire()
+        started = time.monotonic()
+        try:
+            with span(
+                "http",
+                f"{request.method} {host}{request.url.path}",
+                **{
+                    "http.method": request.method,
+                    "http.url": str(request.url.copy_with(query=None)),
+                    "net.peer.name": host,
+                },
+            ) as current:
+                response = await self._transport.handle_async_request(request)
+                if current is not None:
+                    current.attributes["http.status_code"] = response.status_code
+        except asyncio.CancelledError:
+            limiter.cancel()
+            raise
+        except Exception:
+            latency = time.monotonic() - started
+            limiter.release(ok=False, latency=latency)
+            UPSTREAM_DURATION.observe(latency, host)
+            UPSTREAM_REQUESTS.inc(host, "transport_error")
+            raise
+        latency = time.monotonic() - started
+        ok = response.status_code != 429 and response.status_code < 500
+        limiter.release(ok=ok, latency=latency)
+        UPSTREAM_DURATION.observe(latency, host)
+        UPSTREAM_REQUESTS.inc(host, "ok" if ok else str(response.status_code))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def outbound_transport() -> RetryTransport:
+    """Build the transport integration fetchers should use.
+
+    Retries and the circuit breaker wrap the limiter, so every attempt
+    takes its own slot and feeds the host's AIMD limit.
+    """
+    return RetryTransport(LimitedTransport())
@@ -0,0 +1,37 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.columns.column_types import Text
+from piccolo.columns.indexes import IndexMethod
+
+
+ID = "2026-10-19T10:03:27:504113"
+VERSION = "1.32.0"
+DESCRIPTION = "github repo index"
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="mandev_api", description=DESCRIPTION
+    )
+
+    manager.add_column(
+        table_class_name="GitHubStatsCache",
+        tablename="github_stats_cache",
+        column_name="repo_index_json",
+        db_column_name="repo_index_json",
+        column_class_name="Text",
+        column_class=Text,
+        params={
+            "default": "{}",
+            "null": False,
+            "primary_key": False,
+            "unique": False,
+            "index": False,
+            "index_method": IndexMethod.btree,
+            "choices": None,
+            "db_column_name": None,
+            "secret": False,
+        },
+        schema=None,
+    )
+
+    return manager
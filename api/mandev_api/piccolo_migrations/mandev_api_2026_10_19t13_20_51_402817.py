@@ -0,0 +1,60 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.columns.column_types import Varchar
+from piccolo.columns.indexes import IndexMethod
+
+
+ID = "2026-10-19T13:20:51:402817"
+VERSION = "1.32.0"
+DESCRIPTION = "cache entry status"
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="mandev_api", description=DESCRIPTION
+    )
+
+    manager.add_column(
+        table_class_name="GitHubStatsCache",
+        tablename="github_stats_cache",
+        column_name="status",
+        db_column_name="status",
+        column_class_name="Varchar",
+        column_class=Varchar,
+        params={
+            "length": 16,
+            "default": "ok",
+            "null": False,
+            "primary_key": False,
+            "unique": False,
+            "index": False,
+            "index_method": IndexMethod.btree,
+            "choices": None,
+            "db_column_name": None,
+            "secret": False,
+        },
+        schema=None,
+    )
+
+    manager.add_column(
+        table_class_name="IntegrationCache",
+        tablename="integration_cache",
+        column_name="status",
+        db_column_name="status",
+        column_class_name="Varchar",
+        column_class=Varchar,
+        params={
+            "length": 16,
+            "default": "ok",
+            "null": False,
+            "primary_key": False,
+            "unique": False,
+            "index": False,
+            "index_method": IndexMethod.btree,
+            "choices": None,
+            "db_column_name": None,
+            "secret": False,
+        },
+        schema=None,
+    )
+
+    return manager
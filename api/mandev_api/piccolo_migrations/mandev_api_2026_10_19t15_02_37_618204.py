@@ -0,0 +1,67 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.columns.column_types import Varchar
+from piccolo.table import Table
+
+
+ID = "2026-10-19T15:02:37:618204"
+VERSION = "1.32.0"
+DESCRIPTION = "integration cache composite key"
+
+
+class RawTable(Table):
+    pass
+
+
+async def add_composite_key():
+    # Keep the newest row of each (service, lookup_key) before enforcing it
+    await RawTable.raw(
+        "DELETE FROM integration_cache a USING integration_cache b "
+        "WHERE a.service = b.service AND a.lookup_key = b.lookup_key "
+        "AND (a.fetched_at < b.fetched_at "
+        "OR (a.fetched_at = b.fetched_at AND a.id < b.id))"
+    ).run()
+    await RawTable.raw(
+        "CREATE UNIQUE INDEX IF NOT EXISTS integration_cache_service_lookup_key "
+        "ON integration_cache (service, lookup_key)"
+    ).run()
+
+
+async def drop_composite_key():
+    await RawTable.raw(
+        "DROP INDEX IF EXISTS integration_cache_service_lookup_key"
+    ).run()
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="mandev_api", description=DESCRIPTION
+    )
+
+    manager.add_raw(add_composite_key)
+    manager.add_raw_backwards(drop_composite_key)
+
+    manager.alter_column(
+        table_class_name="IntegrationCache",
+        tablename="integration_cache",
+        column_name="service",
+        db_column_name="service",
+        params={"index": False},
+        old_params={"index": True},
+        column_class=Varchar,
+        old_column_class=Varchar,
+        schema=None,
+    )
+
+    manager.alter_column(
+        table_class_name="IntegrationCache",
+        tablename="integration_cache",
+        column_name="lookup_key",
+        db_column_name="lookup_key",
+        params={"index": False},
+        old_params={"index": True},
+        column_class=Varchar,
+        old_column_class=Varchar,
+        schema=None,
+    )
+
+    return manager
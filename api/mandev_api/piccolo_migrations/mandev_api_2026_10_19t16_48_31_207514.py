@@ -0,0 +1,42 @@
+from piccolo.apps.migrations.auto.migration_manager import MigrationManager
+from piccolo.table import Table
+
+
+ID = "2026-10-19T16:48:31:207514"
+VERSION = "1.32.0"
+DESCRIPTION = "contribution archive unique year"
+
+
+class RawTable(Table):
+    pass
+
+
+async def add_unique_year():
+    # Keep the newest row of each (github_username, year) before enforcing it
+    await RawTable.raw(
+        "DELETE FROM contribution_archive a USING contribution_archive b "
+        "WHERE a.github_username = b.github_username AND a.year = b.year "
+        "AND (a.fetched_at < b.fetched_at "
+        "OR (a.fetched_at = b.fetched_at AND a.id < b.id))"
+    ).run()
+    await RawTable.raw(
+        "CREATE UNIQUE INDEX IF NOT EXISTS contribution_archive_username_year "
+        "ON contribution_archive (github_username, year)"
+    ).run()
+
+
+async def drop_unique_year():
+    await RawTable.raw(
+        "DROP INDEX IF EXISTS contribution_archive_username_year"
+    ).run()
+
+
+async def forwards():
+    manager = MigrationManager(
+        migration_id=ID, app_name="mandev_api", description=DESCRIPTION
+    )
+
+    manager.add_raw(add_unique_year)
+    manager.add_raw_backwards(drop_unique_year)
+
+    return manager
@@ -1,65 +1,137 @@
 """PyPI package stats fetcher.
 
 Queries PyPI JSON API for package metadata and pypistats for download
-counts. Skips packages that return 404 (typo or removed).
+counts. Skips packages that return 404 (typo or removed); those are
+cached as not found, so they are not looked up again on every view.
+
+Metadata and downloads are cached per package (services ``pypi_meta``
+and ``pypi_downloads``) with their own TTLs (see
+:mod:`mandev_api.ttl_policy`), and user-level stats are
+assembled from those entries.  Overlapping package lists across users
+therefore share lookups, and adding one package costs one fetch.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import re
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
 
 import httpx
 
 from mandev_core.integration_models import PyPIPackage, PyPIStats
 
+from mandev_api.conditional_http import ConditionalClient
+from mandev_api.integration_service import NotFound, get_cached_many
+from mandev_api.outbound import outbound_transport
+
 logger = logging.getLogger(__name__)
 
 PYPI_API_URL = "https://pypi.org/pypi"
 PYPISTATS_API_URL = "https://pypistats.org/api/packages"
 
-_SEMAPHORE = asyncio.Semaphore(5)
 
+def normalize_name(package_name: str) -> str:
+    """Normalise a package name as PyPI does (PEP 503).
+
+    :param package_name: Name as written in a config.
+    :returns: Lowercase name with runs of ``-_.`` collapsed to ``-``.
+    """
+    return re.sub(r"[-_.]+", "-", package_name).lower()
+
+
+def _slim_metadata(meta: dict) -> dict:
+    """Keep only the ``info`` block of a PyPI JSON response.
 
-async def _fetch_package(
-    client: httpx.AsyncClient,
+    The full document lists every release and file, which is far larger
+    than anything the stats need.
+    """
+    return {"info": meta.get("info", {})}
+
+
+async def _fetch_metadata(
+    client: ConditionalClient,
     package_name: str,
-) -> PyPIPackage | None:
-    """Fetch metadata and downloads for a single PyPI package."""
-    async with _SEMAPHORE:
-        try:
-            meta_resp = await client.get(
-                f"{PYPI_API_URL}/{package_name}/json", timeout=10.0
-            )
-            if meta_resp.status_code == 404:
-                logger.warning("PyPI package not found: %s", package_name)
-                return None
-            meta_resp.raise_for_status()
-            meta = meta_resp.json()
-        except Exception:
-            logger.warning("Failed to fetch PyPI metadata for %s", package_name)
-            return None
-
-        monthly_downloads = 0
-        try:
-            dl_resp = await client.get(
-                f"{PYPISTATS_API_URL}/{package_name}/recent", timeout=10.0
-            )
-            if dl_resp.status_code == 200:
-                dl_data = dl_resp.json().get("data", {})
-                monthly_downloads = dl_data.get("last_month", 0)
-        except Exception:
-            logger.warning("Failed to fetch pypistats for %s", package_name)
-
-        info = meta.get("info", {})
-        return PyPIPackage(
-            name=info.get("name", package_name),
-            version=info.get("version", ""),
-            description=info.get("summary", ""),
-            monthly_downloads=monthly_downloads,
-            url=info.get("project_url", f"https://pypi.org/project/{package_name}/"),
+) -> dict | None:
+    """Fetch display metadata for a single PyPI package.
+
+    :returns: The metadata, or ``None`` if the lookup failed.
+    :raises NotFound: If PyPI does not know the package.
+    """
+    try:
+        meta_resp = await client.get(
+            f"{PYPI_API_URL}/{package_name}/json",
+            timeout=10.0,
+            slim=_slim_metadata,
         )
+    except Exception:
+        logger.warning("Failed to fetch PyPI metadata for %s", package_name)
+        return None
+    if meta_resp.status_code == 404:
+        logger.warning("PyPI package not found: %s", package_name)
+        raise NotFound(package_name)
+    if meta_resp.status_code != 200:
+        logger.warning("Failed to fetch PyPI metadata for %s", package_name)
+        return None
+
+    info = meta_resp.json().get("info", {})
+    return {
+        "name": info.get("name", package_name),
+        "version": info.get("version", ""),
+        "description": info.get("summary", ""),
+        "url": info.get("project_url", f"https://pypi.org/project/{package_name}/"),
+    }
+
+
+async def _fetch_downloads(
+    client: ConditionalClient,
+    package_name: str,
+) -> dict | None:
+    """Fetch last month's download count for a single PyPI package.
+
+    :returns: The count, or ``None`` if the lookup failed.
+    :raises NotFound: If pypistats does not know the package.
+    """
+    try:
+        dl_resp = await client.get(
+            f"{PYPISTATS_API_URL}/{package_name}/recent", timeout=10.0
+        )
+    except Exception:
+        logger.warning("Failed to fetch pypistats for %s", package_name)
+        return None
+    if dl_resp.status_code == 404:
+        raise NotFound(package_name)
+    if dl_resp.status_code != 200:
+        return None
+    dl_data = dl_resp.json().get("data", {})
+    return {"monthly_downloads": dl_data.get("last_month", 0)}
+
+
+async def _fetch_each(
+    client: ConditionalClient,
+    fetch: Callable[[ConditionalClient, str], Awaitable[dict | None]],
+    names: list[str],
+) -> dict[str, dict | None]:
+    """Run a per-package fetch over *names*.
+
+    :returns: Results for the packages that resolved, and ``None`` for
+        those that do not exist; failed lookups are omitted.
+    """
+
+    async def _one(name: str) -> tuple[str, dict | None, bool]:
+        try:
+            return name, await fetch(client, name), False
+        except NotFound:
+            return name, None, True
+
+    results = await asyncio.gather(*(_one(name) for name in names))
+    return {
+        name: result
+        for name, result, not_found in results
+        if result is not None or not_found
+    }
 
 
 async def fetch_pypi_stats(packages: list[str], max_packages: int = 10) -> dict:
@@ -69,11 +141,31 @@ async def fetch_pypi_stats(packages: list[str], max_packages: int = 10) -> dict:
     :param max_packages: Maximum packages to return.
     :returns: Dict suitable for JSON serialisation (PyPIStats shape).
     """
-    async with httpx.AsyncClient() as client:
-        tasks = [_fetch_package(client, pkg) for pkg in packages[:max_packages]]
-        results = await asyncio.gather(*tasks)
+    names = list(dict.fromkeys(normalize_name(pkg) for pkg in packages[:max_packages]))
+
+    async with httpx.AsyncClient(transport=outbound_transport()) as http:
+        client = ConditionalClient(http)
+        metadata, downloads = await asyncio.gather(
+            get_cached_many(
+                "pypi_meta",
+                names,
+                lambda missing: _fetch_each(client, _fetch_metadata, missing),
+            ),
+            get_cached_many(
+                "pypi_downloads",
+                names,
+                lambda missing: _fetch_each(client, _fetch_downloads, missing),
+            ),
+        )
 
-    valid: list[PyPIPackage] = [r for r in results if r is not None]
+    valid: list[PyPIPackage] = [
+        PyPIPackage(
+            **metadata[name],
+            monthly_downloads=downloads.get(name, {}).get("monthly_downloads", 0),
+        )
+        for name in names
+        if name in metadata
+    ]
     valid.sort(key=lambda p: p.monthly_downloads, reverse=True)
 
     stats = PyPIStats(
@@ -0,0 +1,246 @@
+"""Retries and circuit breaking for outbound HTTP.
+
+:class:`RetryTransport` sits in front of the per-host limiter (see
+:mod:`mandev_api.outbound`).  It retries transport errors, ``429`` and
+``502``-``504`` a bounded number of times, sleeping for the upstream's
+``Retry-After`` when it gives one and otherwise for a decorrelated
+jitter backoff.  Requests that still fail (transport errors, ``429`` and
+any ``5xx``) count against a per-host
+:class:`CircuitBreaker`; once it opens, requests to that host fail with
+:class:`CircuitOpen` without touching the network until the reset
+timeout passes, when a single probe is let through.
+
+The cache services treat :class:`CircuitOpen` as an expected outcome and
+serve stale stats straight away, so an upstream outage costs neither
+profile latency nor further upstream load.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from mandev_api import metrics
+from mandev_api.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+BACKOFF_BASE = 0.25
+BACKOFF_CAP = 8.0
+
+RETRIES = metrics.Counter("mandev_upstream_retries_total", "Upstream attempts retried.", ("host",))
+
+
+class CircuitOpen(Exception):
+    """Raised instead of sending a request to a host whose breaker is open.
+
+    :param host: The upstream host.
+    """
+
+    def __init__(self, host: str) -> None:
+        super().__init__(f"Circuit open for {host}")
+        self.host = host
+
+
+def is_circuit_open(exc: BaseException) -> bool:
+    """Whether *exc* is, or only groups, :class:`CircuitOpen` errors."""
+    if isinstance(exc, CircuitOpen):
+        return True
+    if isinstance(exc, BaseExceptionGroup):
+        return all(is_circuit_open(inner) for inner in exc.exceptions)
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one upstream host.
+
+    :param host: Upstream host name.
+    :param failure_threshold: Consecutive failures that open the breaker.
+    :param reset_timeout: Seconds to stay open before a probe.
+    """
+
+    def __init__(self, host: str, *, failure_threshold: int, reset_timeout: float) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """``"closed"``, ``"open"`` or ``"half-open"``."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def before_request(self) -> None:
+        """Admit a request, or fail fast.
+
+        :raises CircuitOpen: While open, and in half-open state while the
+            single probe request is still in flight.
+        """
+        state = self.state
+        if state == "open" or (state == "half-open" and self._probing):
+            raise CircuitOpen(self.host)
+        if state == "half-open":
+            self._probing = True
+
+    def abandon_probe(self) -> None:
+        """Allow a new probe after the current one was cancelled."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        if self.opened_at is not None:
+            logger.info("Circuit for %s closed", self.host)
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening (or re-opening) the breaker if due."""
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning("Circuit for %s opened after %d failures", self.host, self.failures)
+            self.opened_at = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def breaker_for(host: str) -> CircuitBreaker:
+    """Return the shared breaker for *host*, creating it on first use."""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            host,
+            failure_threshold=settings.outbound_breaker_failures,
+            reset_timeout=settings.outbound_breaker_reset,
+        )
+        _breakers[host] = breaker
+    return breaker
+
+
+def breaker_snapshot() -> dict[str, str]:
+    """Report the breaker state per host."""
+    return {host: breaker.state for host, breaker in _breakers.items()}
+
+
+def _collect_breakers() -> Iterator[metrics.MetricFamily]:
+    """Export :func:`breaker_snapshot` as one gauge per state."""
+    family = metrics.MetricFamily(
+        "mandev_outbound_breaker_state", "Circuit breaker state (1 for the current one).", "gauge"
+    )
+    for host, current in breaker_snapshot().items():
+        for state in ("closed", "open", "half-open"):
+            family.add(int(state == current), host=host, state=state)
+    yield family
+
+
+metrics.register_collector(_collect_breakers)
+
+
+def retry_after(response: httpx.Response) -> float | None:
+    """Parse a ``Retry-After`` header into seconds from now.
+
+    :returns: The delay, or ``None`` if absent or unparseable.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """Transport adding bounded retries and a per-host circuit breaker.
+
+    Every integration request is a read (GraphQL queries included), so
+    all methods are retried.
+
+    :param transport: The transport that sends each attempt.
+    :param retries: Extra attempts after the first.
+    :param sleep: Awaitable sleep, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        *,
+        retries: int | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._transport = transport
+        self._retries = settings.outbound_retries if retries is None else retries
+        self._sleep = sleep
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = breaker_for(request.url.host)
+        breaker.before_request()
+        try:
+            response = await self._send(request)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled, or failed outside the network: says nothing about
+            # the host, but a half-open probe must not stay claimed
+            breaker.abandon_probe()
+            raise
+
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        """Send *request*, retrying transient failures."""
+        delay = BACKOFF_BASE
+        attempt = 0
+        while True:
+            wait = None
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                if attempt >= self._retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self._retries:
+                    return response
+                wait = retry_after(response)
+                if wait is not None and wait > BACKOFF_CAP:
+                    # Told to come back later than we are willing to wait
+                    return response
+                await response.aclose()
+
+            attempt += 1
+            RETRIES.inc(request.url.host)
+            # Decorrelated jitter: grow from the previous delay, capped
+            delay = min(BACKOFF_CAP, random.uniform(BACKOFF_BASE, delay * 3))
+            await self._sleep(delay if wait is None else wait)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
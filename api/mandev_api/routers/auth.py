@@ -1,11 +1,12 @@
 """Authentication routes: signup, login, and current-user lookup."""
 
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr
 
 import json
 
 from mandev_api.auth import create_access_token, decode_access_token, hash_password, verify_password
+from mandev_api.routers.avatar import avatar_url
 from mandev_api.tables import User, UserProfile
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -135,9 +136,12 @@ async def login(body: LoginRequest) -> TokenResponse:
 
 
 @router.get("/me", response_model=MeResponse)
-async def me(user: User = Depends(_get_current_user)) -> MeResponse:
+async def me(request: Request, user: User = Depends(_get_current_user)) -> MeResponse:
     """Return the currently authenticated user's info.
 
+    The avatar falls back to the user's generated identicon.
+
+    :param request: The incoming request (for the avatar URL).
     :param user: The authenticated user (injected).
     :returns: User info.
     """
@@ -160,5 +164,5 @@ async def me(user: User = Depends(_get_current_user)) -> MeResponse:
         email=user.email,
         username=user.username,
         github_username=user.github_username,
-        avatar=avatar,
+        avatar=avatar or avatar_url(request, user.username),
     )
@@ -0,0 +1,46 @@
+"""Default avatar route."""
+
+import hashlib
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response
+
+from mandev_api.identicon import DEFAULT_SIZE, SIZES, identicon_png
+
+router = APIRouter(tags=["avatar"])
+
+# Identicons depend only on the username, so clients may keep them a day
+CACHE_CONTROL = "public, max-age=86400"
+
+
+def avatar_url(request: Request, username: str) -> str:
+    """Return the absolute URL of *username*'s default avatar."""
+    return str(request.url_for("get_avatar", username=username))
+
+
+@router.get("/api/avatar/{username}.png", name="get_avatar")
+def get_avatar(username: str, request: Request, size: int = DEFAULT_SIZE) -> Response:
+    """Return a generated identicon for *username*.
+
+    Any username gets an image, so the URL works as a placeholder before
+    a profile exists.  Rendering is CPU-bound, so the route is a plain
+    function and runs in the threadpool.
+
+    :param username: Seed for the image.
+    :param request: The incoming request (for ``If-None-Match``).
+    :param size: Width and height in pixels, one of
+        :data:`~mandev_api.identicon.SIZES`.
+    :returns: The PNG image.
+    :raises HTTPException: 422 for any other size.
+    """
+    if size not in SIZES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"size must be one of {', '.join(map(str, SIZES))}",
+        )
+    png = identicon_png(username, size)
+    etag = f'"{hashlib.sha256(png).hexdigest()[:16]}"'
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(png, media_type="image/png", headers=headers)
@@ -1,24 +1,24 @@
 """Profile and config-validation routes."""
 
-import asyncio
-import hashlib
 import json
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ValidationError
 from piccolo.query.functions import Sum
 
 from mandev_core import MandevConfig
 from mandev_api.config import settings
 from mandev_api.tables import User, UserProfile, ProfileView
+from mandev_api.contribution_archive import get_contribution_range
 from mandev_api.github_service import get_github_stats
-from mandev_api.integration_service import get_cached_stats
-from mandev_api.npm_fetcher import fetch_npm_stats
-from mandev_api.pypi_fetcher import fetch_pypi_stats
-from mandev_api.devto_fetcher import fetch_devto_stats
-from mandev_api.hashnode_fetcher import fetch_hashnode_stats
+from mandev_api.integrations import default_context, load_all
 from mandev_api.routers.auth import _get_current_user
+from mandev_api.routers.avatar import avatar_url
+from mandev_api.timing import span
+from mandev_api.ttl_policy import popularity_factor
 
 router = APIRouter(tags=["profile"])
 
@@ -122,31 +122,35 @@ async def put_own_profile(
 async def get_public_profile(
     username: str,
     request: Request,
-) -> dict:
+) -> JSONResponse:
     """Return a user's public profile by username.
 
     Returns the config JSON with ``username`` injected at the top level
     so the frontend can access ``profile``, ``theme``, etc. directly.
+    Profiles without an avatar get the URL of their generated identicon.
 
     :param username: The username to look up.
     :param request: The incoming request (for user-agent detection).
     :returns: The public profile with username.
     """
-    user = await User.objects().where(User.username == username).first().run()
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-
-    profile = (
-        await UserProfile.objects()
-        .where(UserProfile.user_id == user.id)
-        .first()
-        .run()
-    )
+    with span("user"):
+        user = await User.objects().where(User.username == username).first().run()
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+        profile = (
+            await UserProfile.objects()
+            .where(UserProfile.user_id == user.id)
+            .first()
+            .run()
+        )
     if profile is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
 
     config = json.loads(profile.config_json) if profile.config_json else {}
     response = {"username": user.username, **config}
+    if isinstance(config.get("profile"), dict) and not config["profile"].get("avatar"):
+        response["profile"] = {**config["profile"], "avatar": avatar_url(request, user.username)}
 
     # Compute github_verified
     config_gh_username = (config.get("github") or {}).get("username", "")
@@ -156,108 +160,99 @@ async def get_public_profile(
         and user.github_username.lower() == config_gh_username.lower()
     )
 
-    # Fetch all integration stats in parallel
-    github_config = config.get("github")
-    npm_config = config.get("npm")
-    pypi_config = config.get("pypi")
-    devto_config = config.get("devto")
-    hashnode_config = config.get("hashnode")
-
-    async def _fetch_github() -> dict | None:
-        if github_config and github_config.get("username"):
-            token = user.github_token or settings.github_token
-            return await get_github_stats(github_config["username"], token=token)
-        return None
-
-    async def _fetch_npm() -> dict | None:
-        if npm_config and npm_config.get("username"):
-            return await get_cached_stats(
-                "npm",
-                npm_config["username"],
-                fetch_npm_stats,
-                username=npm_config["username"],
-                max_packages=npm_config.get("max_packages", 10),
-            )
-        return None
-
-    async def _fetch_pypi() -> dict | None:
-        if pypi_config and pypi_config.get("packages"):
-            pkgs = pypi_config["packages"]
-            lookup = hashlib.sha256(",".join(sorted(pkgs)).encode()).hexdigest()[:16]
-            return await get_cached_stats(
-                "pypi",
-                lookup,
-                fetch_pypi_stats,
-                packages=pkgs,
-                max_packages=pypi_config.get("max_packages", 10),
-            )
-        return None
-
-    async def _fetch_devto() -> dict | None:
-        if devto_config and devto_config.get("username"):
-            return await get_cached_stats(
-                "devto",
-                devto_config["username"],
-                fetch_devto_stats,
-                username=devto_config["username"],
-                max_articles=devto_config.get("max_articles", 5),
-            )
-        return None
-
-    async def _fetch_hashnode() -> dict | None:
-        if hashnode_config and hashnode_config.get("username"):
-            return await get_cached_stats(
-                "hashnode",
-                hashnode_config["username"],
-                fetch_hashnode_stats,
-                username=hashnode_config["username"],
-                max_articles=hashnode_config.get("max_articles", 5),
-            )
-        return None
-
-    github_stats, npm_stats, pypi_stats, devto_stats, hashnode_stats = (
-        await asyncio.gather(
-            _fetch_github(),
-            _fetch_npm(),
-            _fetch_pypi(),
-            _fetch_devto(),
-            _fetch_hashnode(),
-        )
-    )
-
-    response["github_stats"] = github_stats
-    response["npm_stats"] = npm_stats
-    response["pypi_stats"] = pypi_stats
-    response["devto_stats"] = devto_stats
-    response["hashnode_stats"] = hashnode_stats
+    # Fetch all integration stats in parallel, fresher for popular profiles
+    context = default_context(user.github_token, await popularity_factor(user.username))
+    response.update(await load_all(config, context))
 
     # Increment view count (skip bots)
     ua = (request.headers.get("user-agent") or "").lower()
     is_bot = any(pattern in ua for pattern in BOT_PATTERNS)
     if not is_bot:
-        today = date.today().isoformat()
-        view = (
-            await ProfileView.objects()
-            .where(ProfileView.username == username, ProfileView.date == today)
-            .first()
+        with span("view_write"):
+            today = date.today().isoformat()
+            view = (
+                await ProfileView.objects()
+                .where(ProfileView.username == username, ProfileView.date == today)
+                .first()
+                .run()
+            )
+            if view is None:
+                view = ProfileView(username=username, date=today, count=1)
+            else:
+                view.count += 1
+            await view.save().run()
+
+    # Total view count
+    with span("view_count"):
+        result = (
+            await ProfileView.select(Sum(ProfileView.count))
+            .where(ProfileView.username == username)
             .run()
         )
-        if view is None:
-            view = ProfileView(username=username, date=today, count=1)
-        else:
-            view.count += 1
-        await view.save().run()
+    total_views = result[0]["sum"] if result and result[0].get("sum") is not None else 0
+    response["view_count"] = total_views
 
-    # Total view count
-    result = (
-        await ProfileView.select(Sum(ProfileView.count))
-        .where(ProfileView.username == username)
+    # Serialise here, so it shows up as its own span
+    with span("serialize"):
+        return JSONResponse(jsonable_encoder(response))
+
+
+@router.get("/api/profile/{username}/contributions")
+async def get_contributions(
+    username: str,
+    start: date | None = None,
+    end: date | None = None,
+) -> dict:
+    """Return a user's daily GitHub contributions over an arbitrary range.
+
+    Past years are served from the contribution archive, the current
+    year from the cached trailing calendar.  Defaults to the last 365
+    days.
+
+    :param username: The mandev username to look up.
+    :param start: First day of the range (inclusive).
+    :param end: Last day of the range (inclusive).
+    :returns: The range, its total, and the per-day counts.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+
+    user = await User.objects().where(User.username == username).first().run()
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    profile = (
+        await UserProfile.objects()
+        .where(UserProfile.user_id == user.id)
+        .first()
         .run()
     )
-    total_views = result[0]["sum"] if result and result[0].get("sum") is not None else 0
-    response["view_count"] = total_views
+    config = json.loads(profile.config_json) if profile and profile.config_json else {}
+    github_username = (config.get("github") or {}).get("username")
+    if not github_username:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="GitHub not configured"
+        )
+
+    token = user.github_token or settings.github_token
+    stats = await get_github_stats(github_username, token=token)
+    days = await get_contribution_range(
+        github_username,
+        start,
+        end,
+        recent=(stats or {}).get("contributions"),
+    )
 
-    return response
+    return {
+        "username": user.username,
+        "github_username": github_username,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "total_contributions": sum(day.count for day in days),
+        "contributions": [day.model_dump() for day in days],
+    }
 
 
 @router.post("/api/config/validate", response_model=ValidationResponse)
@@ -31,10 +31,35 @@ class UserProfile(Table, tablename="user_profiles"):
 
 
 class GitHubStatsCache(Table, tablename="github_stats_cache"):
-    """Cached GitHub stats for a username."""
+    """Cached GitHub stats for a username.
+
+    ``repo_index_json`` maps repository name to its last seen
+    ``pushedAt`` and language breakdown, so incremental refreshes only
+    refetch languages for repositories that changed.  ``status`` is
+    ``"not_found"`` for users GitHub does not know, cached with a
+    shorter TTL.
+    """
 
     github_username = Varchar(length=255, unique=True, index=True)
     stats_json = Text(default="{}")
+    repo_index_json = Text(default="{}")
+    status = Varchar(length=16, default="ok")
+    fetched_at = Timestamptz(default=TimestamptzNow())
+
+
+class ContributionArchive(Table, tablename="contribution_archive"):
+    """Archived daily contribution counts for one user and one past year.
+
+    ``counts`` holds one comma-separated count per day of the year,
+    starting on January 1st. Past years never change, so each row is
+    written once and never refetched.  ``(github_username, year)`` is
+    unique (see :func:`create_contribution_archive_key_index`).
+    """
+
+    github_username = Varchar(length=255, index=True)
+    year = Integer()
+    counts = Text(default="")
+    total = Integer(default=0)
     fetched_at = Timestamptz(default=TimestamptzNow())
 
 
@@ -49,11 +74,54 @@ class ProfileView(Table, tablename="profile_views"):
 class IntegrationCache(Table, tablename="integration_cache"):
     """Generic cache for integration stats (npm, PyPI, Dev.to, etc.).
 
-    Uses ``(service, lookup_key)`` as logical composite key so adding
-    new integrations requires no schema changes.
+    Uses ``(service, lookup_key)`` as composite key so adding new
+    integrations requires no schema changes.  The key is enforced by a
+    unique index (see :func:`create_integration_cache_key_index`), which
+    writes upsert against.  ``status`` is ``"not_found"`` for negative
+    entries (unknown users or packages).
     """
 
-    service = Varchar(length=32, index=True)
-    lookup_key = Varchar(length=255, index=True)
+    service = Varchar(length=32)
+    lookup_key = Varchar(length=255)
     stats_json = Text(default="{}")
+    status = Varchar(length=16, default="ok")
+    fetched_at = Timestamptz(default=TimestamptzNow())
+
+
+async def create_integration_cache_key_index() -> None:
+    """Create the unique ``(service, lookup_key)`` index.
+
+    Piccolo cannot declare composite indexes on a table, so the migration
+    creates it with raw SQL; this does the same for tables created
+    straight from the class (e.g. with ``create_db_tables`` in tests).
+    """
+    await IntegrationCache.raw(
+        "CREATE UNIQUE INDEX IF NOT EXISTS integration_cache_service_lookup_key "
+        "ON integration_cache (service, lookup_key)"
+    ).run()
+
+
+async def create_contribution_archive_key_index() -> None:
+    """Create the unique ``(github_username, year)`` index.
+
+    As for :func:`create_integration_cache_key_index`, the migration
+    creates it with raw SQL and this covers tables created from the class.
+    """
+    await ContributionArchive.raw(
+        "CREATE UNIQUE INDEX IF NOT EXISTS contribution_archive_username_year "
+        "ON contribution_archive (github_username, year)"
+    ).run()
+
+
+class HttpValidatorCache(Table, tablename="http_validator_cache"):
+    """Upstream HTTP validators (ETag / Last-Modified) per request URL.
+
+    ``body`` keeps the last ``200`` response body so a ``304`` can be
+    answered locally without downloading it again.
+    """
+
+    url = Varchar(length=2048, unique=True, index=True)
+    etag = Varchar(length=255, null=True, default=None)
+    last_modified = Varchar(length=64, null=True, default=None)
+    body = Text(default="")
     fetched_at = Timestamptz(default=TimestamptzNow())
@@ -0,0 +1,207 @@
+"""Per-request timing spans and the ``Server-Timing`` header.
+
+:class:`ServerTimingMiddleware` opens a root :class:`Span` for every
+HTTP request; code along the way wraps interesting sections in
+:func:`span` (database queries, cache reads, each integration load,
+serialisation).  Spans live in a context variable, so concurrent
+integration loads started with ``asyncio.gather`` nest under the span
+that started them.  Outside a request :func:`span` records nothing.
+
+When the response starts, durations are summed per span name into a
+``Server-Timing`` header (``db;dur=12.3;desc="4x", ...``), visible in
+browser dev tools and ``curl -i``.  Requests slower than
+``MANDEV_SLOW_REQUEST_MS`` are also logged with their full span tree,
+and finished span trees are handed to any callback registered with
+:func:`add_listener` (the trace exporter, :mod:`mandev_api.tracing`).
+With all of these off, the middleware records nothing at all.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from mandev_api.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class Span:
+    """A timed section of a request.
+
+    :param name: Span name, used as the ``Server-Timing`` metric name.
+    :param detail: Free text shown in the slow-request log.
+    :param attributes: Structured values for traces.
+    """
+
+    name: str
+    detail: str = ""
+    attributes: dict[str, object] = field(default_factory=dict)
+    start: float = field(default_factory=time.perf_counter)
+    wall_start: int = field(default_factory=time.time_ns)
+    end: float | None = None
+    error: str | None = None
+    children: list[Span] = field(default_factory=list)
+    events: list[tuple[int, str, dict[str, object]]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Seconds elapsed, up to now if the span is still open."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def walk(self, depth: int = 0) -> Iterator[tuple[int, Span]]:
+        """Yield this span and its descendants with their depth."""
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+_current: ContextVar[Span | None] = ContextVar("timing_span", default=None)
+_listeners: list[Callable[[Span], None]] = []
+
+
+def add_listener(listener: Callable[[Span], None]) -> None:
+    """Call *listener* with the root span of every finished request."""
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[Span], None]) -> None:
+    """Stop calling a listener added with :func:`add_listener`."""
+    _listeners.remove(listener)
+
+
+def current_span() -> Span | None:
+    """Return the innermost open span, or ``None`` outside a request."""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, detail: str = "", **attributes: object) -> Iterator[Span | None]:
+    """Time the enclosed block as a child of the current span.
+
+    :param name: Span name (a ``Server-Timing`` token, e.g. ``"db"``).
+    :param detail: Extra context for the slow-request log.
+    :param attributes: Structured values for traces.
+    :returns: The new span, or ``None`` outside a request.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, detail, attributes)
+    parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = type(exc).__name__
+        raise
+    finally:
+        child.end = time.perf_counter()
+        _current.reset(token)
+
+
+def event(name: str, **attributes: object) -> None:
+    """Record a point-in-time event (e.g. a cache decision) on the current span.
+
+    A no-op outside a request.
+    """
+    current = _current.get()
+    if current is not None:
+        current.events.append((time.time_ns(), name, attributes))
+
+
+def server_timing(root: Span) -> str:
+    """Summarise a request's spans as a ``Server-Timing`` header value.
+
+    Spans of the same name are summed (parallel spans may add up to more
+    than ``total``); a ``desc`` gives the count when there are several.
+    """
+    totals: dict[str, tuple[float, int]] = {}
+    for depth, node in root.walk():
+        if depth:
+            seconds, count = totals.get(node.name, (0.0, 0))
+            totals[node.name] = (seconds + node.duration, count + 1)
+    entries = [
+        f"{name};dur={seconds * 1000:.1f}" + (f';desc="{count}x"' if count > 1 else "")
+        for name, (seconds, count) in totals.items()
+    ]
+    entries.append(f"total;dur={root.duration * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def format_tree(root: Span) -> str:
+    """Render a span tree, one indented line per span."""
+    return "\n".join(
+        f"{'  ' * depth}{node.name}{' ' + node.detail if node.detail else ''} "
+        f"{node.duration * 1000:.1f}ms"
+        for depth, node in root.walk()
+    )
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware recording spans per request.
+
+    Adds the ``Server-Timing`` header unless ``MANDEV_SERVER_TIMING`` is
+    off, logs requests slower than ``MANDEV_SLOW_REQUEST_MS`` and passes
+    the span tree to the registered listeners.
+
+    :param app: The wrapped ASGI application.
+    """
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not (
+            settings.server_timing or settings.slow_request_ms or _listeners
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        root = Span(
+            "request",
+            f"{scope['method']} {scope['path']}",
+            {"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        token = _current.set(root)
+
+        async def _send(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                root.end = time.perf_counter()
+                root.attributes["http.status_code"] = message["status"]
+                if settings.server_timing:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", server_timing(root).encode("latin-1")),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        except BaseException as exc:
+            root.error = type(exc).__name__
+            raise
+        finally:
+            _current.reset(token)
+            if root.end is None:
+                root.end = time.perf_counter()
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                root.attributes["http.route"] = route
+            for listener in _listeners:
+                listener(root)
+            threshold = settings.slow_request_ms
+            if threshold and root.duration * 1000 >= threshold:
+                logger.warning(
+                    "Slow request %s (%.0fms)\n%s",
+                    root.detail,
+                    root.duration * 1000,
+                    format_tree(root),
+                )
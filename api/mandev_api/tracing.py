@@ -0,0 +1,227 @@
+"""Optional trace export of request spans.
+
+Traces reuse the spans :mod:`mandev_api.timing` already records for the
+``Server-Timing`` header: the request itself (named after its route),
+each Piccolo query (``db``), cache reads and fetcher calls (with the
+cache decision as an event), integration loads and every outbound HTTP
+attempt (``http``).  :func:`start_tracing` registers a listener that
+queues finished span trees; a background task converts them to
+OTLP/JSON and hands them to an exporter every
+:data:`FLUSH_INTERVAL` seconds:
+
+* ``MANDEV_TRACE_EXPORTER=file`` appends one OTLP/JSON request per line
+  to ``MANDEV_TRACE_FILE``;
+* ``MANDEV_TRACE_EXPORTER=otlp`` posts to an OTLP/HTTP collector at
+  ``MANDEV_TRACE_ENDPOINT`` (e.g. ``http://localhost:4318/v1/traces``).
+
+Tracing is off by default.  Disabled, nothing is registered and the
+only cost is that of the timing spans themselves.
+``MANDEV_TRACE_SAMPLE_RATE`` keeps a fraction of requests; if the queue
+fills up (an exporter that cannot keep up), further traces are dropped
+rather than buffered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import secrets
+from collections import deque
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import httpx
+
+from mandev_api.config import settings
+from mandev_api.timing import Span, add_listener, remove_listener
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "mandev-api"
+FLUSH_INTERVAL = 2.0
+MAX_QUEUE = 1000
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_ERROR = 2
+
+
+def _value(value: object) -> dict[str, object]:
+    """Encode an attribute value as an OTLP ``AnyValue``."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(values: dict[str, object]) -> list[dict[str, object]]:
+    return [{"key": key, "value": _value(value)} for key, value in values.items()]
+
+
+def _span_to_otlp(node: Span, root: Span, trace_id: str, span_id: str, parent_id: str) -> dict:
+    """Convert one span, placing it on the wall clock relative to *root*."""
+    start = root.wall_start + int((node.start - root.start) * 1e9)
+    end = start + int(node.duration * 1e9)
+    if node is root:
+        route = root.attributes.get("http.route")
+        name = f"{root.attributes['http.method']} {route}" if route else root.detail
+        kind = KIND_SERVER
+    else:
+        name = node.name
+        kind = KIND_CLIENT if node.name == "http" else KIND_INTERNAL
+    attributes = dict(node.attributes)
+    if node.detail and node is not root:
+        attributes.setdefault("detail", node.detail)
+    failed = node.error is not None or int(attributes.get("http.status_code", 0)) >= 500
+    result: dict[str, object] = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        "kind": kind,
+        "startTimeUnixNano": str(start),
+        "endTimeUnixNano": str(end),
+        "attributes": _attributes(attributes),
+        "events": [
+            {"timeUnixNano": str(at), "name": event, "attributes": _attributes(values)}
+            for at, event, values in node.events
+        ],
+        "status": {"code": STATUS_ERROR, "message": node.error or ""} if failed else {},
+    }
+    if parent_id:
+        result["parentSpanId"] = parent_id
+    return result
+
+
+def to_otlp(roots: list[Span]) -> dict:
+    """Build an OTLP/JSON ``ExportTraceServiceRequest`` for span trees.
+
+    :param roots: Root spans of finished requests, one trace each.
+    """
+    spans: list[dict] = []
+    for root in roots:
+        trace_id = secrets.token_hex(16)
+        stack: list[tuple[Span, str]] = [(root, "")]
+        while stack:
+            node, parent_id = stack.pop()
+            span_id = secrets.token_hex(8)
+            spans.append(_span_to_otlp(node, root, trace_id, span_id, parent_id))
+            stack.extend((child, span_id) for child in node.children)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{"scope": {"name": "mandev_api"}, "spans": spans}],
+            }
+        ]
+    }
+
+
+def file_exporter(path: str | Path) -> Callable[[dict], Awaitable[None]]:
+    """Export by appending each OTLP/JSON request as one line of *path*."""
+    target = Path(path)
+
+    def _append(line: str) -> None:
+        with target.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+    async def export(payload: dict) -> None:
+        await asyncio.to_thread(_append, json.dumps(payload, separators=(",", ":")))
+
+    return export
+
+
+def otlp_exporter(endpoint: str) -> Callable[[dict], Awaitable[None]]:
+    """Export by posting OTLP/JSON to a collector's ``/v1/traces`` endpoint."""
+
+    async def export(payload: dict) -> None:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(endpoint, json=payload)
+            response.raise_for_status()
+
+    return export
+
+
+class Tracer:
+    """Queues finished span trees and exports them in batches.
+
+    :param export: Async callable receiving one OTLP/JSON request.
+    :param sample_rate: Fraction of requests to keep.
+    """
+
+    def __init__(
+        self,
+        export: Callable[[dict], Awaitable[None]],
+        sample_rate: float = 1.0,
+    ) -> None:
+        self.export = export
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self._queue: deque[Span] = deque()
+        self._task: asyncio.Task[None] | None = None
+
+    def submit(self, root: Span) -> None:
+        """Queue a finished request (the :mod:`~mandev_api.timing` listener)."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        if len(self._queue) >= MAX_QUEUE:
+            self.dropped += 1
+            return
+        self._queue.append(root)
+
+    async def flush(self) -> None:
+        """Export everything queued so far."""
+        if not self._queue:
+            return
+        roots = list(self._queue)
+        self._queue.clear()
+        try:
+            await self.export(to_otlp(roots))
+        except Exception:
+            logger.exception("Failed to export %d traces", len(roots))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start listening for requests and flushing in the background."""
+        add_listener(self.submit)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and export what is left."""
+        remove_listener(self.submit)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+
+def start_tracing() -> Tracer | None:
+    """Start the exporter configured by ``MANDEV_TRACE_EXPORTER``.
+
+    :returns: The running tracer (stop it on shutdown), or ``None`` when
+        tracing is disabled.
+    """
+    if settings.trace_exporter == "file":
+        export = file_exporter(settings.trace_file)
+    elif settings.trace_exporter == "otlp":
+        export = otlp_exporter(settings.trace_endpoint)
+    else:
+        if settings.trace_exporter:
+            logger.warning("Unknown trace exporter %r; tracing disabled", settings.trace_exporter)
+        return None
+    tracer = Tracer(export, settings.trace_sample_rate)
+    tracer.start()
+    return tracer
@@ -0,0 +1,124 @@
+"""Freshness policy for the stats caches.
+
+Every cache service has a base TTL reflecting how quickly its upstream
+data changes: contribution calendars move daily, monthly PyPI download
+counts barely at all.  Base TTLs can be overridden per service with the
+``MANDEV_CACHE_TTL_HOURS`` setting (a JSON object).
+
+Per-profile integrations additionally scale the base TTL by the
+profile's popularity, measured from :class:`~mandev_api.tables.ProfileView`
+counts over the last :data:`POPULARITY_WINDOW_DAYS`: often-viewed
+profiles are refreshed more eagerly, dormant ones less, so upstream
+requests go where people actually look.  Shared per-package caches
+(``npm_downloads``, ``pypi_meta``, ...) are not tied to one profile and
+always use their base TTL.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+
+from piccolo.query.functions import Sum
+
+from mandev_api.config import settings
+from mandev_api.l1_cache import MISSING, l1
+from mandev_api.tables import ProfileView
+
+DEFAULT_TTL_HOURS = 24.0
+BASE_TTL_HOURS: dict[str, float] = {
+    "github": 6.0,
+    "npm": 24.0,
+    "npm_downloads": 24.0,
+    "pypi": 24.0,
+    "pypi_meta": 24.0,
+    "pypi_downloads": 72.0,
+    "devto": 12.0,
+    "hashnode": 12.0,
+}
+
+# Bounds on any scaled TTL
+MIN_TTL_HOURS = 1.0
+MAX_TTL_HOURS = 7 * 24.0
+
+POPULARITY_WINDOW_DAYS = 14
+# (minimum views over the window, TTL multiplier), checked in order
+POPULARITY_TIERS: tuple[tuple[int, float], ...] = ((500, 0.25), (50, 0.5), (1, 1.0))
+DORMANT_FACTOR = 4.0
+
+# Popularity changes slowly; remember it alongside the stats in L1
+_L1_SERVICE = "popularity"
+_L1_HOURS = 1
+
+
+def base_ttl(service: str) -> float:
+    """Return the unscaled TTL, in hours, of a cache service."""
+    if service in settings.cache_ttl_hours:
+        return settings.cache_ttl_hours[service]
+    return BASE_TTL_HOURS.get(service, DEFAULT_TTL_HOURS)
+
+
+def ttl_hours(service: str, factor: float = 1.0) -> float:
+    """Return the TTL, in hours, of a service for a profile.
+
+    :param service: Cache service name.
+    :param factor: The profile's popularity factor
+        (see :func:`popularity_factor`).
+    :returns: The scaled base TTL, clamped to
+        [:data:`MIN_TTL_HOURS`, :data:`MAX_TTL_HOURS`] unless the base
+        itself lies outside them.
+    """
+    base = base_ttl(service)
+    if factor == 1.0:
+        return base
+    return min(max(base * factor, min(base, MIN_TTL_HOURS)), max(base, MAX_TTL_HOURS))
+
+
+def factor_for_views(views: int) -> float:
+    """Map a view count over the popularity window to a TTL multiplier."""
+    for minimum, factor in POPULARITY_TIERS:
+        if views >= minimum:
+            return factor
+    return DORMANT_FACTOR
+
+
+async def popularity_factors(usernames: Iterable[str]) -> dict[str, float]:
+    """Compute the popularity factor of many profiles with one query.
+
+    :param usernames: mandev usernames.
+    :returns: Factor per username; ``1.0`` for all when disabled.
+    """
+    names = list(dict.fromkeys(usernames))
+    if not settings.ttl_popularity:
+        return {name: 1.0 for name in names}
+    if not names:
+        return {}
+
+    since = (date.today() - timedelta(days=POPULARITY_WINDOW_DAYS - 1)).isoformat()
+    rows = (
+        await ProfileView.select(ProfileView.username, Sum(ProfileView.count, alias="views"))
+        .where(ProfileView.username.is_in(names), ProfileView.date >= since)
+        .group_by(ProfileView.username)
+        .run()
+    )
+    views = {row["username"]: row["views"] or 0 for row in rows}
+    return {name: factor_for_views(views.get(name, 0)) for name in names}
+
+
+async def popularity_factor(username: str) -> float:
+    """Return the TTL multiplier for one profile.
+
+    :param username: The mandev username.
+    :returns: Below ``1.0`` for popular profiles, above for dormant ones.
+    """
+    hit = l1.get(_L1_SERVICE, username)
+    if hit is not MISSING:
+        return hit
+    factor = (await popularity_factors([username]))[username]
+    l1.put(
+        _L1_SERVICE,
+        username,
+        factor,
+        datetime.now(timezone.utc) + timedelta(hours=_L1_HOURS),
+    )
+    return factor
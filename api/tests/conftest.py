@@ -9,9 +9,17 @@ from httpx import ASGITransport, AsyncClient
 from piccolo.engine.sqlite import SQLiteEngine
 from piccolo.table import create_db_tables, drop_db_tables
 
-from mandev_api.tables import User, UserProfile, GitHubStatsCache, ProfileView
+from mandev_api.l1_cache import l1
+from mandev_api.tables import (
+    ContributionArchive,
+    GitHubStatsCache,
+    ProfileView,
+    User,
+    UserProfile,
+    create_contribution_archive_key_index,
+)
 
-ALL_TABLES = [User, UserProfile, GitHubStatsCache, ProfileView]
+ALL_TABLES = [User, UserProfile, GitHubStatsCache, ContributionArchive, ProfileView]
 
 
 @pytest.fixture(params=["asyncio"])
@@ -20,6 +28,13 @@ def anyio_backend(request: pytest.FixtureRequest) -> str:
     return request.param
 
 
+@pytest.fixture(autouse=True)
+def _clear_l1_cache() -> None:
+    """Start every test with an empty, enabled in-process stats cache."""
+    l1.clear()
+    l1.enabled = True
+
+
 @pytest.fixture
 async def client() -> AsyncGenerator[AsyncClient]:
     """Yield an async HTTP client backed by a temporary SQLite database.
@@ -39,6 +54,7 @@ async def client() -> AsyncGenerator[AsyncClient]:
 
     try:
         await create_db_tables(*ALL_TABLES, if_not_exists=True)
+        await create_contribution_archive_key_index()
 
         from mandev_api.app import create_app
 
@@ -0,0 +1,158 @@
+"""Tests for cache garbage collection."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_api.cache_gc import cache_sizes, collect_garbage
+from mandev_api.integrations import REGISTRY
+from mandev_api.l1_cache import MISSING, l1
+from mandev_api.tables import (
+    ContributionArchive,
+    GitHubStatsCache,
+    HttpValidatorCache,
+    IntegrationCache,
+    User,
+    UserProfile,
+    create_contribution_archive_key_index,
+    create_integration_cache_key_index,
+)
+
+TABLES = [
+    User,
+    UserProfile,
+    IntegrationCache,
+    GitHubStatsCache,
+    ContributionArchive,
+    HttpValidatorCache,
+]
+
+CONFIG = {
+    "profile": {"name": "Ada"},
+    "github": {"username": "octo"},
+    "npm": {"username": "ada"},
+    "pypi": {"packages": ["requests"]},
+}
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database with one profile and cache rows."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engines = {table: table._meta._db for table in TABLES}
+    for table in TABLES:
+        table._meta._db = engine
+
+    try:
+        await create_db_tables(*TABLES, if_not_exists=True)
+        await create_integration_cache_key_index()
+        await create_contribution_archive_key_index()
+        await _populate()
+        yield
+        await drop_db_tables(*TABLES)
+    finally:
+        for table in TABLES:
+            table._meta._db = original_engines[table]
+        os.unlink(db_path)
+
+
+async def _populate() -> None:
+    """Insert a profile plus used and orphaned cache rows."""
+    user = User(email="ada@example.com", username="ada", password_hash="x")
+    await user.save().run()
+    await UserProfile(user_id=user.id, config_json=json.dumps(CONFIG)).save().run()
+
+    pypi = REGISTRY["pypi"]
+    pypi_key = pypi.lookup_key(pypi.parse(CONFIG["pypi"]))
+    recent = datetime.now(timezone.utc) - timedelta(hours=1)
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+
+    await IntegrationCache.insert(
+        IntegrationCache(service="npm", lookup_key="ada", fetched_at=recent),
+        IntegrationCache(service="npm", lookup_key="bob", fetched_at=recent),
+        IntegrationCache(service="pypi", lookup_key=pypi_key, fetched_at=recent),
+        IntegrationCache(service="pypi", lookup_key="0123456789abcdef", fetched_at=recent),
+        IntegrationCache(service="npm_downloads", lookup_key="left-pad", fetched_at=recent),
+        IntegrationCache(service="npm_downloads", lookup_key="is-odd", fetched_at=old),
+    ).run()
+    await GitHubStatsCache.insert(
+        GitHubStatsCache(github_username="octo", fetched_at=recent),
+        GitHubStatsCache(github_username="ghost", fetched_at=recent),
+    ).run()
+    await ContributionArchive.insert(
+        ContributionArchive(github_username="ghost", year=2020, fetched_at=recent),
+    ).run()
+    await HttpValidatorCache.insert(
+        HttpValidatorCache(url="https://dev.to/api/articles?page=1", fetched_at=old),
+    ).run()
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_collect_garbage_removes_orphans() -> None:
+    """Unreferenced per-profile rows and long-unused shared rows go."""
+    result = await collect_garbage()
+
+    assert dict(result.deleted) == {
+        "npm": 1,
+        "pypi": 1,
+        "npm_downloads": 1,
+        "github": 1,
+        "contribution_archive": 1,
+        "http_validator": 1,
+    }
+    remaining = await IntegrationCache.select(
+        IntegrationCache.service, IntegrationCache.lookup_key
+    ).run()
+    assert {r["service"] for r in remaining} == {"npm", "pypi", "npm_downloads"}
+    assert ("npm", "ada") in {(r["service"], r["lookup_key"]) for r in remaining}
+    assert await GitHubStatsCache.count().run() == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_deleted_stats_leave_every_l1() -> None:
+    """Deleted keys are dropped locally and broadcast to other workers."""
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    for service, key in (("npm", "bob"), ("npm", "ada"), ("github", "ghost")):
+        l1.put(service, key, {"cached": True}, expires)
+
+    with patch(
+        "mandev_api.cache_gc.broadcast_invalidations", new_callable=AsyncMock
+    ) as broadcast:
+        await collect_garbage()
+
+    assert l1.get("npm", "bob") is MISSING
+    assert l1.get("github", "ghost") is MISSING
+    assert l1.get("npm", "ada") == {"cached": True}
+    broadcast_keys = {key for call in broadcast.await_args_list for key in call.args[1]}
+    assert broadcast_keys == {
+        ("npm", "bob"),
+        ("pypi", "0123456789abcdef"),
+        ("npm_downloads", "is-odd"),
+        ("github", "ghost"),
+    }
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_dry_run_and_sizes() -> None:
+    """A dry run reports counts but keeps rows; sizes are per cache."""
+    before = await cache_sizes()
+    result = await collect_garbage(dry_run=True)
+
+    assert sum(result.deleted.values()) == 6
+    assert await cache_sizes() == before
+    assert before["npm"]["rows"] == 2
+    assert before["github"] == {"rows": 2, "bytes": 4}
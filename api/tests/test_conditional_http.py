@@ -0,0 +1,162 @@
+"""Tests for conditional HTTP requests and the 304 cache path."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import httpx
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_api.conditional_http import (
+    MAX_URL_LENGTH,
+    ConditionalClient,
+    NotModified,
+    conditional_requests,
+)
+from mandev_api.integration_service import get_cached_stats
+from mandev_api.tables import (
+    HttpValidatorCache,
+    IntegrationCache,
+    create_integration_cache_key_index,
+)
+
+TABLES = [HttpValidatorCache, IntegrationCache]
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database for the cache tables."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engines = {table: table._meta._db for table in TABLES}
+    for table in TABLES:
+        table._meta._db = engine
+
+    try:
+        await create_db_tables(*TABLES, if_not_exists=True)
+        await create_integration_cache_key_index()
+        yield
+        await drop_db_tables(*TABLES)
+    finally:
+        for table in TABLES:
+            table._meta._db = original_engines[table]
+        os.unlink(db_path)
+
+
+def _etag_transport(seen: list[httpx.Request]) -> httpx.MockTransport:
+    """Upstream that answers ``304`` whenever the ETag matches."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={"info": {"name": "pkg"}, "releases": {"1.0": []}},
+            headers={"ETag": '"v1"'},
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_304_replays_stored_body() -> None:
+    """A second fetch sends If-None-Match and replays the stored body."""
+    seen: list[httpx.Request] = []
+    async with httpx.AsyncClient(transport=_etag_transport(seen)) as http:
+        first = ConditionalClient(http)
+        resp = await first.get("https://example.test/pkg", slim=lambda d: {"info": d["info"]})
+        assert resp.json()["releases"] == {"1.0": []}
+
+        with conditional_requests():
+            second = ConditionalClient(http)
+            replay = await second.get("https://example.test/pkg")
+            assert replay.status_code == 200
+            assert replay.json() == {"info": {"name": "pkg"}}
+            with pytest.raises(NotModified):
+                second.raise_if_not_modified()
+
+    assert "If-None-Match" not in seen[0].headers
+    assert seen[1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_disabled_conditional_never_raises() -> None:
+    """Without conditional requests enabled, validators are not sent."""
+    seen: list[httpx.Request] = []
+    async with httpx.AsyncClient(transport=_etag_transport(seen)) as http:
+        await ConditionalClient(http).get("https://example.test/pkg")
+        client = ConditionalClient(http)
+        await client.get("https://example.test/pkg")
+        client.raise_if_not_modified()
+
+    assert all("If-None-Match" not in request.headers for request in seen)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_concurrent_stores_of_one_url() -> None:
+    """Refreshes storing the same URL at once upsert a single row."""
+    async with httpx.AsyncClient(transport=_etag_transport([])) as http:
+        responses = await asyncio.gather(
+            *(ConditionalClient(http).get("https://example.test/pkg") for _ in range(5))
+        )
+
+    assert all(resp.status_code == 200 for resp in responses)
+    rows = await HttpValidatorCache.select(HttpValidatorCache.etag).run()
+    assert rows == [{"etag": '"v1"'}]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_validators_are_best_effort() -> None:
+    """Over-long URLs skip the table, and a failed store still returns the response."""
+    long_url = "https://example.test/" + "a" * MAX_URL_LENGTH
+    async with httpx.AsyncClient(transport=_etag_transport([])) as http:
+        with conditional_requests():
+            resp = await ConditionalClient(http).get(long_url)
+        assert resp.status_code == 200
+        assert await HttpValidatorCache.count().run() == 0
+
+        with patch.object(HttpValidatorCache, "insert", side_effect=RuntimeError("db down")):
+            resp = await ConditionalClient(http).get("https://example.test/pkg")
+        assert resp.json()["info"] == {"name": "pkg"}
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_not_modified_extends_ttl() -> None:
+    """A NotModified fetch keeps the cached stats and bumps fetched_at."""
+    stale = datetime.now(timezone.utc) - timedelta(hours=30)
+    await IntegrationCache(
+        service="devto",
+        lookup_key="ada",
+        stats_json=json.dumps({"total_articles": 3}),
+        fetched_at=stale,
+    ).save().run()
+
+    async def _unchanged() -> dict:
+        raise NotModified
+
+    result = await get_cached_stats("devto", "ada", _unchanged)
+
+    assert result == {"total_articles": 3}
+    row = await IntegrationCache.objects().first().run()
+    assert row.fetched_at.replace(tzinfo=timezone.utc) > stale + timedelta(hours=29)
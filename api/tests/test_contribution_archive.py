@@ -0,0 +1,182 @@
+"""Tests for the multi-year contribution archive."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_core.github_models import ContributionDay, GitHubStats
+from mandev_api.contribution_archive import (
+    _decode_year,
+    _encode_year,
+    archive_contribution_years,
+    get_contribution_range,
+    lifetime_summary,
+    load_archive,
+    update_lifetime_stats,
+)
+from mandev_api.tables import ContributionArchive, create_contribution_archive_key_index
+
+LAST_YEAR = datetime.now(timezone.utc).year - 1
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database for ContributionArchive tests."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engine = ContributionArchive._meta._db
+    ContributionArchive._meta._db = engine
+
+    try:
+        await create_db_tables(ContributionArchive, if_not_exists=True)
+        await create_contribution_archive_key_index()
+        yield
+        await drop_db_tables(ContributionArchive)
+    finally:
+        ContributionArchive._meta._db = original_engine
+        os.unlink(db_path)
+
+
+def _year_days(year: int, count: int = 1) -> list[ContributionDay]:
+    """Build a handful of contribution days in *year*."""
+    return [
+        ContributionDay(date=f"{year}-01-01", count=count),
+        ContributionDay(date=f"{year}-01-02", count=count),
+        ContributionDay(date=f"{year}-12-31", count=count),
+    ]
+
+
+def test_encode_decode_roundtrip_leap_year() -> None:
+    """Encoding stores one slot per day and decodes back to the same counts."""
+    days = [
+        ContributionDay(date="2024-02-29", count=4),
+        ContributionDay(date="2024-12-31", count=2),
+    ]
+    counts = _encode_year(2024, days)
+    assert len(counts.split(",")) == 366
+
+    decoded = _decode_year(2024, counts)
+    assert decoded["2024-02-29"] == 4
+    assert decoded["2024-12-31"] == 2
+    assert decoded["2024-01-01"] == 0
+
+
+def test_lifetime_summary_treats_gaps_as_zero() -> None:
+    """Missing days between known days break a streak."""
+    days = {"2024-01-01": 1, "2024-01-02": 2, "2024-01-04": 3}
+    assert lifetime_summary(days) == (6, 2)
+    assert lifetime_summary({}) == (0, 0)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_archive_fetches_missing_past_years_once() -> None:
+    """Past years are fetched once; the current year is never archived."""
+    years = [LAST_YEAR - 1, LAST_YEAR, LAST_YEAR + 1]
+
+    with patch(
+        "mandev_api.contribution_archive.fetch_contribution_year",
+        new_callable=AsyncMock,
+        side_effect=lambda _user, year, token: _year_days(year),
+    ) as mock_fetch:
+        archived = await archive_contribution_years("octocat", years, token="ghp")
+        again = await archive_contribution_years("octocat", years, token="ghp")
+
+    assert archived == [LAST_YEAR - 1, LAST_YEAR]
+    assert again == []
+    assert mock_fetch.await_count == 2
+
+    rows = await ContributionArchive.select().run()
+    assert {row["year"] for row in rows} == {LAST_YEAR - 1, LAST_YEAR}
+    assert all(row["total"] == 3 for row in rows)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_concurrent_archiving_stores_each_year_once() -> None:
+    """Refreshes racing to archive the same years leave one row per year."""
+
+    async def _fetch(_user: str, year: int, token: str) -> list[ContributionDay]:
+        await asyncio.sleep(0)
+        return _year_days(year)
+
+    with patch("mandev_api.contribution_archive.fetch_contribution_year", side_effect=_fetch):
+        await asyncio.gather(
+            *(archive_contribution_years("octocat", [LAST_YEAR], token="ghp") for _ in range(3))
+        )
+
+    assert await ContributionArchive.count().run() == 1
+    days = await load_archive("octocat")
+    assert lifetime_summary(days)[0] == 3
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_update_lifetime_stats_combines_archive_and_calendar() -> None:
+    """Lifetime totals cover archived years plus the trailing calendar."""
+    stats = GitHubStats(
+        total_stars=0,
+        total_repos=0,
+        followers=0,
+        total_contributions=5,
+        current_streak=0,
+        longest_streak=0,
+        languages=[],
+        pinned_repos=[],
+        contributions=[ContributionDay(date=f"{LAST_YEAR + 1}-01-01", count=5)],
+        fetched_at="",
+        contribution_years=[LAST_YEAR + 1, LAST_YEAR],
+    )
+
+    with patch(
+        "mandev_api.contribution_archive.fetch_contribution_year",
+        new_callable=AsyncMock,
+        side_effect=lambda _user, year, token: _year_days(year, count=2),
+    ):
+        await update_lifetime_stats("octocat", stats, token="ghp")
+
+    # Dec 31 of last year runs straight into Jan 1 of this year.
+    assert stats.lifetime_contributions == 11
+    assert stats.lifetime_longest_streak == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_get_contribution_range_merges_recent_days() -> None:
+    """Range queries read the archive and overlay the trailing calendar."""
+    await ContributionArchive(
+        github_username="octocat",
+        year=LAST_YEAR,
+        counts=_encode_year(LAST_YEAR, _year_days(LAST_YEAR, count=3)),
+        total=9,
+    ).save().run()
+
+    recent = [{"date": f"{LAST_YEAR + 1}-01-01", "count": 7}]
+    days = await get_contribution_range(
+        "octocat",
+        date(LAST_YEAR, 12, 30),
+        date(LAST_YEAR + 1, 1, 1),
+        recent=recent,
+    )
+
+    assert [(day.date, day.count) for day in days] == [
+        (f"{LAST_YEAR}-12-30", 0),
+        (f"{LAST_YEAR}-12-31", 3),
+        (f"{LAST_YEAR + 1}-01-01", 7),
+    ]
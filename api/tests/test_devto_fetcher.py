@@ -0,0 +1,121 @@
+"""Tests for the streaming Dev.to fetcher."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from unittest.mock import patch
+
+import httpx
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_api.conditional_http import NotModified, conditional_requests
+from mandev_api.devto_fetcher import _ArticleAggregator, fetch_devto_stats
+from mandev_api.tables import HttpValidatorCache
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database for the validator table."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engine = HttpValidatorCache._meta._db
+    HttpValidatorCache._meta._db = engine
+
+    try:
+        await create_db_tables(HttpValidatorCache, if_not_exists=True)
+        yield
+        await drop_db_tables(HttpValidatorCache)
+    finally:
+        HttpValidatorCache._meta._db = original_engine
+        os.unlink(db_path)
+
+
+def _article(i: int, reactions: int) -> dict:
+    """Build a raw Dev.to article dict."""
+    return {
+        "title": f"post {i}",
+        "url": f"https://dev.to/ada/{i}",
+        "published_at": "2026-01-01T00:00:00Z",
+        "positive_reactions_count": reactions,
+        "comments_count": 1,
+        "reading_time_minutes": 3,
+        "tag_list": ["python"],
+    }
+
+
+def test_aggregator_keeps_top_n_with_stable_ties() -> None:
+    """Only the top N articles are kept; ties keep API order across pages."""
+    aggregator = _ArticleAggregator(max_articles=2)
+    aggregator.add([_article(3, 5), _article(4, 9)], page=2)
+    aggregator.add([_article(1, 5), _article(2, 1)], page=1)
+
+    assert aggregator.total_articles == 4
+    assert aggregator.total_reactions == 20
+    assert [a.title for a in aggregator.top()] == ["post 4", "post 1"]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_fetch_devto_stats_streams_all_pages() -> None:
+    """Totals cover every page and stop after the first short page."""
+    articles = [_article(i, i % 50) for i in range(250)]
+    pages_seen: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        pages_seen.append(page)
+        return httpx.Response(200, json=articles[(page - 1) * 100:page * 100])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch("mandev_api.devto_fetcher.httpx.AsyncClient", return_value=client):
+        stats = await fetch_devto_stats("ada", max_articles=3)
+
+    assert stats["total_articles"] == 250
+    assert stats["total_comments"] == 250
+    assert stats["total_reactions"] == sum(a["positive_reactions_count"] for a in articles)
+    assert [a["reactions"] for a in stats["articles"]] == [49, 49, 49]
+    assert stats["articles"][0]["title"] == "post 49"
+    assert sorted(pages_seen) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_changed_max_articles_rebuilds_unchanged_pages() -> None:
+    """All-304 pages only count as unchanged if the article limit still fits."""
+    articles = [_article(i, i) for i in range(10)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=articles, headers={"ETag": '"v1"'})
+
+    def _client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch("mandev_api.devto_fetcher.httpx.AsyncClient", return_value=_client()):
+        previous = await fetch_devto_stats("ada", max_articles=3)
+
+    with (
+        conditional_requests(),
+        patch("mandev_api.devto_fetcher.httpx.AsyncClient", return_value=_client()),
+    ):
+        stats = await fetch_devto_stats("ada", max_articles=5, previous=previous)
+    assert len(stats["articles"]) == 5
+
+    with (
+        conditional_requests(),
+        patch("mandev_api.devto_fetcher.httpx.AsyncClient", return_value=_client()),
+        pytest.raises(NotModified),
+    ):
+        await fetch_devto_stats("ada", max_articles=5, previous=stats)
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from mandev_api.github_fetcher import (
+    QUERY,
     _aggregate_languages,
     _compute_streaks,
     fetch_github_stats,
 )
+from mandev_api.integration_service import NotFound
 from mandev_core.github_models import ContributionDay
 
 MOCK_GRAPHQL_RESPONSE = {
@@ -198,3 +202,224 @@ def test_compute_streaks_ends_with_zero() -> None:
 def test_aggregate_languages_empty_repos() -> None:
     """Aggregating languages from no repos returns an empty list."""
     assert _aggregate_languages([]) == []
+
+
+def _repo_node(name: str, stars: int, pushed_at: str, language: str = "Python") -> dict:
+    """Build a repository node as returned by the paginated query."""
+    return {
+        "name": name,
+        "stargazerCount": stars,
+        "pushedAt": pushed_at,
+        "languages": {
+            "edges": [{"size": 100, "node": {"name": language, "color": "#000"}}]
+        },
+    }
+
+
+def _graphql_client(pages: list[list[dict]], languages: dict[str, str] | None = None):
+    """Build a mock client that serves profile, repository and language queries.
+
+    :param pages: Repository nodes per page, served in order.
+    :param languages: Language served for each repo in aliased language
+        queries; repos mapped to ``None`` are reported as not found.
+    :returns: ``(client, calls)`` where *calls* records request payloads.
+    """
+    calls: list[dict] = []
+    profile = MOCK_GRAPHQL_RESPONSE["data"]["user"]
+
+    async def _post(_url: str, json: dict, **_kwargs: object) -> MagicMock:
+        calls.append(json)
+        variables = json["variables"]
+        if "cursor" in variables:
+            index = int(variables["cursor"] or 0)
+            nodes = [dict(node) for node in pages[index]]
+            if not variables["withLanguages"]:
+                for node in nodes:
+                    node.pop("languages")
+            data = {
+                "user": {
+                    "repositories": {
+                        "nodes": nodes,
+                        "pageInfo": {
+                            "hasNextPage": index + 1 < len(pages),
+                            "endCursor": str(index + 1),
+                        },
+                    }
+                }
+            }
+        elif "owner" in variables:
+            data = {
+                key.replace("n", "r"): {
+                    "languages": {
+                        "edges": [
+                            {"size": 100, "node": {"name": languages[name], "color": "#000"}}
+                        ]
+                    }
+                }
+                if languages[name] is not None
+                else None
+                for key, name in variables.items()
+                if key != "owner"
+            }
+            errors = [
+                {"type": "NOT_FOUND", "path": [key.replace("n", "r")]}
+                for key, name in variables.items()
+                if key != "owner" and languages[name] is None
+            ]
+        else:
+            data = {"user": profile}
+        response = MagicMock()
+        response.raise_for_status = MagicMock()
+        response.json.return_value = {"data": data}
+        if "owner" in variables and errors:
+            response.json.return_value["errors"] = errors
+        return response
+
+    client = AsyncMock()
+    client.post.side_effect = _post
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+    return client, calls
+
+
+@pytest.mark.anyio
+async def test_fetch_github_stats_paginates_repositories() -> None:
+    """Stars and languages are aggregated across every repository page."""
+    pages = [
+        [_repo_node(f"repo-{i}", 2, "2026-01-01") for i in range(100)],
+        [_repo_node("tail", 1, "2026-01-01", language="Go")],
+    ]
+    client, calls = _graphql_client(pages)
+
+    with patch("mandev_api.github_fetcher.httpx.AsyncClient", return_value=client):
+        stats = await fetch_github_stats("testuser", token="fake-token")
+
+    assert stats.total_stars == 201
+    assert {lang.name for lang in stats.languages} == {"Python", "Go"}
+    assert len([c for c in calls if "cursor" in c["variables"]]) == 2
+
+
+@pytest.mark.anyio
+async def test_fetch_github_stats_respects_repo_cap() -> None:
+    """No further pages are requested once ``max_repos`` is reached."""
+    pages = [[_repo_node(f"repo-{i}", 1, "2026-01-01")] for i in range(5)]
+    client, calls = _graphql_client(pages)
+
+    with patch("mandev_api.github_fetcher.httpx.AsyncClient", return_value=client):
+        stats = await fetch_github_stats("testuser", token="fake-token", max_repos=2)
+
+    assert stats.total_stars == 2
+    assert len([c for c in calls if "cursor" in c["variables"]]) == 2
+
+
+@pytest.mark.anyio
+async def test_incremental_mode_refetches_only_pushed_repos() -> None:
+    """With a repo index, only repos whose pushedAt changed get new languages."""
+    pages = [[
+        _repo_node("unchanged", 3, "2026-01-01"),
+        _repo_node("pushed", 4, "2026-02-01"),
+    ]]
+    repo_index = {
+        "unchanged": {
+            "pushed_at": "2026-01-01",
+            "languages": {"edges": [{"size": 100, "node": {"name": "Rust", "color": "#000"}}]},
+        },
+        "pushed": {"pushed_at": "2025-12-01", "languages": {"edges": []}},
+        "deleted": {"pushed_at": "2025-01-01", "languages": {"edges": []}},
+    }
+    client, calls = _graphql_client(pages, languages={"pushed": "Zig"})
+
+    with patch("mandev_api.github_fetcher.httpx.AsyncClient", return_value=client):
+        stats = await fetch_github_stats(
+            "testuser", token="fake-token", repo_index=repo_index
+        )
+
+    language_calls = [c for c in calls if "owner" in c["variables"]]
+    assert len(language_calls) == 1
+    assert language_calls[0]["variables"]["n0"] == "pushed"
+    assert "n1" not in language_calls[0]["variables"]
+
+    assert stats.total_stars == 7
+    assert {lang.name for lang in stats.languages} == {"Rust", "Zig"}
+    assert set(repo_index) == {"unchanged", "pushed"}
+    assert repo_index["pushed"]["pushed_at"] == "2026-02-01"
+
+
+@pytest.mark.anyio
+async def test_missing_repository_is_a_partial_result() -> None:
+    """A repo renamed since it was listed doesn't make the user not found."""
+    pages = [[
+        _repo_node("kept", 3, "2026-02-01"),
+        _repo_node("renamed", 4, "2026-02-01"),
+    ]]
+    repo_index = {
+        "renamed": {
+            "pushed_at": "2025-12-01",
+            "languages": {"edges": [{"size": 100, "node": {"name": "Rust", "color": "#000"}}]},
+        },
+    }
+    client, _ = _graphql_client(pages, languages={"kept": "Zig", "renamed": None})
+
+    with patch("mandev_api.github_fetcher.httpx.AsyncClient", return_value=client):
+        stats = await fetch_github_stats(
+            "testuser", token="fake-token", repo_index=repo_index
+        )
+
+    assert stats.total_stars == 7
+    assert {lang.name for lang in stats.languages} == {"Rust", "Zig"}
+    assert repo_index["kept"]["pushed_at"] == "2026-02-01"
+    # Not marked as up to date, so the next refresh asks again
+    assert repo_index["renamed"]["pushed_at"] == "2025-12-01"
+
+
+@pytest.mark.anyio
+async def test_missing_user_raises_not_found() -> None:
+    """A null ``user`` field means the account does not exist."""
+    response = MagicMock()
+    response.raise_for_status = MagicMock()
+    response.json.return_value = {
+        "data": {"user": None},
+        "errors": [{"type": "NOT_FOUND", "path": ["user"]}],
+    }
+    client = AsyncMock()
+    client.post.return_value = response
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+
+    with (
+        patch("mandev_api.github_fetcher.httpx.AsyncClient", return_value=client),
+        pytest.raises(NotFound),
+    ):
+        await fetch_github_stats("ghost", token="fake-token")
+
+
+@pytest.mark.anyio
+async def test_missing_user_cancels_the_repository_crawl() -> None:
+    """A failed profile query stops the concurrent repository pages."""
+    not_found = MagicMock()
+    not_found.raise_for_status = MagicMock()
+    not_found.json.return_value = {"data": {"user": None}}
+    crawl_cancelled = asyncio.Event()
+
+    async def post(url: str, *, json: dict, **kwargs: object) -> MagicMock:
+        if json["query"] == QUERY:
+            await asyncio.sleep(0)
+            return not_found
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            crawl_cancelled.set()
+            raise
+        raise AssertionError("repository crawl was not cancelled")
+
+    client = AsyncMock()
+    client.post.side_effect = post
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+
+    with (
+        patch("mandev_api.github_fetcher.httpx.AsyncClient", return_value=client),
+        pytest.raises(NotFound),
+    ):
+        await fetch_github_stats("ghost", token="fake-token")
+    assert crawl_cancelled.is_set()
@@ -14,6 +14,8 @@ from piccolo.table import create_db_tables, drop_db_tables
 
 from mandev_api.tables import GitHubStatsCache
 from mandev_api.github_service import get_github_stats
+from mandev_api.integration_service import NEGATIVE_TTL_HOURS, NotFound
+from mandev_api.l1_cache import l1
 
 FAKE_STATS = {
     "total_stars": 42,
@@ -146,3 +148,61 @@ async def test_no_token_no_cache_returns_none() -> None:
     """Without a token and no cached data, None is returned."""
     result = await get_github_stats("octocat", token=None)
     assert result is None
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_incremental_mode_persists_repo_index() -> None:
+    """In incremental mode the repo index round-trips through the cache row."""
+    previous_index = {"repo": {"pushed_at": "2026-01-01", "languages": {}}}
+    cache = GitHubStatsCache(
+        github_username="octocat",
+        stats_json=json.dumps(FAKE_STATS),
+        repo_index_json=json.dumps(previous_index),
+        fetched_at=datetime.now(timezone.utc) - timedelta(hours=25),
+    )
+    await cache.save().run()
+
+    async def _fake_fetch(_username: str, *, token: str, repo_index: dict) -> MagicMock:
+        assert repo_index == previous_index
+        repo_index["repo"]["pushed_at"] = "2026-02-01"
+        return _make_mock_stats()
+
+    with (
+        patch("mandev_api.github_service.settings.github_incremental_repos", True),
+        patch("mandev_api.github_service.fetch_github_stats", side_effect=_fake_fetch),
+    ):
+        await get_github_stats("octocat", token="ghp_fake")
+
+    row = await GitHubStatsCache.objects().first().run()
+    assert json.loads(row.repo_index_json)["repo"]["pushed_at"] == "2026-02-01"
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_unknown_user_is_negatively_cached() -> None:
+    """A user GitHub doesn't know is remembered for the negative TTL."""
+    with patch(
+        "mandev_api.github_service.fetch_github_stats",
+        new_callable=AsyncMock,
+        side_effect=NotFound("ghost"),
+    ) as mock_fetch:
+        assert await get_github_stats("ghost", token="ghp_fake") is None
+        assert await get_github_stats("ghost", token="ghp_fake") is None
+
+    mock_fetch.assert_awaited_once()
+    row = await GitHubStatsCache.objects().where(
+        GitHubStatsCache.github_username == "ghost"
+    ).first().run()
+    assert row.status == "not_found"
+
+    # Once the negative TTL passes the user is looked up again
+    row.fetched_at = datetime.now(timezone.utc) - timedelta(hours=NEGATIVE_TTL_HOURS + 1)
+    await row.save().run()
+    l1.clear()
+    with patch(
+        "mandev_api.github_service.fetch_github_stats",
+        new_callable=AsyncMock,
+        return_value=_make_mock_stats(),
+    ):
+        assert await get_github_stats("ghost", token="ghp_fake") == FAKE_STATS
@@ -0,0 +1,276 @@
+"""Tests for the paginated Hashnode fetcher."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from mandev_api.hashnode_fetcher import fetch_hashnode_stats
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+def _days_ago(days: int) -> str:
+    """Return an ISO timestamp *days* before now."""
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+def _post(i: int, reactions: int, published_at: str) -> dict:
+    """Build a Hashnode post edge."""
+    return {
+        "node": {
+            "title": f"post {i}",
+            "brief": "",
+            "url": f"https://ada.hashnode.dev/{i}",
+            "publishedAt": published_at,
+            "reactionCount": reactions,
+        }
+    }
+
+
+def _client(pages: dict[str | None, dict], requested: list[str | None]) -> httpx.AsyncClient:
+    """Build a client that serves *pages* keyed by the ``after`` cursor."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        after = json.loads(request.content)["variables"]["after"]
+        requested.append(after)
+        return httpx.Response(200, json={"data": {"publication": {"posts": pages[after]}}})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _page(edges: list[dict], total: int, cursor: str | None) -> dict:
+    """Build a posts connection page."""
+    return {
+        "edges": edges,
+        "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor},
+        "totalDocuments": total,
+    }
+
+
+@pytest.mark.anyio
+async def test_full_crawl_walks_every_page() -> None:
+    """All pages are summed and the newest articles are kept."""
+    pages = {
+        None: _page([_post(1, 2, _days_ago(1)), _post(2, 8, _days_ago(2))], 3, "c1"),
+        "c1": _page([_post(3, 5, _days_ago(3))], 3, None),
+    }
+    requested: list[str | None] = []
+
+    with patch(
+        "mandev_api.hashnode_fetcher.httpx.AsyncClient",
+        return_value=_client(pages, requested),
+    ):
+        result = await fetch_hashnode_stats("ada", max_articles=2)
+
+    assert requested == [None, "c1"]
+    assert result["total_articles"] == 3
+    assert result["total_reactions"] == 15
+    assert [a["title"] for a in result["articles"]] == ["post 1", "post 2"]
+    assert result["full_crawl_at"] == result["fetched_at"]
+
+
+@pytest.mark.anyio
+async def test_incremental_stops_at_known_posts() -> None:
+    """With recent previous stats, only posts newer than the last fetch count."""
+    previous = {
+        "total_articles": 2,
+        "total_reactions": 10,
+        "articles": [
+            {
+                "title": "post 2",
+                "url": "https://ada.hashnode.dev/2",
+                "published_at": _days_ago(3),
+                "reactions": 6,
+                "brief": "",
+            },
+            {
+                "title": "post 1",
+                "url": "https://ada.hashnode.dev/1",
+                "published_at": _days_ago(4),
+                "reactions": 4,
+                "brief": "",
+            },
+        ],
+        "fetched_at": _days_ago(1),
+        "full_crawl_at": _days_ago(2),
+    }
+    pages = {
+        None: _page(
+            [_post(3, 7, _days_ago(0)), _post(2, 6, _days_ago(3))], 3, "c1"
+        ),
+        "c1": _page([_post(1, 4, _days_ago(4))], 3, None),
+    }
+    requested: list[str | None] = []
+
+    with patch(
+        "mandev_api.hashnode_fetcher.httpx.AsyncClient",
+        return_value=_client(pages, requested),
+    ):
+        result = await fetch_hashnode_stats("ada", max_articles=2, previous=previous)
+
+    assert result["total_articles"] == 3
+    assert result["total_reactions"] == 17
+    assert [a["title"] for a in result["articles"]] == ["post 3", "post 2"]
+    assert result["full_crawl_at"] == previous["full_crawl_at"]
+
+
+@pytest.mark.anyio
+async def test_stale_full_crawl_forces_full_refresh() -> None:
+    """Previous stats older than the full-crawl interval are ignored."""
+    previous = {
+        "total_articles": 1,
+        "total_reactions": 100,
+        "articles": [],
+        "fetched_at": _days_ago(1),
+        "full_crawl_at": _days_ago(30),
+    }
+    pages = {None: _page([_post(1, 4, _days_ago(10))], 1, None)}
+    requested: list[str | None] = []
+
+    with patch(
+        "mandev_api.hashnode_fetcher.httpx.AsyncClient",
+        return_value=_client(pages, requested),
+    ):
+        result = await fetch_hashnode_stats("ada", previous=previous)
+
+    assert result["total_reactions"] == 4
+    assert result["full_crawl_at"] == result["fetched_at"]
+
+
+@pytest.mark.anyio
+async def test_incremental_refreshes_listed_posts_once() -> None:
+    """Listed posts get fresh counts that replace, not add to, the old ones."""
+    previous = {
+        "total_articles": 2,
+        "total_reactions": 10,
+        "articles": [
+            {
+                "title": "post 2",
+                "url": "https://ada.hashnode.dev/2",
+                "published_at": _days_ago(3),
+                "reactions": 6,
+                "brief": "",
+            },
+            {
+                "title": "post 1",
+                "url": "https://ada.hashnode.dev/1",
+                "published_at": _days_ago(4),
+                "reactions": 4,
+                "brief": "",
+            },
+        ],
+        "fetched_at": _days_ago(1),
+        "full_crawl_at": _days_ago(2),
+    }
+    # post 2 gained reactions and shows up again on the next page
+    pages = {
+        None: _page([_post(3, 7, _days_ago(0)), _post(2, 9, _days_ago(3))], 3, "c1"),
+        "c1": _page([_post(2, 9, _days_ago(3)), _post(1, 4, _days_ago(4))], 3, None),
+    }
+    requested: list[str | None] = []
+
+    with patch(
+        "mandev_api.hashnode_fetcher.httpx.AsyncClient",
+        return_value=_client(pages, requested),
+    ):
+        result = await fetch_hashnode_stats("ada", max_articles=3, previous=previous)
+
+    assert result["total_reactions"] == 20
+    assert [(a["title"], a["reactions"]) for a in result["articles"]] == [
+        ("post 3", 7),
+        ("post 2", 9),
+        ("post 1", 4),
+    ]
+
+
+def _previous_with(articles: list[dict], total: int, reactions: int) -> dict:
+    """Build recent previous stats listing *articles*."""
+    return {
+        "total_articles": total,
+        "total_reactions": reactions,
+        "articles": [
+            {
+                "title": post["node"]["title"],
+                "url": post["node"]["url"],
+                "published_at": post["node"]["publishedAt"],
+                "reactions": post["node"]["reactionCount"],
+                "brief": "",
+            }
+            for post in articles
+        ],
+        "fetched_at": _days_ago(1),
+        "full_crawl_at": _days_ago(2),
+    }
+
+
+@pytest.mark.anyio
+async def test_raised_max_articles_forces_full_crawl() -> None:
+    """Previous stats listing fewer articles than now allowed are rebuilt."""
+    posts = [_post(3, 1, _days_ago(5)), _post(2, 2, _days_ago(6)), _post(1, 3, _days_ago(7))]
+    previous = _previous_with(posts[:1], total=3, reactions=6)
+    pages = {None: _page(posts[:2], 3, "c1"), "c1": _page(posts[2:], 3, None)}
+    requested: list[str | None] = []
+
+    with patch(
+        "mandev_api.hashnode_fetcher.httpx.AsyncClient",
+        return_value=_client(pages, requested),
+    ):
+        result = await fetch_hashnode_stats("ada", max_articles=3, previous=previous)
+
+    assert requested == [None, "c1"]
+    assert [a["title"] for a in result["articles"]] == ["post 3", "post 2", "post 1"]
+    assert result["full_crawl_at"] == result["fetched_at"]
+
+
+@pytest.mark.anyio
+async def test_deleted_posts_force_full_crawl() -> None:
+    """A publication with fewer posts than counted before is recounted."""
+    posts = [_post(3, 1, _days_ago(5)), _post(2, 2, _days_ago(6)), _post(1, 3, _days_ago(7))]
+    previous = _previous_with(posts[:1], total=3, reactions=6)
+    # post 2 is gone
+    pages = {None: _page(posts[:1], 2, "c1"), "c1": _page(posts[2:], 2, None)}
+    requested: list[str | None] = []
+
+    with patch(
+        "mandev_api.hashnode_fetcher.httpx.AsyncClient",
+        return_value=_client(pages, requested),
+    ):
+        result = await fetch_hashnode_stats("ada", max_articles=1, previous=previous)
+
+    assert requested == [None, "c1"]
+    assert result["total_articles"] == 2
+    assert result["total_reactions"] == 4
+    assert result["full_crawl_at"] == result["fetched_at"]
+
+
+@pytest.mark.anyio
+async def test_failed_page_cancels_the_prefetch() -> None:
+    """An error on the current page doesn't leave the next one running."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content)["variables"]["after"] is None:
+            edges = [{"node": {"url": "u", "publishedAt": "not a date"}}]
+            return httpx.Response(
+                200, json={"data": {"publication": {"posts": _page(edges, 2, "c1")}}}
+            )
+        await asyncio.Event().wait()
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    running = asyncio.all_tasks()
+    with (
+        patch("mandev_api.hashnode_fetcher.httpx.AsyncClient", return_value=client),
+        pytest.raises(ValueError),
+    ):
+        await fetch_hashnode_stats("ada")
+
+    assert asyncio.all_tasks() == running
@@ -0,0 +1,86 @@
+"""Tests for generated default avatars."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+
+import pytest
+from httpx import AsyncClient
+
+from mandev_api.identicon import GRID, _render, identicon_png, normalize_size
+from mandev_api.tables import User, UserProfile
+
+
+def _pixels(png: bytes) -> tuple[int, list[bytes]]:
+    """Decode an unfiltered RGB PNG into its size and pixel rows."""
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    size = struct.unpack(">I", png[16:20])[0]
+    idat_length = struct.unpack(">I", png[33:37])[0]
+    raw = zlib.decompress(png[41 : 41 + idat_length])
+    stride = 1 + size * 3
+    assert len(raw) == size * stride
+    return size, [raw[i * stride + 1 : (i + 1) * stride] for i in range(size)]
+
+
+def test_identicon_is_deterministic_and_mirrored() -> None:
+    """The same seed renders the same symmetric image at the requested size."""
+    png = identicon_png("ada", 64)
+    assert png == identicon_png("ada", 64)
+    assert png != identicon_png("grace", 64)
+
+    size, rows = _pixels(png)
+    assert size == 64
+    scale = size // GRID
+    for row in rows:
+        cells = [row[i * scale * 3 : i * scale * 3 + 3] for i in range(GRID)]
+        assert cells == cells[::-1]
+    assert rows[0] == rows[scale - 1]
+
+
+def test_sizes_are_clamped_and_cached() -> None:
+    """Sizes snap to the grid, so nearby sizes share one cache entry."""
+    assert normalize_size(1) == GRID
+    assert normalize_size(70) == 64
+    assert normalize_size(10_000) == 512
+
+    _render.cache_clear()
+    identicon_png("ada", 64)
+    identicon_png("ada", 70)
+    assert _render.cache_info().hits == 1
+
+
+@pytest.mark.anyio
+async def test_avatar_endpoint(client: AsyncClient) -> None:
+    """The endpoint serves cacheable PNGs and honours If-None-Match."""
+    resp = await client.get("/api/avatar/ada.png", params={"size": 32})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "image/png"
+    assert resp.headers["cache-control"] == "public, max-age=86400"
+    assert _pixels(resp.content)[0] == 32
+
+    resp = await client.get(
+        "/api/avatar/ada.png",
+        params={"size": 32},
+        headers={"If-None-Match": resp.headers["etag"]},
+    )
+    assert resp.status_code == 304
+
+    for size in (4096, 70):
+        resp = await client.get("/api/avatar/ada.png", params={"size": size})
+        assert resp.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_profile_without_avatar_gets_identicon_url(client: AsyncClient) -> None:
+    """The public profile points at the identicon unless an avatar is set."""
+    for name, profile in (("ada", '{"name": "Ada"}'), ("bob", '{"name": "Bob", "avatar": "x"}')):
+        user = User(email=f"{name}@example.com", username=name, password_hash="x")
+        await user.save().run()
+        config = f'{{"profile": {profile}}}'
+        await UserProfile(user_id=user.id, config_json=config).save().run()
+
+    resp = await client.get("/api/profile/ada")
+    assert resp.json()["profile"]["avatar"] == "http://test/api/avatar/ada.png"
+    resp = await client.get("/api/profile/bob")
+    assert resp.json()["profile"]["avatar"] == "x"
@@ -0,0 +1,155 @@
+"""Tests for the integration registry."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from mandev_api.integrations import INTEGRATIONS, REGISTRY, Integration, LoadContext, load_all
+from mandev_api.outbound import limiter_for, outbound_transport, set_base_transport
+from mandev_api.ttl_policy import ttl_hours
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+def test_pypi_lookup_key_ignores_order_and_spelling() -> None:
+    """Equivalent package lists share one cache key."""
+    pypi = REGISTRY["pypi"]
+    a = pypi.lookup_key(pypi.parse({"packages": ["Foo_Bar", "baz"]}))
+    b = pypi.lookup_key(pypi.parse({"packages": ["baz", "foo-bar"]}))
+    assert a == b
+    assert pypi.lookup_key(pypi.parse({"packages": []})) is None
+
+
+@pytest.mark.anyio
+async def test_load_skips_missing_and_invalid_config() -> None:
+    """Absent, invalid or key-less sections load nothing."""
+    npm = REGISTRY["npm"]
+    with patch("mandev_api.integrations.get_cached_stats", new_callable=AsyncMock) as mock:
+        assert await npm.load(None, LoadContext()) is None
+        assert await npm.load({"max_packages": 3}, LoadContext()) is None
+        assert await npm.load({"username": ""}, LoadContext()) is None
+    mock.assert_not_awaited()
+
+
+def test_invalid_section_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """A section failing validation is dropped with a warning saying why."""
+    with caplog.at_level(logging.WARNING, logger="mandev_api.integrations"):
+        assert REGISTRY["npm"].parse({"username": "ada", "max_packages": "many"}) is None
+
+    assert caplog.messages == [
+        "Ignoring invalid npm config: max_packages: "
+        "Input should be a valid integer, unable to parse string as an integer"
+    ]
+
+
+@pytest.mark.anyio
+async def test_load_applies_integration_settings() -> None:
+    """The cached fetch gets the TTL and kwargs."""
+    hashnode = REGISTRY["hashnode"]
+
+    with patch(
+        "mandev_api.integrations.get_cached_stats",
+        new_callable=AsyncMock,
+        return_value={"total_articles": 1},
+    ) as mock:
+        result = await hashnode.load(
+            {"username": "ada", "max_articles": 3}, LoadContext(ttl_factor=0.5)
+        )
+
+    assert result == {"total_articles": 1}
+    mock.assert_called_once_with(
+        "hashnode",
+        "ada",
+        hashnode.fetcher,
+        ttl_hours=ttl_hours("hashnode") / 2,
+        incremental=True,
+        username="ada",
+        max_articles=3,
+    )
+
+
+def test_ttl_delegates_to_the_policy() -> None:
+    """An integration's TTL is its policy service's, scaled by popularity."""
+    assert REGISTRY["devto"].ttl_hours(0.5) == ttl_hours("devto", 0.5)
+    shared = Integration(
+        name="custom", config_model=BaseModel, lookup_key=str, ttl_service="pypi_downloads"
+    )
+    assert shared.ttl_hours() == ttl_hours("pypi_downloads")
+
+
+class _Section(BaseModel):
+    """Config section of the budget test integration."""
+
+    name: str
+
+
+@pytest.mark.anyio
+async def test_concurrency_caps_requests_below_the_host_limit() -> None:
+    """An integration's budget bounds its requests across profiles."""
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={})
+
+    async def fetch(name: str) -> dict:
+        async with httpx.AsyncClient(transport=outbound_transport()) as client:
+            await asyncio.gather(
+                *(client.get(f"https://budget.test/{name}/{i}") for i in range(4))
+            )
+        return {"name": name}
+
+    async def _fake_cached(service: str, key: str, fetcher, **kwargs: object) -> dict:
+        kwargs.pop("ttl_hours")
+        kwargs.pop("incremental")
+        return await fetcher(**kwargs)
+
+    budgeted = Integration(
+        name="budgeted",
+        config_model=_Section,
+        lookup_key=lambda config: config.name,
+        fetcher=fetch,
+        fetcher_kwargs=lambda config: {"name": config.name},
+        concurrency=2,
+    )
+    limiter_for("budget.test").limit = 12
+    set_base_transport(lambda: httpx.MockTransport(handler))
+    try:
+        with patch("mandev_api.integrations.get_cached_stats", side_effect=_fake_cached):
+            results = await asyncio.gather(
+                *(budgeted.load({"name": f"p{i}"}, LoadContext()) for i in range(3))
+            )
+    finally:
+        set_base_transport(None)
+
+    assert [r["name"] for r in results] == ["p0", "p1", "p2"]
+    assert peak == 2
+
+
+@pytest.mark.anyio
+async def test_load_all_returns_every_integration() -> None:
+    """Every registered integration appears in the result."""
+    with patch(
+        "mandev_api.integrations.get_cached_stats",
+        new_callable=AsyncMock,
+        return_value={"ok": True},
+    ):
+        result = await load_all({"npm": {"username": "ada"}}, LoadContext())
+
+    assert set(result) == {f"{i.name}_stats" for i in INTEGRATIONS}
+    assert result["npm_stats"] == {"ok": True}
+    assert result["devto_stats"] is None
@@ -0,0 +1,177 @@
+"""Tests for the in-process L1 stats cache."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_api import l1_cache
+from mandev_api.integration_service import get_cached_stats
+from mandev_api.l1_cache import MISSING, L1Cache, l1
+from mandev_api.tables import IntegrationCache, create_integration_cache_key_index
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database for the integration cache."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engine = IntegrationCache._meta._db
+    IntegrationCache._meta._db = engine
+
+    try:
+        await create_db_tables(IntegrationCache, if_not_exists=True)
+        await create_integration_cache_key_index()
+        yield
+        await drop_db_tables(IntegrationCache)
+    finally:
+        IntegrationCache._meta._db = original_engine
+        os.unlink(db_path)
+
+
+def _later(seconds: float = 3600) -> datetime:
+    """Return the time *seconds* from now."""
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def test_lru_eviction_and_expiry() -> None:
+    """The least recently used entry goes first; stale rows are not kept."""
+    cache = L1Cache(maxsize=2, ttl=60)
+    cache.put("npm", "a", {"n": 1}, _later())
+    cache.put("npm", "b", None, _later())
+    assert cache.get("npm", "a") == {"n": 1}
+    cache.put("npm", "c", {"n": 3}, _later())
+
+    assert cache.get("npm", "b") is MISSING
+    assert cache.get("npm", "a") == {"n": 1}
+
+    cache.put("npm", "d", {"n": 4}, _later(-1))
+    assert cache.get("npm", "d") is MISSING
+
+
+def test_notifications_from_other_workers_invalidate() -> None:
+    """Another worker's notification drops the key; our own is ignored."""
+    l1.put("devto", "ada", {"n": 1}, _later())
+
+    l1_cache._on_notify(None, 0, l1_cache.CHANNEL, f"{l1_cache._ORIGIN}|devto|ada")
+    assert l1.get("devto", "ada") == {"n": 1}
+
+    l1_cache._on_notify(None, 0, l1_cache.CHANNEL, "other-worker|devto|ada")
+    assert l1.get("devto", "ada") is MISSING
+
+
+def test_entries_are_read_only_copies() -> None:
+    """Neither the stored value nor a returned one can change the entry."""
+    cache = L1Cache(maxsize=2, ttl=60)
+    stats = {"articles": [{"title": "a"}], "total": 1}
+    cache.put("devto", "ada", stats, _later())
+    stats["articles"].append({"title": "b"})
+
+    hit = cache.get("devto", "ada")
+    with pytest.raises(TypeError):
+        hit["total"] = 2
+    with pytest.raises(TypeError):
+        hit["articles"][0].update(title="c")
+    with pytest.raises(AttributeError):
+        hit["articles"].append({"title": "c"})
+
+    assert cache.get("devto", "ada") == {"articles": ({"title": "a"},), "total": 1}
+    assert copy.deepcopy(hit) == hit
+
+
+def _fake_engine(connect_failures: int = 0) -> tuple[MagicMock, list[MagicMock]]:
+    """Build an engine whose connections record their termination listeners.
+
+    :param connect_failures: Connection attempts to fail before succeeding.
+    :returns: ``(engine, connections)`` with every connection opened so far.
+    """
+    connections: list[MagicMock] = []
+    attempts = 0
+
+    async def _connect() -> MagicMock:
+        nonlocal attempts
+        attempts += 1
+        if 1 < attempts <= 1 + connect_failures:
+            raise OSError("connection refused")
+        connection = MagicMock()
+        connection.add_listener = AsyncMock()
+        connection.remove_listener = AsyncMock()
+        connection.close = AsyncMock()
+        connections.append(connection)
+        return connection
+
+    engine = MagicMock()
+    engine.get_new_connection = _connect
+    return engine, connections
+
+
+@pytest.mark.anyio
+async def test_listener_reconnects_and_disables_l1_meanwhile() -> None:
+    """A lost listener clears L1, which stays off until it reconnects."""
+    engine, connections = _fake_engine(connect_failures=2)
+    listener = l1_cache._InvalidationListener(engine)
+    await listener.connect()
+    l1.put("devto", "ada", {"n": 1}, _later())
+
+    with (
+        patch.object(l1_cache, "RECONNECT_MIN_DELAY", 0.001),
+        patch.object(l1_cache, "RECONNECT_MAX_DELAY", 0.004),
+    ):
+        on_terminate = connections[0].add_termination_listener.call_args.args[0]
+        on_terminate(connections[0])
+
+        assert l1.get("devto", "ada") is MISSING
+        l1.put("devto", "ada", {"n": 1}, _later())
+        assert l1.get("devto", "ada") is MISSING
+
+        for _ in range(100):
+            if len(connections) == 2:
+                break
+            await asyncio.sleep(0.005)
+
+    assert len(connections) == 2
+    assert l1.enabled
+    l1.put("devto", "ada", {"n": 1}, _later())
+    assert l1.get("devto", "ada") == {"n": 1}
+
+    await listener.stop()
+    connections[1].close.assert_awaited_once()
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_warm_reads_skip_the_database() -> None:
+    """Once loaded, stats are served without querying the cache table."""
+    fetcher = AsyncMock(return_value={"total_articles": 2})
+    first = await get_cached_stats("devto", "ada", fetcher, username="ada")
+
+    with patch.object(IntegrationCache, "objects", side_effect=AssertionError("queried")):
+        second = await get_cached_stats("devto", "ada", fetcher, username="ada")
+
+    assert first == second == {"total_articles": 2}
+    fetcher.assert_awaited_once()
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_refreshes_upsert_a_single_row() -> None:
+    """Repeated writes of one key replace the row instead of adding one."""
+    fetcher = AsyncMock(side_effect=[{"total_articles": 1}, {"total_articles": 2}])
+    await get_cached_stats("devto", "ada", fetcher, username="ada")
+    l1.clear()
+    await IntegrationCache.update(
+        {IntegrationCache.fetched_at: datetime.now(timezone.utc) - timedelta(days=2)}
+    ).where(IntegrationCache.lookup_key == "ada").run()
+
+    assert await get_cached_stats("devto", "ada", fetcher, username="ada") == {"total_articles": 2}
+    assert await IntegrationCache.count().run() == 1
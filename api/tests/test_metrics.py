@@ -0,0 +1,61 @@
+"""Tests for the Prometheus metrics endpoint."""
+
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+
+from mandev_api import metrics
+from mandev_api.integration_service import CACHE_LOOKUPS
+from mandev_api.tables import User
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Buckets are cumulative and end with +Inf, _sum and _count."""
+    histogram = metrics.Histogram("test_render_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    try:
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5.0, "/a")
+
+        lines = list(metrics._render_family(histogram.collect()))
+    finally:
+        del metrics._metrics["test_render_seconds"]
+
+    assert lines[2:] == [
+        'test_render_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_render_seconds_bucket{route="/a",le="1"} 2',
+        'test_render_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_render_seconds_sum{route="/a"} 5.55',
+        'test_render_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_label_values_are_escaped() -> None:
+    """Quotes, backslashes and newlines cannot break the format."""
+    family = metrics.MetricFamily("test_escape", "Test.", "gauge")
+    family.add(1, key='a"b\\c\nd')
+    assert list(metrics._render_family(family))[-1] == 'test_escape{key="a\\"b\\\\c\\nd"} 1'
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint(client: AsyncClient) -> None:
+    """Requests, queries and cache lookups show up in a scrape."""
+    before = metrics.HTTP_DURATION.count("GET", "/api/profile/{username}")
+    queries = metrics.DB_QUERIES.value("users", "objects", "ok")
+    CACHE_LOOKUPS.inc("npm", "hit")
+
+    await User(email="ada@example.com", username="ada", password_hash="x").save().run()
+    resp = await client.get("/api/profile/ada")
+    assert resp.status_code == 404
+
+    resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert "# TYPE mandev_http_request_duration_seconds histogram" in body
+    assert 'mandev_cache_lookups_total{service="npm",result="hit"}' in body
+    assert "mandev_integration_loads_total" in body
+    assert "mandev_l1_cache_entries 0" in body
+    assert metrics.HTTP_DURATION.count("GET", "/api/profile/{username}") == before + 1
+    assert metrics.DB_QUERIES.value("users", "objects", "ok") > queries
@@ -0,0 +1,218 @@
+"""Tests for the npm fetcher's bulk download lookups."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import httpx
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_api import outbound
+from mandev_api.conditional_http import MAX_URL_LENGTH, NotModified, conditional_requests
+from mandev_api.integrations import REGISTRY, LoadContext
+from mandev_api.npm_fetcher import (
+    NPM_BULK_LIMIT,
+    NPM_DOWNLOADS_URL,
+    _bulk_chunks,
+    fetch_npm_stats,
+)
+from mandev_api.tables import (
+    HttpValidatorCache,
+    IntegrationCache,
+    create_integration_cache_key_index,
+)
+
+TABLES = [HttpValidatorCache, IntegrationCache]
+
+DOWNLOADS = {"left-pad": 100, "is-odd": 20, "is-even": 3, "@scope/util": 7}
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database for the cache tables."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engines = {table: table._meta._db for table in TABLES}
+    for table in TABLES:
+        table._meta._db = engine
+
+    try:
+        await create_db_tables(*TABLES, if_not_exists=True)
+        await create_integration_cache_key_index()
+        yield
+        await drop_db_tables(*TABLES)
+    finally:
+        for table in TABLES:
+            table._meta._db = original_engines[table]
+        os.unlink(db_path)
+
+
+def _npm_client(packages: list[str], seen: list[str]) -> httpx.AsyncClient:
+    """Build a client whose transport emulates the npm search and downloads APIs.
+
+    Search responses carry an ETag and answer a matching
+    ``If-None-Match`` with ``304``.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/-/v1/search":
+            if request.headers.get("If-None-Match") == '"search"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json={"objects": [{"package": {"name": name}} for name in packages]},
+                headers={"ETag": '"search"'},
+            )
+        names = request.url.path.rsplit("/last-week/", 1)[1].split(",")
+        if len(names) == 1:
+            return httpx.Response(200, json={"downloads": DOWNLOADS[names[0]]})
+        return httpx.Response(
+            200, json={name: {"downloads": DOWNLOADS[name]} for name in names}
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_bulk_chunks_fit_the_validator_table() -> None:
+    """Bulk queries respect both the package limit and the URL length."""
+    short = [f"p{i}" for i in range(300)]
+    assert [len(chunk) for chunk in _bulk_chunks(short)] == [NPM_BULK_LIMIT, NPM_BULK_LIMIT, 44]
+
+    long = [f"package-with-a-long-name-{i:03}" for i in range(128)]
+    chunks = _bulk_chunks(long)
+    assert len(chunks) > 1
+    assert [name for chunk in chunks for name in chunk] == long
+    assert all(
+        len(f"{NPM_DOWNLOADS_URL}/{','.join(chunk)}") <= MAX_URL_LENGTH for chunk in chunks
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_unscoped_packages_use_one_bulk_request() -> None:
+    """Unscoped packages are batched; scoped ones are fetched individually."""
+    seen: list[str] = []
+    packages = ["left-pad", "is-odd", "is-even", "@scope/util"]
+
+    with patch(
+        "mandev_api.npm_fetcher.httpx.AsyncClient",
+        return_value=_npm_client(packages, seen),
+    ):
+        stats = await fetch_npm_stats("maintainer")
+
+    download_paths = [path for path in seen if "last-week" in path]
+    assert len(download_paths) == 2
+    assert stats["total_weekly_downloads"] == 130
+    assert stats["packages"][0]["name"] == "left-pad"
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_download_counts_are_shared_across_maintainers() -> None:
+    """A second maintainer of the same packages reuses the cached counts."""
+    first_seen: list[str] = []
+    with patch(
+        "mandev_api.npm_fetcher.httpx.AsyncClient",
+        return_value=_npm_client(["left-pad", "is-odd"], first_seen),
+    ):
+        await fetch_npm_stats("alice")
+
+    second_seen: list[str] = []
+    with patch(
+        "mandev_api.npm_fetcher.httpx.AsyncClient",
+        return_value=_npm_client(["left-pad", "is-odd", "is-even"], second_seen),
+    ):
+        stats = await fetch_npm_stats("bob")
+
+    assert stats["total_weekly_downloads"] == 123
+    # Only is-even was missing, and a single package uses the plain endpoint
+    assert [path for path in second_seen if "last-week" in path] == [
+        "/downloads/point/last-week/is-even"
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_unchanged_search_picks_up_shared_downloads() -> None:
+    """A 304 search still reports counts another refresh updated."""
+    packages = ["left-pad", "is-odd"]
+    with patch(
+        "mandev_api.npm_fetcher.httpx.AsyncClient",
+        return_value=_npm_client(packages, []),
+    ):
+        previous = await fetch_npm_stats("alice")
+
+    # Another maintainer's refresh updates the shared left-pad count
+    await IntegrationCache.update(
+        {IntegrationCache.stats_json: json.dumps({"weekly_downloads": 500})}
+    ).where(IntegrationCache.lookup_key == "left-pad").run()
+
+    seen: list[str] = []
+    with (
+        conditional_requests(),
+        patch(
+            "mandev_api.npm_fetcher.httpx.AsyncClient",
+            return_value=_npm_client(packages, seen),
+        ),
+    ):
+        stats = await fetch_npm_stats("alice", previous=previous)
+
+    assert seen == ["/-/v1/search"]
+    assert stats["total_weekly_downloads"] == 520
+
+    with (
+        conditional_requests(),
+        patch(
+            "mandev_api.npm_fetcher.httpx.AsyncClient",
+            return_value=_npm_client(packages, []),
+        ),
+        pytest.raises(NotModified),
+    ):
+        await fetch_npm_stats("alice", previous=stats)
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_concurrency_follows_the_host_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Once a host's adaptive limit has grown, more than 5 requests run at once."""
+    scoped = [f"@scope/pkg-{i}" for i in range(12)]
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        if request.url.path == "/-/v1/search":
+            return httpx.Response(
+                200, json={"objects": [{"package": {"name": name}} for name in scoped]}
+            )
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"downloads": 1})
+
+    monkeypatch.setattr(outbound, "_limiters", {})
+    monkeypatch.setattr(outbound, "_base_transport", outbound._base_transport)
+    outbound.set_base_transport(lambda: httpx.MockTransport(handler))
+    outbound.limiter_for("api.npmjs.org").limit = 12
+
+    stats = await REGISTRY["npm"].load(
+        {"username": "ada", "max_packages": 12}, LoadContext()
+    )
+
+    assert stats["total_weekly_downloads"] == 12
+    assert peak > 5
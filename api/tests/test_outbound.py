@@ -0,0 +1,127 @@
+"""Tests for the adaptive outbound limiter."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from mandev_api import outbound
+from mandev_api.outbound import AdaptiveLimiter, LimitedTransport, limiter_snapshot
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give each test its own limiter registry."""
+    monkeypatch.setattr(outbound, "_limiters", {})
+
+
+def _limiter(initial: float = 2) -> AdaptiveLimiter:
+    """Build a limiter with test-friendly bounds."""
+    return AdaptiveLimiter("example.com", initial=initial, maximum=8, latency_target=1.0)
+
+
+def test_limit_grows_on_success_and_halves_on_pushback() -> None:
+    """Fast successes add about one slot per window; pushback halves."""
+    limiter = _limiter(initial=4)
+    for _ in range(4):
+        limiter.in_flight += 1
+        limiter.release(ok=True, latency=0.1)
+    assert 4.9 < limiter.limit < 5.0
+
+    limiter.in_flight += 1
+    limiter.release(ok=False, latency=0.1)
+    assert limiter.limit < 2.5
+    assert limiter.throttled == 1
+
+    # Repeated pushback within one window does not collapse the limit
+    before = limiter.limit
+    limiter.in_flight += 1
+    limiter.release(ok=True, latency=5.0)
+    assert limiter.limit == before
+    assert limiter.throttled == 2
+
+
+@pytest.mark.anyio
+async def test_waiters_queue_in_order() -> None:
+    """Requests over the limit wait and are woken first-in, first-out."""
+    limiter = _limiter(initial=1)
+    await limiter.acquire()
+    order: list[int] = []
+
+    async def _worker(n: int) -> None:
+        await limiter.acquire()
+        order.append(n)
+
+    tasks = [asyncio.create_task(_worker(n)) for n in range(3)]
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 3
+
+    for _ in range(3):
+        limiter.release(ok=True, latency=0.0)
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    assert order == [0, 1, 2]
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.anyio
+async def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    """A waiter cancelled while queued leaves the slot count intact."""
+    limiter = _limiter(initial=1)
+    await limiter.acquire()
+
+    task = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    limiter.release(ok=True, latency=0.0)
+    assert limiter.in_flight == 0
+    await limiter.acquire()
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.anyio
+async def test_transport_feeds_status_codes_to_host_limiter() -> None:
+    """A 429 from an upstream backs off that host only."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429 if request.url.host == "slow.test" else 200)
+
+    transport = LimitedTransport(httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get("https://slow.test/")
+        await client.get("https://fine.test/")
+
+    snapshot = limiter_snapshot()
+    assert snapshot["slow.test"]["throttled"] == 1
+    assert snapshot["slow.test"]["limit"] < snapshot["fine.test"]["limit"]
+    assert snapshot["fine.test"]["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_base_transport_can_be_swapped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fetcher transports send through the configured base transport."""
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.host)
+        return httpx.Response(200, json={"ok": True})
+
+    monkeypatch.setattr(outbound, "_base_transport", outbound._base_transport)
+    outbound.set_base_transport(lambda: httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=outbound.outbound_transport()) as client:
+        resp = await client.get("https://registry.npmjs.org/-/v1/search")
+
+    assert resp.json() == {"ok": True}
+    assert seen == ["registry.npmjs.org"]
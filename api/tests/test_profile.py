@@ -170,3 +170,27 @@ async def test_public_profile_without_github_has_null_stats(client: AsyncClient)
     assert resp.status_code == 200
     data = resp.json()
     assert data["github_stats"] is None
+
+
+@pytest.mark.anyio
+async def test_contributions_range_requires_github(client: AsyncClient) -> None:
+    """GET /api/profile/{username}/contributions returns 404 without GitHub config."""
+    token = await _signup_and_login(client, "no_gh_range")
+    await client.put(
+        "/api/profile",
+        json=VALID_CONFIG,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    resp = await client.get("/api/profile/no_gh_range/contributions")
+    assert resp.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_contributions_range_rejects_inverted_range(client: AsyncClient) -> None:
+    """GET /api/profile/{username}/contributions returns 422 when start > end."""
+    resp = await client.get(
+        "/api/profile/anyone/contributions",
+        params={"start": "2025-02-01", "end": "2025-01-01"},
+    )
+    assert resp.status_code == 422
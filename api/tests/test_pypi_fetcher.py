@@ -0,0 +1,137 @@
+"""Tests for the PyPI fetcher's per-package cache layer."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from unittest.mock import patch
+
+import httpx
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_api.pypi_fetcher import fetch_pypi_stats, normalize_name
+from mandev_api.tables import (
+    HttpValidatorCache,
+    IntegrationCache,
+    create_integration_cache_key_index,
+)
+
+TABLES = [HttpValidatorCache, IntegrationCache]
+
+MONTHLY = {"requests": 1000, "httpx": 400, "flask": 250}
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database for the cache tables."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engines = {table: table._meta._db for table in TABLES}
+    for table in TABLES:
+        table._meta._db = engine
+
+    try:
+        await create_db_tables(*TABLES, if_not_exists=True)
+        await create_integration_cache_key_index()
+        yield
+        await drop_db_tables(*TABLES)
+    finally:
+        for table in TABLES:
+            table._meta._db = original_engines[table]
+        os.unlink(db_path)
+
+
+def _pypi_client(seen: list[str]) -> httpx.AsyncClient:
+    """Build a client whose transport emulates PyPI and pypistats."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(f"{request.url.host}{request.url.path}")
+        name = request.url.path.split("/")[-2]
+        if name not in MONTHLY:
+            return httpx.Response(404)
+        if request.url.host == "pypi.org":
+            return httpx.Response(
+                200, json={"info": {"name": name, "version": "1.0", "summary": ""}}
+            )
+        return httpx.Response(200, json={"data": {"last_month": MONTHLY[name]}})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_normalize_name() -> None:
+    """Names are normalised per PEP 503 so equivalent spellings share entries."""
+    assert normalize_name("Django_REST.framework") == "django-rest-framework"
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_adding_a_package_fetches_only_that_package() -> None:
+    """Overlapping package lists reuse cached per-package entries."""
+    first_seen: list[str] = []
+    with patch(
+        "mandev_api.pypi_fetcher.httpx.AsyncClient",
+        return_value=_pypi_client(first_seen),
+    ):
+        first = await fetch_pypi_stats(["requests", "httpx"])
+
+    second_seen: list[str] = []
+    with patch(
+        "mandev_api.pypi_fetcher.httpx.AsyncClient",
+        return_value=_pypi_client(second_seen),
+    ):
+        second = await fetch_pypi_stats(["Requests", "httpx", "flask"])
+
+    assert len(first_seen) == 4
+    assert first["total_monthly_downloads"] == 1400
+    assert sorted(second_seen) == [
+        "pypi.org/pypi/flask/json",
+        "pypistats.org/api/packages/flask/recent",
+    ]
+    assert second["total_packages"] == 3
+    assert second["total_monthly_downloads"] == 1650
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_missing_package_is_skipped() -> None:
+    """A package that 404s on PyPI is left out of the stats."""
+    with patch(
+        "mandev_api.pypi_fetcher.httpx.AsyncClient",
+        return_value=_pypi_client([]),
+    ):
+        stats = await fetch_pypi_stats(["requests", "no-such-package"])
+
+    assert [pkg["name"] for pkg in stats["packages"]] == ["requests"]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_missing_package_is_not_refetched() -> None:
+    """A 404 is cached as not found, so later views skip the lookup."""
+    with patch(
+        "mandev_api.pypi_fetcher.httpx.AsyncClient",
+        return_value=_pypi_client([]),
+    ):
+        await fetch_pypi_stats(["no-such-package"])
+
+    seen: list[str] = []
+    with patch(
+        "mandev_api.pypi_fetcher.httpx.AsyncClient",
+        return_value=_pypi_client(seen),
+    ):
+        stats = await fetch_pypi_stats(["no-such-package"])
+
+    assert seen == []
+    assert stats["total_packages"] == 0
+    statuses = await IntegrationCache.select(IntegrationCache.status).run()
+    assert {row["status"] for row in statuses} == {"not_found"}
@@ -0,0 +1,169 @@
+"""Tests for outbound retries and circuit breaking."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_api import resilience
+from mandev_api.integration_service import get_cached_stats
+from mandev_api.resilience import CircuitBreaker, CircuitOpen, RetryTransport
+from mandev_api.tables import IntegrationCache, create_integration_cache_key_index
+
+
+@pytest.fixture(params=["asyncio"])
+def anyio_backend(request: pytest.FixtureRequest) -> str:
+    """Override anyio backend to only use asyncio."""
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def _fresh_breakers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give each test its own breaker registry."""
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database for the integration cache."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engine = IntegrationCache._meta._db
+    IntegrationCache._meta._db = engine
+
+    try:
+        await create_db_tables(IntegrationCache, if_not_exists=True)
+        await create_integration_cache_key_index()
+        yield
+        await drop_db_tables(IntegrationCache)
+    finally:
+        IntegrationCache._meta._db = original_engine
+        os.unlink(db_path)
+
+
+def _client(statuses: list[int], sleeps: list[float], headers: dict | None = None):
+    """Build a client answering with *statuses* in turn, recording sleeps."""
+    calls = iter(statuses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(calls), headers=headers or {})
+
+    async def _sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    transport = RetryTransport(httpx.MockTransport(handler), retries=2, sleep=_sleep)
+    return httpx.AsyncClient(transport=transport)
+
+
+@pytest.mark.anyio
+async def test_retries_transient_errors_with_jitter() -> None:
+    """503s are retried with bounded, jittered sleeps until success."""
+    sleeps: list[float] = []
+    async with _client([503, 503, 200], sleeps) as client:
+        resp = await client.get("https://up.test/")
+
+    assert resp.status_code == 200
+    assert len(sleeps) == 2
+    assert all(resilience.BACKOFF_BASE <= s <= resilience.BACKOFF_CAP for s in sleeps)
+
+
+@pytest.mark.anyio
+async def test_honours_retry_after() -> None:
+    """A short Retry-After is slept exactly; a long one is not waited for."""
+    sleeps: list[float] = []
+    async with _client([429, 200], sleeps, {"Retry-After": "2"}) as client:
+        assert (await client.get("https://up.test/")).status_code == 200
+    assert sleeps == [2.0]
+
+    sleeps.clear()
+    async with _client([429, 200], sleeps, {"Retry-After": "3600"}) as client:
+        assert (await client.get("https://up.test/")).status_code == 429
+    assert sleeps == []
+
+
+def test_retry_after_http_date() -> None:
+    """Retry-After may be an HTTP date."""
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    resp = httpx.Response(429, headers={"Retry-After": when.strftime("%a, %d %b %Y %H:%M:%S GMT")})
+    assert 25 <= resilience.retry_after(resp) <= 30
+
+
+@pytest.mark.anyio
+async def test_breaker_opens_and_fails_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    """After repeated failures no request reaches the upstream until reset."""
+    monkeypatch.setattr(resilience.settings, "outbound_breaker_failures", 2)
+    sent: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.url.host)
+        return httpx.Response(500)
+
+    transport = RetryTransport(httpx.MockTransport(handler), retries=0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get("https://down.test/")
+        await client.get("https://down.test/")
+        with pytest.raises(CircuitOpen):
+            await client.get("https://down.test/")
+
+    assert sent == ["down.test", "down.test"]
+    assert resilience.breaker_snapshot() == {"down.test": "open"}
+
+
+def test_half_open_admits_one_probe() -> None:
+    """Once the reset timeout passes, one probe decides the state."""
+    breaker = CircuitBreaker("down.test", failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+
+    breaker.before_request()
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.anyio
+async def test_unexpected_error_releases_the_probe() -> None:
+    """A probe failing with a non-transport error lets the next one through."""
+    breaker = resilience.breaker_for("down.test")
+    breaker.reset_timeout = 0.0
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise RuntimeError("bug in a lower transport")
+
+    transport = RetryTransport(httpx.MockTransport(handler), retries=0)
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(RuntimeError):
+            await client.get("https://down.test/")
+
+    breaker.before_request()
+    assert breaker.state == "half-open"
+
+
+@pytest.mark.anyio
+async def test_open_circuit_serves_stale_stats(_setup_db) -> None:
+    """With the breaker open, the cache service returns stale data."""
+    await IntegrationCache(
+        service="devto",
+        lookup_key="ada",
+        stats_json=json.dumps({"total_articles": 3}),
+        fetched_at=datetime.now(timezone.utc) - timedelta(days=2),
+    ).save().run()
+
+    async def _fetcher(**kwargs: object) -> dict:
+        raise ExceptionGroup("pages", [CircuitOpen("dev.to")])
+
+    result = await get_cached_stats("devto", "ada", _fetcher)
+    assert result == {"total_articles": 3}
@@ -0,0 +1,69 @@
+"""Tests for request timing spans and the Server-Timing header."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+from httpx import AsyncClient
+
+from mandev_api import timing
+from mandev_api.tables import User, UserProfile
+from mandev_api.timing import Span, format_tree, server_timing, span
+
+
+def test_span_outside_a_request_records_nothing() -> None:
+    """Without a root span, instrumentation is a no-op."""
+    with span("db") as current:
+        assert current is None
+    assert timing.current_span() is None
+
+
+@pytest.mark.anyio
+async def test_parallel_spans_nest_under_their_parent() -> None:
+    """Spans opened in gathered tasks attach to the span that started them."""
+    root = Span("request")
+    token = timing._current.set(root)
+    try:
+        with span("load"):
+
+            async def _work(name: str) -> None:
+                with span(name):
+                    with span("db"):
+                        await asyncio.sleep(0)
+
+            await asyncio.gather(_work("integration.npm"), _work("integration.pypi"))
+    finally:
+        timing._current.reset(token)
+    root.end = root.start + 0.05
+
+    (load,) = root.children
+    assert {child.name for child in load.children} == {"integration.npm", "integration.pypi"}
+    header = server_timing(root)
+    assert header.startswith("load;dur=")
+    assert 'db;dur=' in header and 'desc="2x"' in header
+    assert header.endswith("total;dur=50.0")
+    assert format_tree(root).splitlines()[2].startswith("    integration.")
+
+
+@pytest.mark.anyio
+async def test_profile_response_has_server_timing(
+    client: AsyncClient,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The public profile reports its phases and slow requests are logged."""
+    monkeypatch.setattr(timing.settings, "slow_request_ms", 0.001)
+    user = User(email="ada@example.com", username="ada", password_hash="x")
+    await user.save().run()
+    await UserProfile(user_id=user.id, config_json='{"profile": {"name": "Ada"}}').save().run()
+
+    with caplog.at_level(logging.WARNING, logger="mandev_api.timing"):
+        resp = await client.get("/api/profile/ada")
+
+    assert resp.status_code == 200
+    names = {entry.split(";")[0] for entry in resp.headers["server-timing"].split(", ")}
+    assert {"user", "db", "view_write", "view_count", "serialize", "total"} <= names
+    assert "Slow request GET /api/profile/ada" in caplog.text
+    assert "db users objects" in caplog.text
@@ -0,0 +1,89 @@
+"""Tests for trace export of request spans."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from mandev_api import timing
+from mandev_api.integration_service import record_lookup
+from mandev_api.tables import User, UserProfile
+from mandev_api.tracing import KIND_SERVER, Tracer, file_exporter, start_tracing, to_otlp
+
+
+@pytest.fixture
+def tracer() -> Iterator[tuple[Tracer, list[dict]]]:
+    """Yield a listening tracer and the payloads it exports."""
+    payloads: list[dict] = []
+
+    async def _export(payload: dict) -> None:
+        payloads.append(payload)
+
+    tracer = Tracer(_export)
+    timing.add_listener(tracer.submit)
+    yield tracer, payloads
+    timing.remove_listener(tracer.submit)
+
+
+def _spans(payload: dict) -> list[dict]:
+    return payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+@pytest.mark.anyio
+async def test_request_is_exported_as_a_trace(
+    client: AsyncClient, tracer: tuple[Tracer, list[dict]]
+) -> None:
+    """The request and its queries become one trace with parent links."""
+    user = User(email="ada@example.com", username="ada", password_hash="x")
+    await user.save().run()
+    await UserProfile(user_id=user.id, config_json="{}").save().run()
+
+    resp = await client.get("/api/profile/ada")
+    assert resp.status_code == 200
+    await tracer[0].flush()
+
+    (payload,) = tracer[1]
+    spans = _spans(payload)
+    (root,) = [s for s in spans if "parentSpanId" not in s]
+    assert root["name"] == "GET /api/profile/{username}"
+    assert root["kind"] == KIND_SERVER
+    assert {s["traceId"] for s in spans} == {root["traceId"]}
+    queries = [s for s in spans if s["name"] == "db"]
+    assert queries and all(int(s["endTimeUnixNano"]) >= int(s["startTimeUnixNano"]) for s in queries)
+    tables = {
+        a["value"]["stringValue"] for s in queries for a in s["attributes"] if a["key"] == "db.table"
+    }
+    assert {"users", "user_profiles", "profile_views"} <= tables
+
+
+def test_cache_decisions_become_span_events(tmp_path: Path) -> None:
+    """Lookup results are events, and the file exporter writes JSON lines."""
+    root = timing.Span("request", "GET /", {"http.method": "GET"})
+    token = timing._current.set(root)
+    try:
+        with timing.span("integration.npm"):
+            record_lookup("npm", "stale")
+    finally:
+        timing._current.reset(token)
+    root.end = root.start + 0.01
+
+    spans = _spans(to_otlp([root]))
+    (npm,) = [s for s in spans if s["name"] == "integration.npm"]
+    (event,) = npm["events"]
+    assert event["name"] == "cache"
+    assert {"key": "result", "value": {"stringValue": "stale"}} in event["attributes"]
+
+    path = tmp_path / "traces.jsonl"
+    asyncio.run(file_exporter(path)(to_otlp([root])))
+    assert json.loads(path.read_text())["resourceSpans"]
+
+
+def test_disabled_tracing_registers_nothing() -> None:
+    """Without an exporter configured, no listener is installed."""
+    assert start_tracing() is None
+    assert timing._listeners == []
@@ -0,0 +1,82 @@
+"""Tests for the cache TTL policy."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.table import create_db_tables, drop_db_tables
+
+from mandev_api import ttl_policy
+from mandev_api.tables import ProfileView
+from mandev_api.ttl_policy import (
+    DORMANT_FACTOR,
+    MAX_TTL_HOURS,
+    base_ttl,
+    popularity_factor,
+    popularity_factors,
+    ttl_hours,
+)
+
+
+@pytest.fixture
+async def _setup_db():
+    """Set up a temporary SQLite database for profile views."""
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    engine = SQLiteEngine(path=db_path)
+    original_engine = ProfileView._meta._db
+    ProfileView._meta._db = engine
+
+    try:
+        await create_db_tables(ProfileView, if_not_exists=True)
+        yield
+        await drop_db_tables(ProfileView)
+    finally:
+        ProfileView._meta._db = original_engine
+        os.unlink(db_path)
+
+
+def test_base_ttls_and_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Services have their own base TTL, which settings can override."""
+    assert base_ttl("github") < base_ttl("pypi_downloads")
+    assert base_ttl("unknown") == ttl_policy.DEFAULT_TTL_HOURS
+
+    monkeypatch.setattr(ttl_policy.settings, "cache_ttl_hours", {"github": 2})
+    assert base_ttl("github") == 2
+    assert ttl_hours("github", 0.5) == 1
+
+
+def test_scaled_ttls_are_clamped() -> None:
+    """Scaling never goes below the floor or above the ceiling."""
+    assert ttl_hours("github", 0.01) == ttl_policy.MIN_TTL_HOURS
+    assert ttl_hours("pypi_downloads", 100) == MAX_TTL_HOURS
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("_setup_db")
+async def test_popularity_from_recent_views() -> None:
+    """Recent views shorten TTLs; old views count as dormant."""
+    today = date.today()
+    long_ago = (today - timedelta(days=ttl_policy.POPULARITY_WINDOW_DAYS)).isoformat()
+    await ProfileView.insert(
+        ProfileView(username="star", date=today.isoformat(), count=60),
+        ProfileView(username="quiet", date=today.isoformat(), count=3),
+        ProfileView(username="old", date=long_ago, count=1000),
+    ).run()
+
+    factors = await popularity_factors(["star", "quiet", "old", "nobody"])
+
+    assert factors == {"star": 0.5, "quiet": 1.0, "old": DORMANT_FACTOR, "nobody": DORMANT_FACTOR}
+    assert await popularity_factor("star") == 0.5
+
+
+@pytest.mark.anyio
+async def test_popularity_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With the popularity policy off every profile gets base TTLs."""
+    monkeypatch.setattr(ttl_policy.settings, "ttl_popularity", False)
+    assert await popularity_factors(["ada"]) == {"ada": 1.0}
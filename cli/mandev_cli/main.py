@@ -8,21 +8,29 @@ from __future__ import annotations
 
 import difflib
 import json
+import os
 import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import httpx
 import typer
 from pydantic import ValidationError as PydanticValidationError
 from rich.console import Console
+from rich.markup import escape
 
-from mandev_core import MandevConfig, load_config
+from mandev_core import MandevConfig, find_config_files, load_config, parse_config_file
+from mandev_core.parser import CONFIG_FILENAMES
 
 from mandev_cli.config import API_BASE_URL, AUTH_FILE
 
 app = typer.Typer(help="man.dev CLI -- your manual, as a developer.")
 console = Console()
 
+# Files handed to a validation worker at a time
+_VALIDATE_CHUNK = 16
+
 # ---------------------------------------------------------------------------
 # Template for new .mandev.toml files
 # ---------------------------------------------------------------------------
@@ -213,22 +221,127 @@ def preview() -> None:
         console.print()
 
 
-@app.command()
-def validate() -> None:
-    """Validate the local config file against the schema."""
+def _error_lines(exc: PydanticValidationError) -> list[str]:
+    """Format validation errors as ``loc: message`` lines."""
+    return [
+        f"{' -> '.join(str(l) for l in error['loc'])}: {error['msg']}" for error in exc.errors()
+    ]
+
+
+def _validate_file(path: str) -> dict:
+    """Validate one config file (in a worker process).
+
+    :returns: A result with ``path``, ``valid`` and ``errors``.
+    """
     try:
-        load_config(Path.cwd())
-    except FileNotFoundError as exc:
-        console.print(f"[red]{exc}[/red]")
-        raise typer.Exit(code=1)
+        parse_config_file(Path(path))
     except PydanticValidationError as exc:
-        console.print("[red]Validation failed:[/red]")
-        for error in exc.errors():
-            loc = " -> ".join(str(l) for l in error["loc"])
-            console.print(f"  {loc}: {error['msg']}")
-        raise typer.Exit(code=1)
+        return {"path": path, "valid": False, "errors": _error_lines(exc)}
+    except Exception as exc:  # unreadable file or TOML/YAML syntax error
+        message = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+        return {"path": path, "valid": False, "errors": [message]}
+    return {"path": path, "valid": True, "errors": []}
+
+
+def _validate_chunk(paths: list[str]) -> list[dict]:
+    return [_validate_file(path) for path in paths]
+
+
+def _iter_results(files: list[str], jobs: int) -> Iterator[dict]:
+    """Validate *files* across *jobs* processes, yielding results as they finish."""
+    if jobs <= 1 or len(files) <= _VALIDATE_CHUNK:
+        yield from map(_validate_file, files)
+        return
+    chunks = [files[i : i + _VALIDATE_CHUNK] for i in range(0, len(files), _VALIDATE_CHUNK)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for future in as_completed([pool.submit(_validate_chunk, chunk) for chunk in chunks]):
+            yield from future.result()
+
+
+def _config_targets(paths: list[Path], recursive: bool) -> tuple[list[str], list[str]]:
+    """Resolve command-line paths to config files.
 
-    console.print("[green]Config is valid.[/green]")
+    :returns: The files to validate and error messages for paths that
+        hold none.
+    """
+    files: list[str] = []
+    missing: list[str] = []
+    for path in paths:
+        if path.is_file():
+            files.append(str(path))
+        elif recursive and path.is_dir():
+            found = [str(p) for p in find_config_files(path)]
+            if not found:
+                missing.append(f"No config files found under {path}")
+            files.extend(found)
+        else:
+            match = next((path / name for name in CONFIG_FILENAMES if (path / name).exists()), None)
+            if match is None:
+                missing.append(f"No config file found in {path}")
+            else:
+                files.append(str(match))
+    return files, missing
+
+
+@app.command()
+def validate(
+    paths: list[Path] | None = typer.Argument(
+        None, help="Config files or directories. Defaults to the current directory."
+    ),
+    recursive: bool = typer.Option(
+        False, "--recursive", "-r", help="Validate every config file under the directories."
+    ),
+    json_lines: bool = typer.Option(False, "--json", help="Print one JSON object per file."),
+    jobs: int = typer.Option(
+        0, "--jobs", "-j", help="Worker processes (default: one per CPU)."
+    ),
+) -> None:
+    """Validate config files against the schema.
+
+    With no arguments, checks the config in the current directory.  With
+    paths (and ``--recursive`` to search directories), validates every
+    file across a process pool and prints each result as it completes;
+    exits with code 1 if any file is invalid.
+    """
+    if not paths and not recursive:
+        try:
+            load_config(Path.cwd())
+        except FileNotFoundError as exc:
+            console.print(f"[red]{exc}[/red]")
+            raise typer.Exit(code=1)
+        except PydanticValidationError as exc:
+            console.print("[red]Validation failed:[/red]")
+            for line in _error_lines(exc):
+                console.print(f"  {line}")
+            raise typer.Exit(code=1)
+
+        console.print("[green]Config is valid.[/green]")
+        return
+
+    files, missing = _config_targets(paths or [Path.cwd()], recursive)
+    failed = len(missing)
+    for message in missing:
+        if json_lines:
+            typer.echo(json.dumps({"path": None, "valid": False, "errors": [message]}))
+        else:
+            console.print(f"[red]{escape(message)}[/red]")
+
+    for result in _iter_results(files, jobs or os.cpu_count() or 1):
+        if json_lines:
+            typer.echo(json.dumps(result))
+        elif result["valid"]:
+            console.print(f"[green]ok[/green]      {escape(result['path'])}")
+        else:
+            console.print(f"[red]invalid[/red] {escape(result['path'])}")
+            for line in result["errors"]:
+                console.print(f"          {escape(line)}")
+        failed += not result["valid"]
+
+    if not json_lines:
+        colour = "red" if failed else "green"
+        console.print(f"[{colour}]{len(files)} file(s) checked, {failed} problem(s).[/{colour}]")
+    if failed:
+        raise typer.Exit(code=1)
 
 
 @app.command("export-json")
@@ -0,0 +1,11 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_parse_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep parse cache entries out of the real home directory."""
+    monkeypatch.setenv("MANDEV_CACHE_DIR", str(tmp_path / "cache"))
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from typer.testing import CliRunner
@@ -80,3 +81,46 @@ def test_validate_fails_on_invalid_config(tmp_path: Path, monkeypatch: object) -
 
     result = runner.invoke(app, ["validate"])
     assert result.exit_code == 1
+
+
+def _config_tree(root: Path) -> None:
+    """Lay out repositories with valid, invalid and unparsable configs."""
+    for i in range(20):
+        repo = root / "services" / f"svc-{i}"
+        repo.mkdir(parents=True)
+        (repo / ".mandev.toml").write_text(_VALID_CONFIG)
+    (root / "broken").mkdir()
+    (root / "broken" / ".mandev.toml").write_text(_INVALID_CONFIG)
+    (root / "web").mkdir()
+    (root / "web" / ".mandev.yaml").write_text("profile: [unclosed\n")
+    (root / "web" / "node_modules" / "dep").mkdir(parents=True)
+    (root / "web" / "node_modules" / "dep" / ".mandev.toml").write_text(_INVALID_CONFIG)
+
+
+def test_validate_recursive_streams_json_lines(tmp_path: Path) -> None:
+    """Every config under the tree is checked across worker processes."""
+    _config_tree(tmp_path)
+
+    result = runner.invoke(app, ["validate", "--recursive", "--json", "-j", "2", str(tmp_path)])
+
+    assert result.exit_code == 1
+    results = {Path(r["path"]).parent.name: r for r in map(json.loads, result.output.splitlines())}
+    assert len(results) == 22
+    assert "dep" not in results
+    assert all(results[f"svc-{i}"]["valid"] for i in range(20))
+    assert not results["broken"]["valid"] and results["broken"]["errors"]
+    assert not results["web"]["valid"]
+
+
+def test_validate_paths_without_recursion(tmp_path: Path) -> None:
+    """Directories resolve to their config file; a clean run exits 0."""
+    _config_tree(tmp_path)
+    repos = [str(tmp_path / "services" / f"svc-{i}") for i in range(3)]
+
+    result = runner.invoke(app, ["validate", *repos])
+    assert result.exit_code == 0
+    assert "3 file(s) checked, 0 problem(s)" in result.output
+
+    result = runner.invoke(app, ["validate", str(tmp_path)])
+    assert result.exit_code == 1
+    assert "No config file found" in result.output
@@ -0,0 +1,162 @@
+"""Microbenchmarks for the mandev_core models and config parser.
+
+Times config validation and dumping, ``parse_toml`` / ``parse_yaml``,
+``load_config`` served from the parse cache, raw YAML loading with
+libyaml and with the pure-Python loader, and ``GitHubStats``
+construction and dumping over the small, typical
+and huge fixtures from :mod:`fixtures`.  Each benchmark runs in batches
+of at least 0.2s; the best of ``--repeat`` batches is reported per call.
+
+Results are compared with ``baseline.json`` next to this script and the
+run fails if any benchmark is more than ``--tolerance`` slower.  After
+an intended change (or on new hardware), record a new baseline with
+``--save``; baselines are only comparable on the machine that wrote
+them.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# sys.path setup -- this script lives outside the installable packages, so we
+# need to make ``mandev_core`` importable.
+# ---------------------------------------------------------------------------
+_repo_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_repo_root / "core"))
+
+
+import pydantic  # noqa: E402
+import yaml  # noqa: E402
+
+from fixtures import SIZES, make_config, make_stats, write_configs  # noqa: E402
+from mandev_core import GitHubStats, MandevConfig  # noqa: E402
+from mandev_core.parser import SafeLoader, load_config, parse_toml, parse_yaml  # noqa: E402
+
+BASELINE = Path(__file__).with_name("baseline.json")
+MIN_BATCH_SECONDS = 0.2
+
+
+def _benchmarks(directory: Path) -> dict[str, Callable[[], object]]:
+    """Build every benchmark, named ``<operation>/<size>``."""
+    paths = write_configs(directory)
+    benchmarks: dict[str, Callable[[], object]] = {}
+    for size in SIZES:
+        data = make_config(size)
+        config = MandevConfig.model_validate(data)
+        benchmarks[f"config_validate/{size}"] = lambda data=data: MandevConfig.model_validate(data)
+        benchmarks[f"config_dump/{size}"] = config.model_dump
+        benchmarks[f"config_dump_json/{size}"] = config.model_dump_json
+        benchmarks[f"parse_toml/{size}"] = lambda path=paths[size, "toml"]: parse_toml(path)
+        benchmarks[f"parse_yaml/{size}"] = lambda path=paths[size, "yaml"]: parse_yaml(path)
+        # Both files share a directory and .mandev.toml wins, so this is a TOML hit
+        load_config(paths[size, "toml"].parent)
+        benchmarks[f"load_config_cached/{size}"] = (
+            lambda directory=paths[size, "toml"].parent: load_config(directory)
+        )
+    for size in ("typical", "huge"):
+        text = paths[size, "yaml"].read_bytes()
+        benchmarks[f"yaml_load/{size}"] = lambda text=text: yaml.load(text, Loader=SafeLoader)
+        benchmarks[f"yaml_load_pure/{size}"] = (
+            lambda text=text: yaml.load(text, Loader=yaml.SafeLoader)
+        )
+    for size in ("typical", "huge"):
+        data = make_stats(size)
+        stats = GitHubStats(**data)
+        benchmarks[f"stats_construct/{size}"] = lambda data=data: GitHubStats(**data)
+        benchmarks[f"stats_dump/{size}"] = stats.model_dump
+    return benchmarks
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best per-call time of *func*, in seconds."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < MIN_BATCH_SECONDS:
+        number = max(1, int(number * MIN_BATCH_SECONDS / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds * 1e6:9.2f} us"
+
+
+def main() -> None:
+    """Run the benchmarks and compare with (or save) the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="Only run names containing this.")
+    parser.add_argument("--repeat", type=int, default=5, help="Batches per benchmark.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against the baseline (0.25 = 25%%).",
+    )
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE.read_text())["results"] if BASELINE.exists() else {}
+    results: dict[str, float] = {}
+    regressions: list[str] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["MANDEV_CACHE_DIR"] = str(Path(tmp) / "cache")
+        os.environ.pop("MANDEV_NO_PARSE_CACHE", None)
+        for name, func in _benchmarks(Path(tmp)).items():
+            if args.filter not in name:
+                continue
+            seconds = results[name] = measure(func, args.repeat)
+            if args.json:
+                continue
+            line = f"{name:<28}{_format_seconds(seconds)}"
+            if name in baseline:
+                ratio = seconds / baseline[name]
+                line += f"  {ratio:5.2f}x baseline"
+                if ratio > 1 + args.tolerance:
+                    line += "  SLOWER"
+                    regressions.append(name)
+            print(line)
+
+    if args.json:
+        regressions = [
+            name
+            for name, seconds in results.items()
+            if name in baseline and seconds / baseline[name] > 1 + args.tolerance
+        ]
+        print(json.dumps({"results": results, "regressions": regressions}))
+
+    if args.save:
+        merged = {**baseline, **results}
+        BASELINE.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "pydantic": pydantic.VERSION,
+                    "machine": platform.machine(),
+                    "results": dict(sorted(merged.items())),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Saved {len(results)} results to {BASELINE.name}", file=sys.stderr)
+    elif regressions:
+        print(
+            f"{len(regressions)} benchmark(s) more than {args.tolerance:.0%} slower "
+            "than the baseline",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Synthetic configs and GitHub stats for the core benchmarks.
+
+Three sizes are generated deterministically:
+
+* ``small`` -- a profile and nothing else;
+* ``typical`` -- a filled-in profile with a handful of entries per
+  section and the common integrations;
+* ``huge`` -- hundreds of skills, projects, experience entries and
+  links, every integration and a long PyPI package list.
+
+Stats follow the same naming: ``typical`` has one trailing year of
+contribution days, ``huge`` ten.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+SIZES = ("small", "typical", "huge")
+
+_COUNTS = {
+    # skills, projects, experience, links, pypi packages
+    "small": (0, 0, 0, 0, 0),
+    "typical": (12, 6, 3, 5, 3),
+    "huge": (400, 300, 150, 150, 200),
+}
+_LEVELS = ("beginner", "intermediate", "advanced", "expert")
+_LANGUAGES = ("Python", "TypeScript", "Rust", "Go", "Shell", "C", "Haskell", "Zig", "Lua", "SQL")
+
+
+def make_config(size: str) -> dict[str, Any]:
+    """Return the raw (unvalidated) config data for *size*."""
+    rng = random.Random(size)
+    skills, projects, experience, links, packages = _COUNTS[size]
+    data: dict[str, Any] = {
+        "profile": {
+            "name": "Ada Lovelace",
+            "tagline": "Analytical engine whisperer",
+            "about": "Pioneering algorithms since 1843. " * (1 if size == "small" else 8),
+        },
+    }
+    if size == "small":
+        return data
+
+    data["theme"] = {"scheme": "dracula", "font": "JetBrains Mono", "mode": "dark"}
+    data["layout"] = {"sections": ["bio", "skills", "projects", "experience", "links"]}
+    data["skills"] = [
+        {"name": f"Skill {i}", "level": rng.choice(_LEVELS), "domain": rng.choice(_LANGUAGES)}
+        for i in range(skills)
+    ]
+    data["projects"] = [
+        {
+            "name": f"project-{i}",
+            "repo": f"https://github.com/ada/project-{i}",
+            "description": f"Project number {i}, described in a sentence or two.",
+        }
+        for i in range(projects)
+    ]
+    data["experience"] = [
+        {
+            "role": "Engineer",
+            "company": f"Company {i}",
+            "start": f"{2000 + i % 25}-01",
+            "end": f"{2001 + i % 25}-06",
+            "description": "Built and ran things.",
+        }
+        for i in range(experience)
+    ]
+    data["links"] = [
+        {"label": f"Link {i}", "url": f"https://example.com/{i}", "icon": "link"}
+        for i in range(links)
+    ]
+    data["github"] = {"username": "ada"}
+    data["npm"] = {"username": "ada"}
+    data["pypi"] = {"packages": [f"package-{i}" for i in range(packages)]}
+    if size == "huge":
+        data["devto"] = {"username": "ada"}
+        data["hashnode"] = {"username": "ada"}
+    return data
+
+
+def make_stats(size: str) -> dict[str, Any]:
+    """Return ``GitHubStats`` data with one (or, for ``huge``, ten) years of days."""
+    rng = random.Random(size)
+    days = 3650 if size == "huge" else 365
+    first = date(2026, 1, 1) - timedelta(days=days)
+    return {
+        "total_stars": 1234,
+        "total_repos": 87,
+        "followers": 456,
+        "total_contributions": 3000,
+        "current_streak": 4,
+        "longest_streak": 40,
+        "languages": [
+            {"name": name, "percentage": 10.0, "color": "#3572A5"} for name in _LANGUAGES
+        ],
+        "pinned_repos": [
+            {
+                "name": f"repo-{i}",
+                "description": "A pinned repository",
+                "stars": rng.randint(0, 5000),
+                "forks": rng.randint(0, 500),
+                "language": "Python",
+                "language_color": "#3572A5",
+                "url": f"https://github.com/ada/repo-{i}",
+            }
+            for i in range(6)
+        ],
+        "contributions": [
+            {"date": (first + timedelta(days=i)).isoformat(), "count": rng.choice((0, 0, 1, 3, 8))}
+            for i in range(days)
+        ],
+        "fetched_at": "2026-01-01T00:00:00+00:00",
+        "contribution_years": list(range(first.year, 2026)),
+    }
+
+
+def _toml_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, list):
+        return "[" + ", ".join(_toml_value(item) for item in value) + "]"
+    return json.dumps(value)
+
+
+def to_toml(data: dict[str, Any]) -> str:
+    """Render config data as TOML (tables and arrays of tables only)."""
+    lines: list[str] = []
+    for key, value in data.items():
+        if isinstance(value, dict):
+            lines.append(f"[{key}]")
+            lines.extend(f"{k} = {_toml_value(v)}" for k, v in value.items())
+            lines.append("")
+        else:
+            for item in value:
+                lines.append(f"[[{key}]]")
+                lines.extend(f"{k} = {_toml_value(v)}" for k, v in item.items())
+                lines.append("")
+    return "\n".join(lines)
+
+
+def write_configs(directory: Path) -> dict[tuple[str, str], Path]:
+    """Write every size as ``.mandev.toml`` and ``.mandev.yaml`` under *directory*.
+
+    :returns: Paths keyed by ``(size, format)``.
+    """
+    paths: dict[tuple[str, str], Path] = {}
+    for size in SIZES:
+        data = make_config(size)
+        target = directory / size
+        target.mkdir(parents=True, exist_ok=True)
+        paths[size, "toml"] = target / ".mandev.toml"
+        paths[size, "toml"].write_text(to_toml(data))
+        paths[size, "yaml"] = target / ".mandev.yaml"
+        paths[size, "yaml"].write_text(yaml.safe_dump(data, sort_keys=False))
+    return paths
@@ -31,7 +31,13 @@ from mandev_core.models import (
     Skill,
     Theme,
 )
-from mandev_core.parser import load_config, parse_toml, parse_yaml
+from mandev_core.parser import (
+    find_config_files,
+    load_config,
+    parse_config_file,
+    parse_toml,
+    parse_yaml,
+)
 
 __all__ = [
     "ContributionDay",
@@ -59,7 +65,9 @@ __all__ = [
     "PyPIStats",
     "Skill",
     "Theme",
+    "find_config_files",
     "load_config",
+    "parse_config_file",
     "parse_toml",
     "parse_yaml",
 ]
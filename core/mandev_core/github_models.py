@@ -69,6 +69,10 @@ class GitHubStats(BaseModel):
     :param pinned_repos: User's pinned repositories.
     :param contributions: Daily contribution history.
     :param fetched_at: ISO-8601 timestamp of when these stats were fetched.
+    :param contribution_years: Years in which the user has contributions.
+    :param lifetime_contributions: Contribution count across all archived
+        years plus the trailing calendar, if the archive is available.
+    :param lifetime_longest_streak: Longest streak across the same span.
     """
 
     total_stars: int
@@ -81,3 +85,6 @@ class GitHubStats(BaseModel):
     pinned_repos: list[GitHubRepo]
     contributions: list[ContributionDay | dict]
     fetched_at: str
+    contribution_years: list[int] = []
+    lifetime_contributions: int | None = None
+    lifetime_longest_streak: int | None = None
@@ -96,9 +96,14 @@ class HashnodeArticle(BaseModel):
 
 
 class HashnodeStats(BaseModel):
-    """Aggregated Hashnode statistics for a user."""
+    """Aggregated Hashnode statistics for a user.
+
+    ``full_crawl_at`` records when every post was last walked; refreshes
+    in between only add posts published since ``fetched_at``.
+    """
 
     total_articles: int
     total_reactions: int
     articles: list[HashnodeArticle]
     fetched_at: str
+    full_crawl_at: str | None = None
@@ -0,0 +1,114 @@
+"""On-disk cache of validated config files.
+
+Parsing TOML or YAML and validating the result is most of what a CLI
+command does locally, and scripts often run several commands over the
+same file.  :func:`cached_parse` stores each validated config as
+canonical JSON under ``~/.cache/mandev/parse`` (or
+``$XDG_CACHE_HOME/mandev/parse``, or ``$MANDEV_CACHE_DIR/parse``), one
+entry per resolved path.  An entry is reused only if the file's mtime,
+size and SHA-256 all match, and it was written against the same models
+(a fingerprint of ``models.py`` and the pydantic version); a hit then
+costs one read, one hash and :meth:`~pydantic.BaseModel.model_validate_json`.
+
+Set ``MANDEV_NO_PARSE_CACHE=1`` to bypass the cache.  Failures to read
+or write entries are ignored: the cache can only make parsing faster,
+never fail it.  Invalid configs are never cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+
+import pydantic
+
+from mandev_core import models
+from mandev_core.models import MandevConfig
+
+CACHE_DIR_ENV = "MANDEV_CACHE_DIR"
+DISABLE_ENV = "MANDEV_NO_PARSE_CACHE"
+
+
+def cache_dir() -> Path | None:
+    """Return the parse cache directory, or ``None`` if caching is disabled."""
+    if os.environ.get(DISABLE_ENV):
+        return None
+    base = os.environ.get(CACHE_DIR_ENV)
+    if base is None:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = str(Path(xdg) / "mandev" if xdg else Path.home() / ".cache" / "mandev")
+    return Path(base) / "parse"
+
+
+@lru_cache(maxsize=1)
+def _models_fingerprint() -> str:
+    """Identify the schema entries were validated against."""
+    digest = hashlib.sha256(Path(models.__file__).read_bytes())
+    digest.update(pydantic.VERSION.encode())
+    return digest.hexdigest()[:16]
+
+
+def _read_entry(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_entry(path: Path, entry: dict) -> None:
+    """Write *entry* atomically, so concurrent readers never see half of it."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+
+def cached_parse(path: Path, parse: Callable[[Path], MandevConfig]) -> MandevConfig:
+    """Return the config in *path*, from the cache when the file is unchanged.
+
+    :param path: Config file to load.
+    :param parse: Parser used on a miss (:func:`~mandev_core.parser.parse_toml`
+        or :func:`~mandev_core.parser.parse_yaml`).
+    :returns: The validated config.
+    :raises FileNotFoundError: If the file does not exist.
+    :raises pydantic.ValidationError: If the config is invalid.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return parse(path)
+
+    resolved = path.resolve()
+    stat = resolved.stat()
+    key = {
+        "path": str(resolved),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": hashlib.sha256(resolved.read_bytes()).hexdigest(),
+        "models": _models_fingerprint(),
+    }
+    entry_path = directory / f"{hashlib.sha256(key['path'].encode()).hexdigest()[:32]}.json"
+
+    entry = _read_entry(entry_path)
+    if entry is not None and entry.get("key") == key:
+        try:
+            return MandevConfig.model_validate_json(entry["config"])
+        except (KeyError, TypeError, pydantic.ValidationError):
+            pass
+
+    config = parse(path)
+    # Only explicitly set fields, so a hit has the same ``model_fields_set``
+    _write_entry(entry_path, {"key": key, "config": config.model_dump_json(exclude_unset=True)})
+    return config
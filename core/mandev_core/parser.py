@@ -1,19 +1,34 @@
 """Config file parser for mandev.
 
 Supports auto-detection of ``.mandev.toml`` and ``.mandev.yaml`` files.
+:func:`load_config` goes through the on-disk parse cache
+(:mod:`mandev_core.parse_cache`).
 """
 
 from __future__ import annotations
 
+import os
 import tomllib
+from collections.abc import Iterator
 from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader  # type: ignore[assignment]
+
 from mandev_core.models import MandevConfig
+from mandev_core.parse_cache import cached_parse
 
 CONFIG_FILENAMES = [".mandev.toml", ".mandev.yaml", ".mandev.yml"]
 
+# Directories never searched by find_config_files
+SKIP_DIRS = frozenset(
+    {".git", ".hg", ".svn", "node_modules", ".venv", "venv", "__pycache__", ".tox", ".mypy_cache"}
+)
+
 
 def parse_toml(path: Path) -> MandevConfig:
     """Parse a TOML config file into a :class:`MandevConfig`.
@@ -31,21 +46,66 @@ def parse_toml(path: Path) -> MandevConfig:
 def parse_yaml(path: Path) -> MandevConfig:
     """Parse a YAML config file into a :class:`MandevConfig`.
 
+    Uses libyaml's ``CSafeLoader`` when PyYAML was built with it, which
+    is several times faster than the pure-Python ``SafeLoader`` and
+    resolves the same types.
+
     :param path: Path to the YAML file.
     :returns: Parsed config.
     :raises FileNotFoundError: If the file does not exist.
     :raises pydantic.ValidationError: If the config is invalid.
     """
-    with open(path) as f:
-        data = yaml.safe_load(f)
+    with open(path, "rb") as f:
+        data = yaml.load(f, Loader=SafeLoader)
     return MandevConfig.model_validate(data)
 
 
+def parse_config_file(path: Path) -> MandevConfig:
+    """Parse one config file, picking the parser from its suffix.
+
+    Goes through the on-disk parse cache.
+
+    :param path: Path to a ``.toml``, ``.yaml`` or ``.yml`` file.
+    :returns: Parsed config.
+    :raises FileNotFoundError: If the file does not exist.
+    :raises pydantic.ValidationError: If the config is invalid.
+    """
+    parse = parse_toml if path.suffix == ".toml" else parse_yaml
+    return cached_parse(path, parse)
+
+
+def find_config_files(root: Path) -> Iterator[Path]:
+    """Yield every config file under *root*, depth first.
+
+    Uses :func:`os.scandir`, so only one ``stat`` is needed per entry on
+    most platforms.  Symlinked directories and :data:`SKIP_DIRS` are not
+    descended into.
+
+    :param root: Directory to search.
+    """
+    stack = [os.fspath(root)]
+    names = frozenset(CONFIG_FILENAMES)
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            if entry.name in names and entry.is_file():
+                yield Path(entry.path)
+            elif entry.name not in SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+        stack.extend(sorted(subdirectories, reverse=True))
+
+
 def load_config(directory: Path) -> MandevConfig:
     """Auto-detect and load a config file from *directory*.
 
     Looks for ``.mandev.toml``, ``.mandev.yaml``, or ``.mandev.yml``
-    (in that order). Returns the first match.
+    (in that order). Returns the first match, reusing the cached
+    result if the file has not changed since it was last loaded.
 
     :param directory: Directory to search in.
     :returns: Parsed config.
@@ -54,9 +114,7 @@ def load_config(directory: Path) -> MandevConfig:
     for filename in CONFIG_FILENAMES:
         path = directory / filename
         if path.exists():
-            if path.suffix == ".toml":
-                return parse_toml(path)
-            return parse_yaml(path)
+            return parse_config_file(path)
     raise FileNotFoundError(
         f"No config file found in {directory}. "
         f"Expected one of: {', '.join(CONFIG_FILENAMES)}"
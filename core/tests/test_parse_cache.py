@@ -0,0 +1,78 @@
+"""Tests for mandev_core.parse_cache."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mandev_core.models import MandevConfig
+from mandev_core.parse_cache import cache_dir, cached_parse
+from mandev_core.parser import load_config, parse_toml
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """A directory holding a copy of the valid TOML fixture."""
+    directory = tmp_path / "project"
+    directory.mkdir()
+    shutil.copy(FIXTURES / "valid.toml", directory / ".mandev.toml")
+    return directory
+
+
+def _counting_parse(calls: list[Path]):
+    def parse(path: Path) -> MandevConfig:
+        calls.append(path)
+        return parse_toml(path)
+
+    return parse
+
+
+def test_unchanged_file_is_served_from_cache(project: Path) -> None:
+    """The second load skips the parser and returns an equal config."""
+    calls: list[Path] = []
+    path = project / ".mandev.toml"
+
+    first = cached_parse(path, _counting_parse(calls))
+    second = cached_parse(path, _counting_parse(calls))
+
+    assert len(calls) == 1
+    assert second == first
+    assert second.model_fields_set == first.model_fields_set
+    assert len(list(cache_dir().glob("*.json"))) == 1
+
+
+def test_edits_invalidate_the_entry(project: Path) -> None:
+    """A same-size edit with the old mtime is still caught by the hash."""
+    calls: list[Path] = []
+    path = project / ".mandev.toml"
+    cached_parse(path, _counting_parse(calls))
+
+    stat = path.stat()
+    path.write_text(path.read_text().replace("Ada Lovelace", "Ada Lovelacf"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    config = cached_parse(path, _counting_parse(calls))
+    assert len(calls) == 2
+    assert config.profile.name == "Ada Lovelacf"
+
+
+def test_corrupt_entries_and_disabled_cache(
+    project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Broken entries are reparsed; the cache can be switched off."""
+    load_config(project)
+    (entry,) = cache_dir().glob("*.json")
+    entry.write_text("{not json")
+    assert load_config(project).profile.name == "Ada Lovelace"
+
+    monkeypatch.setenv("MANDEV_NO_PARSE_CACHE", "1")
+    assert cache_dir() is None
+    calls: list[Path] = []
+    cached_parse(project / ".mandev.toml", _counting_parse(calls))
+    cached_parse(project / ".mandev.toml", _counting_parse(calls))
+    assert len(calls) == 2
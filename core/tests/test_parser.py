@@ -6,8 +6,10 @@ import shutil
 from pathlib import Path
 
 import pytest
+import yaml
 from pydantic import ValidationError
 
+from mandev_core import parser
 from mandev_core.parser import load_config, parse_toml, parse_yaml
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -64,6 +66,21 @@ class TestParseYaml:
         assert len(cfg.experience) == 1
         assert len(cfg.links) == 1
 
+    def test_loaders_agree(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The libyaml loader and the pure-Python fallback resolve the same values."""
+        document = tmp_path / "tricky.yaml"
+        document.write_text(
+            "a: yes\nb: 0o17\nc: 012\nd: 1_000\ne: 2024-01-01\nf: .inf\n"
+            "g: ~\nh: '\u00e9t\u00e9'\ni: [1, 2.5, '3']\nj: !!str 42\n",
+            encoding="utf-8",
+        )
+        fast = yaml.load(document.read_bytes(), Loader=parser.SafeLoader)
+        assert fast == yaml.load(document.read_bytes(), Loader=yaml.SafeLoader)
+
+        config = parse_yaml(FIXTURES / "valid.yaml")
+        monkeypatch.setattr(parser, "SafeLoader", yaml.SafeLoader)
+        assert parse_yaml(FIXTURES / "valid.yaml") == config
+
 
 # --- load_config ---
 
@@ -0,0 +1,56 @@
+"""Delete cache rows that no stored profile uses any more.
+
+Prints per-cache sizes before and after.  With ``--dry-run`` only
+reports what would be deleted.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# sys.path setup -- this script lives outside the installable packages, so we
+# need to make ``mandev_api`` and ``mandev_core`` importable.
+# ---------------------------------------------------------------------------
+_repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_repo_root / "api"))
+sys.path.insert(0, str(_repo_root / "core"))
+
+
+from mandev_api.cache_gc import cache_sizes, collect_garbage  # noqa: E402
+
+
+def _print_sizes(title: str, sizes: dict[str, dict[str, int]]) -> None:
+    """Print one table of per-cache sizes."""
+    print(title)
+    for name, size in sorted(sizes.items()):
+        print(f"  {name:<22} rows={size['rows']:<8} bytes={size['bytes']}")
+
+
+async def gc(dry_run: bool) -> None:
+    """Collect garbage and report sizes around it.
+
+    :param dry_run: Count the rows without deleting them.
+    """
+    _print_sizes("Before:", await cache_sizes())
+    result = await collect_garbage(dry_run=dry_run)
+    verb = "Would delete" if dry_run else "Deleted"
+    for name, count in sorted(result.deleted.items()):
+        print(f"{verb} {count} {name} rows")
+    if not dry_run:
+        _print_sizes("After:", await cache_sizes())
+
+
+def main() -> None:
+    """Parse arguments and run the collection."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report without deleting."
+    )
+    args = parser.parse_args()
+    asyncio.run(gc(args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
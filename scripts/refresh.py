@@ -0,0 +1,86 @@
+"""Warm the integration caches for every stored profile.
+
+Drives all registered integrations (or those named with ``--only``)
+through the same registry the profile endpoint uses, so stale entries
+are refetched ahead of the next page view.  Fresh entries are left
+alone; freshness follows the same popularity-scaled TTL policy.  Prints
+per-integration counters when done.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# sys.path setup -- this script lives outside the installable packages, so we
+# need to make ``mandev_api`` and ``mandev_core`` importable.
+# ---------------------------------------------------------------------------
+_repo_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_repo_root / "api"))
+sys.path.insert(0, str(_repo_root / "core"))
+
+
+from mandev_api.integrations import INTEGRATIONS, default_context  # noqa: E402
+from mandev_api.tables import User, UserProfile  # noqa: E402
+from mandev_api.ttl_policy import popularity_factors  # noqa: E402
+
+
+async def refresh(only: set[str] | None = None, concurrency: int = 8) -> None:
+    """Load stats for every profile's configured integrations.
+
+    :param only: Integration names to refresh, or ``None`` for all.
+    :param concurrency: Profiles processed at once.
+    """
+    integrations = [i for i in INTEGRATIONS if only is None or i.name in only]
+
+    profiles = await UserProfile.select(UserProfile.user_id, UserProfile.config_json).run()
+    users = await User.select(User.id, User.username, User.github_token).run()
+    tokens = {row["id"]: row["github_token"] for row in users}
+    names = {row["id"]: row["username"] for row in users}
+    factors = await popularity_factors(names.values())
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def _refresh_one(row: dict) -> None:
+        config = json.loads(row["config_json"]) if row["config_json"] else {}
+        context = default_context(
+            tokens.get(row["user_id"]),
+            factors.get(names.get(row["user_id"]), 1.0),
+        )
+        async with gate:
+            await asyncio.gather(
+                *(i.load(config.get(i.name), context) for i in integrations),
+                return_exceptions=True,
+            )
+
+    await asyncio.gather(*(_refresh_one(row) for row in profiles))
+
+    print(f"Refreshed {len(profiles)} profiles")
+    for integration in integrations:
+        m = integration.metrics
+        print(
+            f"  {integration.name:<10} loads={m.loads} errors={m.errors} "
+            f"seconds={m.seconds:.2f}"
+        )
+
+
+def main() -> None:
+    """Parse arguments and run the refresh."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=[i.name for i in INTEGRATIONS],
+        help="Refresh only this integration (repeatable).",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Profiles processed at once."
+    )
+    args = parser.parse_args()
+    asyncio.run(refresh(set(args.only) if args.only else None, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,22 @@
 
 Idempotent: deletes existing seed users by username and re-inserts them
 on every run. Uses the ORM directly -- no HTTP calls required.
+Profiles are stored without an avatar; the API serves each user a
+generated identicon (``/api/avatar/{username}.png``) in its place.
+
+With ``--generate N`` it instead writes N synthetic users (with
+profiles, view history and cache rows) in batches -- multi-row
+``INSERT`` statements, or ``COPY`` on Postgres -- for realistically
+sized databases.  Generated data is deterministic for a given
+``--seed``.
 """
 
+import argparse
 import asyncio
-import base64
 import json
-import struct
+import random
 import sys
-import zlib
+import time
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
@@ -22,79 +30,17 @@ sys.path.insert(0, str(_repo_root / "api"))
 sys.path.insert(0, str(_repo_root / "core"))
 
 
-from mandev_api.auth import hash_password  # noqa: E402
-from mandev_api.tables import GitHubStatsCache, IntegrationCache, User, UserProfile  # noqa: E402
-
-# ---------------------------------------------------------------------------
-# Avatar generation (pure Python PNG identicons)
-# ---------------------------------------------------------------------------
-
-
-def _make_png(pixels: list[list[tuple[int, int, int]]], size: int) -> bytes:
-    """Create a minimal RGB PNG from a pixel grid.
-
-    :param pixels: 2D grid of (r, g, b) tuples.
-    :param size: Width/height of the square image.
-    :returns: Raw PNG bytes.
-    """
-    def _chunk(chunk_type: bytes, data: bytes) -> bytes:
-        c = chunk_type + data
-        return struct.pack(">I", len(data)) + c + struct.pack(">I", zlib.crc32(c) & 0xFFFFFFFF)
-
-    header = b"\x89PNG\r\n\x1a\n"
-    ihdr = _chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
-
-    raw = b""
-    for row in pixels:
-        raw += b"\x00"  # filter: none
-        for r, g, b in row:
-            raw += struct.pack("BBB", r, g, b)
-
-    idat = _chunk(b"IDAT", zlib.compress(raw))
-    iend = _chunk(b"IEND", b"")
-    return header + ihdr + idat + iend
-
-
-def _generate_identicon(seed_str: str, grid: int = 8, px_size: int = 4) -> str:
-    """Generate a symmetric identicon as a data URL.
-
-    :param seed_str: String to derive the pattern from (e.g. username).
-    :param grid: Grid size (half is mirrored for symmetry).
-    :param px_size: Pixels per grid cell in the output image.
-    :returns: A ``data:image/png;base64,...`` URL.
-    """
-    h = hash(seed_str + "identicon")
-    # Pick a foreground color from the hash
-    r = (h >> 16) & 0xFF
-    g = (h >> 8) & 0xFF
-    b = h & 0xFF
-    # Ensure decent contrast: boost saturation
-    mx = max(r, g, b)
-    if mx < 100:
-        r, g, b = min(r + 100, 255), min(g + 80, 255), min(b + 120, 255)
-
-    bg = (40, 42, 54)  # dark background
-    fg = (r, g, b)
-
-    half = (grid + 1) // 2
-    img_size = grid * px_size
-    pixels: list[list[tuple[int, int, int]]] = []
-
-    for row_i in range(grid):
-        pixel_row: list[tuple[int, int, int]] = []
-        for col_i in range(grid):
-            # Mirror horizontally
-            mi = col_i if col_i < half else grid - 1 - col_i
-            bit = hash((seed_str, row_i, mi)) % 3  # ~66% fill
-            cell_color = fg if bit > 0 else bg
-            pixel_row.extend([cell_color] * px_size)
-        for _ in range(px_size):
-            pixels.append(pixel_row)
-
-    png_bytes = _make_png(pixels, img_size)
-    b64 = base64.b64encode(png_bytes).decode()
-    return f"data:image/png;base64,{b64}"
+from piccolo.engine.postgres import PostgresEngine  # noqa: E402
+from piccolo.table import Table  # noqa: E402
 
+from mandev_api.auth import hash_password  # noqa: E402
+from mandev_api.tables import (  # noqa: E402
+    GitHubStatsCache,
+    IntegrationCache,
+    ProfileView,
+    User,
+    UserProfile,
+)
 
 # ---------------------------------------------------------------------------
 # Seed data
@@ -110,7 +56,6 @@ SEED_USERS = [
                 "name": "Alice Chen",
                 "tagline": "builds reliable backend systems",
                 "about": "Staff engineer focused on distributed systems and developer tooling. Previously at Stripe and Datadog. I care about making infrastructure invisible so product teams can move fast.",
-                "avatar": _generate_identicon("alice"),
             },
             "skills": [
                 {"name": "Python", "level": "expert", "domain": "Backend"},
@@ -149,7 +94,6 @@ SEED_USERS = [
                 "name": "Bob Rivera",
                 "tagline": "pixels and performance",
                 "about": "Frontend engineer obsessed with animation, accessibility, and making the web feel alive. Design systems enthusiast.",
-                "avatar": _generate_identicon("bob"),
             },
             "skills": [
                 {"name": "TypeScript", "level": "expert", "domain": "Frontend"},
@@ -188,7 +132,6 @@ SEED_USERS = [
                 "name": "Carol Nakamura",
                 "tagline": "keeping things running",
                 "about": "Platform engineer. I automate the boring stuff.",
-                "avatar": _generate_identicon("carol"),
             },
             "skills": [
                 {"name": "Terraform", "level": "expert", "domain": "IaC"},
@@ -224,7 +167,6 @@ SEED_USERS = [
                 "name": "Dave Okonkwo",
                 "tagline": "open source everything",
                 "about": "Full-time open source maintainer. I believe good tools should be free. Maintaining 12 packages with 50k+ combined downloads/month.",
-                "avatar": _generate_identicon("dave"),
             },
             "skills": [
                 {"name": "Python", "level": "expert", "domain": "Languages"},
@@ -264,7 +206,6 @@ SEED_USERS = [
                 "name": "Eve Martinez",
                 "tagline": "learning in public",
                 "about": "Junior developer, 6 months in. Currently learning React and building my first side projects. Documenting everything I learn.",
-                "avatar": _generate_identicon("eve"),
             },
             "skills": [
                 {"name": "JavaScript", "level": "intermediate"},
@@ -294,7 +235,6 @@ SEED_USERS = [
                 "name": "Wouter",
                 "tagline": "",
                 "about": "",
-                "avatar": _generate_identicon("wouter"),
             },
             "theme": {"scheme": "dracula", "font": "JetBrains Mono", "mode": "dark"},
             "skills": [],
@@ -457,6 +397,332 @@ SEED_INTEGRATION_CACHE: list[dict] = [
 ]
 
 
+# ---------------------------------------------------------------------------
+# Synthetic data generator
+# ---------------------------------------------------------------------------
+
+GENERATED_PREFIX = "gen-"
+
+_FIRST_NAMES = (
+    "Ada", "Alan", "Barbara", "Dennis", "Edsger", "Frances", "Grace", "Guido",
+    "Hedy", "Ken", "Linus", "Margaret", "Radia", "Rob", "Sophie", "Yukihiro",
+)
+_LAST_NAMES = (
+    "Allen", "Hamilton", "Hopper", "Kernighan", "Knuth", "Lamarr", "Liskov",
+    "Perlman", "Pike", "Ritchie", "Thompson", "Torvalds", "Turing", "Wilson",
+)
+_SKILLS = (
+    ("Python", "Backend"), ("Go", "Backend"), ("Rust", "Systems"), ("C", "Systems"),
+    ("TypeScript", "Frontend"), ("React", "Frontend"), ("CSS", "Design"),
+    ("PostgreSQL", "Data"), ("Kafka", "Data"), ("Kubernetes", "Infrastructure"),
+    ("Terraform", "Infrastructure"), ("Swift", "Mobile"), ("Kotlin", "Mobile"),
+)
+_LEVELS = ("beginner", "intermediate", "advanced", "expert")
+_COMPANIES = ("Acme", "Globex", "Initech", "Hooli", "Umbrella", "Stark", "Wayne", "Wonka")
+_LANGUAGE_COLORS = {
+    "Python": "#3572A5", "Go": "#00ADD8", "Rust": "#dea584", "C": "#555555",
+    "TypeScript": "#3178c6", "Shell": "#89e051", "Swift": "#F05138", "Kotlin": "#A97BFF",
+}
+
+
+def _generated_contributions(rng: random.Random, dates: list[str]) -> list[dict]:
+    """One contribution day per date, at a per-user activity level."""
+    activity = rng.uniform(0.1, 0.9)
+    draw = rng.random
+    return [
+        {"date": day, "count": int(draw() * 9) + 1 if draw() < activity else 0}
+        for day in dates
+    ]
+
+
+def _generated_github_stats(rng: random.Random, dates: list[str], fetched_at: datetime) -> dict:
+    """GitHubStats-shaped data for one generated user.
+
+    :param dates: The trailing year's ISO dates, shared by every user.
+    """
+    contributions = _generated_contributions(rng, dates)
+    languages = rng.sample(sorted(_LANGUAGE_COLORS), rng.randint(1, 5))
+    weights = [rng.random() for _ in languages]
+    return {
+        "total_stars": int(rng.paretovariate(1.2) * 10) - 10,
+        "total_repos": rng.randint(1, 150),
+        "followers": int(rng.paretovariate(1.1) * 5) - 5,
+        "total_contributions": sum(day["count"] for day in contributions),
+        "current_streak": rng.randint(0, 30),
+        "longest_streak": rng.randint(30, 120),
+        "languages": [
+            {
+                "name": name,
+                "percentage": round(weight / sum(weights) * 100, 1),
+                "color": _LANGUAGE_COLORS[name],
+            }
+            for name, weight in zip(languages, weights)
+        ],
+        "pinned_repos": [
+            {
+                "name": f"project-{i}",
+                "stars": rng.randint(0, 500),
+                "forks": rng.randint(0, 50),
+                "language": languages[0],
+                "url": "https://github.com/",
+            }
+            for i in range(rng.randint(0, 6))
+        ],
+        "contributions": contributions,
+        "fetched_at": fetched_at.isoformat(),
+    }
+
+
+def _generated_user(rng: random.Random, username: str) -> tuple[dict, list[str]]:
+    """Build one generated profile config.
+
+    :returns: The config and the integrations it configures.
+    """
+    name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+    config: dict = {
+        "profile": {
+            "name": name,
+            "tagline": f"{rng.choice(_SKILLS)[1].lower()} engineer",
+            "about": f"{name} writes software at {rng.choice(_COMPANIES)}.",
+        },
+        "skills": [
+            {"name": skill, "level": rng.choice(_LEVELS), "domain": domain}
+            for skill, domain in rng.sample(_SKILLS, rng.randint(2, 8))
+        ],
+        "projects": [
+            {
+                "name": f"project-{i}",
+                "repo": f"https://github.com/{username}/project-{i}",
+                "description": "A generated project",
+            }
+            for i in range(rng.randint(0, 5))
+        ],
+        "experience": [
+            {"role": "Engineer", "company": company, "start": str(2024 - 3 * i)}
+            for i, company in enumerate(rng.sample(_COMPANIES, rng.randint(0, 3)))
+        ],
+        "links": [{"label": "GitHub", "url": f"https://github.com/{username}"}],
+    }
+    integrations = ["github"]
+    for integration, chance in (("npm", 0.3), ("pypi", 0.3), ("devto", 0.2), ("hashnode", 0.1)):
+        if rng.random() < chance:
+            integrations.append(integration)
+    for integration in integrations:
+        if integration == "pypi":
+            config["pypi"] = {"packages": [f"{username}-{i}" for i in range(rng.randint(1, 4))]}
+        else:
+            config[integration] = {"username": username}
+    return config, integrations
+
+
+def _generated_integration_stats(
+    rng: random.Random, service: str, username: str, fetched_at: datetime
+) -> dict:
+    """NpmStats, DevToStats or HashnodeStats-shaped data."""
+    if service == "npm":
+        packages = [
+            {
+                "name": f"{username}-{i}",
+                "version": f"1.{i}.0",
+                "description": "A generated package",
+                "weekly_downloads": int(rng.paretovariate(1.1) * 50) - 50,
+                "url": f"https://www.npmjs.com/package/{username}-{i}",
+            }
+            for i in range(rng.randint(1, 5))
+        ]
+        return {
+            "total_packages": len(packages),
+            "total_weekly_downloads": sum(p["weekly_downloads"] for p in packages),
+            "packages": packages,
+            "fetched_at": fetched_at.isoformat(),
+        }
+    articles = [
+        {
+            "title": f"Article {i}",
+            "url": f"https://example.com/{username}/article-{i}",
+            "published_at": fetched_at.isoformat(),
+            "reactions": rng.randint(0, 300),
+            "comments": rng.randint(0, 40),
+            "reading_time": rng.randint(2, 15),
+            "tags": ["programming"],
+        }
+        for i in range(rng.randint(1, 5))
+    ]
+    if service == "hashnode":
+        return {
+            "total_articles": len(articles),
+            "total_reactions": sum(a["reactions"] for a in articles),
+            "articles": [
+                {
+                    "title": a["title"],
+                    "brief": "A generated post",
+                    "url": a["url"],
+                    "published_at": a["published_at"],
+                    "reactions": a["reactions"],
+                }
+                for a in articles
+            ],
+            "fetched_at": fetched_at.isoformat(),
+        }
+    return {
+        "total_articles": len(articles),
+        "total_reactions": sum(a["reactions"] for a in articles),
+        "total_comments": sum(a["comments"] for a in articles),
+        "articles": articles,
+        "fetched_at": fetched_at.isoformat(),
+    }
+
+
+async def _bulk_insert(
+    connection: object | None,
+    table: type[Table],
+    columns: list[str],
+    rows: list[tuple],
+) -> None:
+    """Insert *rows* with ``COPY`` on Postgres, else one multi-row ``INSERT``.
+
+    :param connection: An asyncpg connection, or ``None`` for other engines.
+    """
+    if not rows:
+        return
+    if connection is not None:
+        await connection.copy_records_to_table(  # type: ignore[attr-defined]
+            table._meta.tablename, records=rows, columns=columns
+        )
+    else:
+        await table.insert(*(table(**dict(zip(columns, row))) for row in rows)).run()
+
+
+async def delete_generated() -> None:
+    """Delete every generated user and the rows generated for them."""
+    pattern = f"{GENERATED_PREFIX}%"
+    await UserProfile.delete().where(
+        UserProfile.user_id.is_in(User.select(User.id).where(User.username.like(pattern)))
+    ).run()
+    await User.delete().where(User.username.like(pattern)).run()
+    await ProfileView.delete().where(ProfileView.username.like(pattern)).run()
+    await GitHubStatsCache.delete().where(GitHubStatsCache.github_username.like(pattern)).run()
+    await IntegrationCache.delete().where(IntegrationCache.lookup_key.like(pattern)).run()
+
+
+async def generate(
+    count: int, *, seed: int = 0, batch_size: int = 1000, view_days: int = 30
+) -> None:
+    """Insert *count* synthetic users with profiles, views and cache rows.
+
+    Users are named ``gen-0000001`` and up; earlier generated data is
+    deleted first.  The same *seed* and *count* always produce the same
+    rows, apart from timestamps relative to now.  Cache rows are aged
+    randomly over up to two days, so some are stale; view counts follow
+    a heavy-tailed distribution, so a few profiles are far more popular
+    than the rest.
+
+    :param count: Number of users to generate.
+    :param seed: Seed for the random generator.
+    :param batch_size: Users written per round trip.
+    :param view_days: Days of view history per user.
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    await delete_generated()
+
+    engine = User._meta.db
+    connection = await engine.get_new_connection() if isinstance(engine, PostgresEngine) else None
+    password_hash = hash_password("seed")
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    dates = [(today - timedelta(days=364 - i)).isoformat() for i in range(365)]
+    width = max(7, len(str(count)))
+    totals = {"views": 0, "github": 0, "integrations": 0}
+
+    try:
+        for offset in range(0, count, batch_size):
+            usernames = [
+                f"{GENERATED_PREFIX}{i:0{width}d}"
+                for i in range(offset + 1, min(count, offset + batch_size) + 1)
+            ]
+            await _bulk_insert(
+                connection,
+                User,
+                ["username", "email", "password_hash", "github_username", "created_at"],
+                [
+                    (
+                        username,
+                        f"{username}@example.com",
+                        password_hash,
+                        username,
+                        now - timedelta(days=rng.randint(0, 1000)),
+                    )
+                    for username in usernames
+                ],
+            )
+            ids = {
+                row["username"]: row["id"]
+                for row in await User.select(User.id, User.username)
+                .where(User.username.is_in(usernames))
+                .run()
+            }
+
+            profiles: list[tuple] = []
+            views: list[tuple] = []
+            github: list[tuple] = []
+            integrations: list[tuple] = []
+            for username in usernames:
+                config, services = _generated_user(rng, username)
+                profiles.append((ids[username], json.dumps(config), now))
+
+                popularity = rng.paretovariate(1.2) - 1
+                for day in range(view_days):
+                    views_that_day = int(popularity * rng.random() * 2)
+                    if views_that_day:
+                        views.append(
+                            (username, (today - timedelta(days=day)).isoformat(), views_that_day)
+                        )
+
+                fetched_at = now - timedelta(minutes=rng.randint(0, 48 * 60))
+                github.append(
+                    (
+                        username,
+                        json.dumps(_generated_github_stats(rng, dates, fetched_at)),
+                        fetched_at,
+                    )
+                )
+                for service in services:
+                    if service in ("npm", "devto", "hashnode"):
+                        stats = _generated_integration_stats(rng, service, username, fetched_at)
+                        integrations.append((service, username, json.dumps(stats), fetched_at))
+
+            await _bulk_insert(
+                connection, UserProfile, ["user_id", "config_json", "updated_at"], profiles
+            )
+            await _bulk_insert(connection, ProfileView, ["username", "date", "count"], views)
+            await _bulk_insert(
+                connection,
+                GitHubStatsCache,
+                ["github_username", "stats_json", "fetched_at"],
+                github,
+            )
+            await _bulk_insert(
+                connection,
+                IntegrationCache,
+                ["service", "lookup_key", "stats_json", "fetched_at"],
+                integrations,
+            )
+            totals["views"] += len(views)
+            totals["github"] += len(github)
+            totals["integrations"] += len(integrations)
+    finally:
+        if connection is not None:
+            await connection.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Generated {count} users with {totals['views']} view rows, "
+        f"{totals['github']} GitHub and {totals['integrations']} integration "
+        f"cache rows in {elapsed:.1f}s"
+    )
+
+
 async def seed() -> None:
     """Clear existing seed users and re-insert all seed profiles.
 
@@ -527,5 +793,41 @@ async def seed() -> None:
     )
 
 
+def main() -> None:
+    """Seed the hand-written profiles, or generate synthetic ones."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--generate",
+        type=int,
+        metavar="N",
+        help="Generate N synthetic users instead of the hand-written profiles.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated data.")
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Generated users written per round trip."
+    )
+    parser.add_argument(
+        "--view-days", type=int, default=30, help="Days of view history per generated user."
+    )
+    parser.add_argument(
+        "--delete-generated", action="store_true", help="Delete generated users and exit."
+    )
+    args = parser.parse_args()
+
+    if args.delete_generated:
+        asyncio.run(delete_generated())
+    elif args.generate is not None:
+        asyncio.run(
+            generate(
+                args.generate,
+                seed=args.seed,
+                batch_size=args.batch_size,
+                view_days=args.view_days,
+            )
+        )
+    else:
+        asyncio.run(seed())
+
+
 if __name__ == "__main__":
-    asyncio.run(seed())
+    main()